@@ -0,0 +1,240 @@
+"""
+Benchmark suite for the data pipeline, impact model and forecasts.
+
+Each benchmark runs on synthetic unified-schema data (src.synthetic) at
+several sizes. Wall and CPU time are the best of `repeat` untraced runs;
+peak Python memory comes from one extra run under tracemalloc. Results are
+stored as JSON in benchmarks/results/ so runs from different versions can be
+compared.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 100000 --label my-branch
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/main.json benchmarks/results/my-branch.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_handler import (DataHandler, compile_reference_codes, validate_codes, validate_frame,
+                              validate_record)
+from src.forecasting import batch_trend_forecast, create_time_series, simple_trend_forecast
+from src.impact_model import ImpactModel
+from src.synthetic import write_synthetic
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+REGRESSION_THRESHOLD = 1.2
+# Timing differences below this are noise on a shared machine, whatever the ratio
+MIN_DELTA_S = 0.05
+
+
+class Context:
+    """Synthetic data written once per size and shared by the benchmarks."""
+
+    def __init__(self, n_rows: int, workdir: str):
+        self.n_rows = n_rows
+        self.data_path, self.ref_path = write_synthetic(workdir, n_rows)
+        self.df = pd.read_csv(self.data_path)
+        self.observations = self.df[self.df['record_type'] == 'observation'].copy()
+        self.observations['observation_date'] = pd.to_datetime(self.observations['observation_date'])
+        self.observations['year'] = self.observations['observation_date'].dt.year
+        self.events = self.df[self.df['record_type'] == 'event']
+        self.impacts = self.df[self.df['record_type'] == 'impact_link']
+        self.new_records = self.observations.head(1_000).drop(
+            columns=['record_id', 'record_type', 'year']).to_dict('records')
+
+    def handler(self) -> DataHandler:
+        handler = DataHandler(self.data_path, self.ref_path)
+        handler.df = self.df.copy()
+        handler.ref_df = pd.read_csv(self.ref_path)
+        return handler
+
+
+def bench_load_data(ctx: Context):
+    DataHandler(ctx.data_path, ctx.ref_path).load_data()
+
+
+def bench_record_type_summary(ctx: Context):
+    handler = ctx.handler()
+    handler.get_record_type_summary()
+
+
+def bench_add_records(ctx: Context):
+    handler = ctx.handler()
+    for _ in range(10):
+        handler.add_records(ctx.new_records, 'observation')
+    handler.df
+
+
+def bench_validate_record(ctx: Context):
+    for record in ctx.new_records:
+        validate_record(record, 'observation')
+
+
+def bench_validate_frame(ctx: Context):
+    validate_frame(ctx.df)
+
+
+def bench_validate_codes(ctx: Context):
+    validate_codes(ctx.df, compile_reference_codes(pd.read_csv(ctx.ref_path)))
+
+
+def bench_impact_simulation(ctx: Context):
+    model = ImpactModel(ctx.events, ctx.impacts, ctx.observations)
+    codes = ctx.impacts['related_indicator'].value_counts().index[:20].tolist()
+    model.simulate_many(codes, [50.0] * len(codes), '2020-01-01', '2030-12-01')
+
+
+def bench_trend_forecast(ctx: Context):
+    code = ctx.observations['indicator_code'].iloc[0]
+    series = create_time_series(ctx.observations[ctx.observations['indicator_code'] == code],
+                                date_col='observation_date')
+    simple_trend_forecast(series, [2026, 2027, 2028])
+
+
+def bench_batch_trend_forecast(ctx: Context):
+    batch_trend_forecast(ctx.observations, [2026, 2027, 2028], keys=('indicator_code', 'gender'))
+
+
+BENCHMARKS: Dict[str, Callable[[Context], None]] = {
+    'load_data': bench_load_data,
+    'get_record_type_summary': bench_record_type_summary,
+    'add_records': bench_add_records,
+    'validate_record': bench_validate_record,
+    'validate_frame': bench_validate_frame,
+    'validate_codes': bench_validate_codes,
+    'impact_simulation': bench_impact_simulation,
+    'simple_trend_forecast': bench_trend_forecast,
+    'batch_trend_forecast': bench_batch_trend_forecast,
+}
+
+
+def measure(func: Callable[[Context], None], ctx: Context, repeat: int = 3) -> Dict:
+    """Best-of-repeat wall/CPU time and traced peak memory of one benchmark."""
+    walls, cpus = [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            wall, cpu = time.perf_counter(), time.process_time()
+            func(ctx)
+            walls.append(time.perf_counter() - wall)
+            cpus.append(time.process_time() - cpu)
+
+        tracemalloc.start()
+        func(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {'wall_s': min(walls), 'wall_median_s': float(np.median(walls)),
+            'cpu_s': min(cpus), 'peak_mb': peak / 1024 ** 2}
+
+
+def _environment() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'pandas': pd.__version__,
+            'numpy': np.__version__, 'machine': platform.machine(),
+            'timestamp': datetime.now().isoformat(timespec='seconds')}
+
+
+def run(sizes=DEFAULT_SIZES, benchmarks: Optional[List[str]] = None, repeat: int = 3,
+        label: Optional[str] = None, output_dir: str = RESULTS_DIR) -> Dict:
+    """Run the suite and store results as <output_dir>/<label>.json."""
+    names = benchmarks or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {unknown}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in sizes:
+            ctx = Context(int(n_rows), workdir)
+            for name in names:
+                result = dict(benchmark=name, n_rows=int(n_rows), **measure(BENCHMARKS[name], ctx, repeat))
+                results.append(result)
+                print(f"⏱️ {name:<24} {int(n_rows):>10,} rows  {result['wall_s'] * 1000:9.1f} ms  "
+                      f"{result['peak_mb']:8.1f} MB")
+
+    environment = _environment()
+    label = label or environment['commit'] or 'local'
+    report = {'label': label, 'environment': environment, 'results': results}
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{label}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Benchmark results saved to {path}")
+    return report
+
+
+def compare(baseline_path: str, candidate_path: str, threshold: float = REGRESSION_THRESHOLD,
+            min_rows: int = 0, min_delta_s: float = MIN_DELTA_S) -> pd.DataFrame:
+    """Time and memory ratios (candidate / baseline); flags regressions past threshold.
+
+    Times are median wall times. Only sizes of at least min_rows can be
+    flagged, and a slowdown also has to exceed min_delta_s seconds.
+    """
+    frames = []
+    for path in (baseline_path, candidate_path):
+        with open(path, 'r', encoding='utf-8') as f:
+            frame = pd.DataFrame(json.load(f)['results'])
+        # Older result files only have the best-of-repeat time
+        frame['wall'] = frame['wall_median_s'] if 'wall_median_s' in frame.columns else frame['wall_s']
+        frames.append(frame)
+    merged = frames[0].merge(frames[1], on=['benchmark', 'n_rows'], suffixes=('_base', '_new'))
+    merged['time_ratio'] = merged['wall_new'] / merged['wall_base']
+    merged['memory_ratio'] = merged['peak_mb_new'] / merged['peak_mb_base'].replace(0, np.nan)
+    slower = (merged['time_ratio'] > threshold) & (merged['wall_new'] - merged['wall_base'] > min_delta_s)
+    merged['regression'] = (merged['n_rows'] >= min_rows) & (slower | (merged['memory_ratio'] > threshold))
+    merged = merged.rename(columns={'wall_base': 'wall_s_base', 'wall_new': 'wall_s_new'})
+    return merged[['benchmark', 'n_rows', 'wall_s_base', 'wall_s_new', 'time_ratio',
+                   'peak_mb_base', 'peak_mb_new', 'memory_ratio', 'regression']]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=float, default=DEFAULT_SIZES,
+                        help='Row counts, e.g. 1e3 1e5 1e7')
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--label', help='Result file name (defaults to the git commit)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'))
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument('--min-rows', type=int, default=0,
+                        help='Only flag regressions at sizes of at least this many rows')
+    parser.add_argument('--min-delta', type=float, default=MIN_DELTA_S,
+                        help='Minimum slowdown in seconds before a time ratio counts')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        table = compare(*args.compare, threshold=args.threshold, min_rows=args.min_rows,
+                        min_delta_s=args.min_delta)
+        print(table.to_string(index=False))
+        if table['regression'].any():
+            print(f"❌ {int(table['regression'].sum())} regression(s) above {args.threshold:.0%} of baseline")
+            return 1
+        print("✅ No regressions")
+        return 0
+
+    run([int(n) for n in args.sizes], args.benchmarks, args.repeat, args.label)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,20 @@ import plotly.express as px
 from datetime import datetime
 import numpy as np
 import os
+import sys
+from urllib.error import URLError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.charts import FigureCache, line_figure
+from src.scenarios import IMPACTS_PATH, ScenarioEngine
+from src.goal_seek import GoalSeeker
+from src.cubes import (HIST_PATH, build_cubes, cubes_stale, headline_metrics, indicator_series,
+                       load_cube, load_meta, progress_frame)
+from src.data_service import DataServiceClient
+
+# Shared data service (python -m src.data_service); unset to read the cubes in-process
+DATA_SERVICE_URL = os.environ.get('DATA_SERVICE_URL')
 
 # Page configuration
 st.set_page_config(
@@ -39,51 +53,117 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def ensure_cubes():
+    """Build the dashboard cubes once if they are missing or out of date"""
+    if cubes_stale() and os.path.exists(HIST_PATH):
+        build_cubes()
+    return load_meta()
+
+
+@st.cache_resource
+def data_client():
+    """One client per process; it revalidates its copies with ETags on every run"""
+    return DataServiceClient(DATA_SERVICE_URL)
+
+
+def use_service():
+    """Whether to ask the data service; False for the rest of the session once it is unreachable"""
+    return bool(DATA_SERVICE_URL) and not st.session_state.get('data_service_down', False)
+
+
+def service_unavailable(error):
+    """Remember for this session that the data service is down, and say so once"""
+    st.session_state['data_service_down'] = True
+    st.warning(f"Data service unavailable ({error.reason}); using local cubes")
+
+
+def load_page_cube(name):
+    """Load one pre-aggregated cube, from the shared data service when configured"""
+    if use_service():
+        try:
+            return data_client().table(name)
+        except URLError as e:
+            service_unavailable(e)
+        except Exception as e:
+            st.warning(f"Could not load {name} from the data service: {e}")
+            return pd.DataFrame()
+    return load_local_cube(name)
+
+
 @st.cache_data
-def load_data():
-    """Load all data files"""
-    data = {}
-    
-    # Load historical data
-    try:
-        # Load the main data file
-        hist_path = "data/processed/ethiopia_fi_enriched_combined.csv"
-        if os.path.exists(hist_path):
-            data['historical'] = pd.read_csv(hist_path)
-            
-            # Convert date columns
-            date_cols = ['observation_date', 'collection_date']
-            for col in date_cols:
-                if col in data['historical'].columns:
-                    data['historical'][col] = pd.to_datetime(
-                        data['historical'][col], errors='coerce'
-                    )
-    except Exception as e:
-        st.warning(f"Could not load historical data: {e}")
-        data['historical'] = pd.DataFrame()
-    
-    # Load forecast data
+def load_local_cube(name):
+    """Load one pre-aggregated cube; each page only loads what it plots"""
     try:
-        forecast_path = "forecasts/account_ownership_forecasts.csv"
-        if os.path.exists(forecast_path):
-            data['forecast'] = pd.read_csv(forecast_path)
+        cube = load_cube(name)
+        # Cubes store datetimes plus an integer period column; nothing to re-parse
+        if 'observation_date' in cube.columns and not pd.api.types.is_datetime64_any_dtype(cube['observation_date']):
+            cube['observation_date'] = pd.to_datetime(cube['observation_date'])
+        return cube
     except Exception as e:
-        st.warning(f"Could not load forecast data: {e}")
-        data['forecast'] = pd.DataFrame()
-    
-    # Load forecast summary
-    try:
-        summary_path = "forecasts/forecast_summary.csv"
-        if os.path.exists(summary_path):
-            data['summary'] = pd.read_csv(summary_path)
-    except Exception as e:
-        st.warning(f"Could not load forecast summary: {e}")
-        data['summary'] = pd.DataFrame()
-    
-    return data
+        st.warning(f"Could not load {name} cube: {e}")
+        return pd.DataFrame()
+
+
+def load_overview():
+    """Cube metadata, headline metrics and data version, from one data service request when configured"""
+    if use_service():
+        try:
+            page = data_client().page('overview')
+            return page['meta'], page['metrics'], page['version']
+        except URLError as e:
+            service_unavailable(e)
+    meta = ensure_cubes()
+    return meta, local_metrics(), meta.get('built_at')
+
+
+@st.cache_data
+def local_metrics():
+    """Headline metrics computed from the indicator/year and forecast cubes"""
+    metrics = headline_metrics(load_local_cube('indicator_year'), load_local_cube('forecast'))
+    events = load_local_cube('events')
+    metrics['events_tracked'] = len(events)
+    metrics['event_names'] = events['indicator'].astype(str).head(2).tolist() if len(events) else []
+    return metrics
 
-# Load data
-data = load_data()
+
+@st.cache_resource
+def scenario_engine(years):
+    """Per-impact response curves, precomputed once for live what-ifs"""
+    if not os.path.exists(IMPACTS_PATH):
+        return None
+    return ScenarioEngine.from_csv(IMPACTS_PATH, years=years, events=load_page_cube('events'))
+
+
+@st.cache_data
+def goal_seek_answers(target, target_year):
+    """Earliest year and required impact scale for the inclusion target"""
+    series = indicator_series(load_page_cube('indicator_year'), 'ACC_OWNERSHIP')
+    if len(series) < 2 or not os.path.exists(IMPACTS_PATH):
+        return {}
+    history = pd.DataFrame({'year': series.index, 'value_numeric': series.to_numpy()})
+    events = load_page_cube('events').rename(columns={'observation_date': 'event_date'})
+    seeker = GoalSeeker.from_records(history, events, pd.read_csv(IMPACTS_PATH), 'ACC_OWNERSHIP',
+                                     base_year=int(series.index[-1]))
+    
+    earliest = seeker.earliest_year(target, scales=[0.0, 1.0])['earliest_year'].tolist()
+    answers = {'trend_only': earliest[0], 'with_events': earliest[1]}
+    if target_year in seeker.years:
+        answers['min_scale'] = seeker.minimum_scale(target, [target_year])['min_scale'].item()
+        answers['interventions'] = seeker.minimum_interventions(target, [target_year]).iloc[0].to_dict()
+    return answers
+
+
+@st.cache_resource
+def figure_cache():
+    """Serialized figures shared across reruns, keyed by page and controls"""
+    return FigureCache()
+
+
+# Load cube metadata (cheap), headline metrics and the data version
+meta, metrics, data_version = load_overview()
+figures = figure_cache()
+date_range = None
 
 # Sidebar
 with st.sidebar:
@@ -100,9 +180,9 @@ with st.sidebar:
     
     # Date range selector for trends page
     st.subheader("Date Range")
-    if 'historical' in data and not data['historical'].empty:
-        min_date = data['historical']['observation_date'].min()
-        max_date = data['historical']['observation_date'].max()
+    if meta:
+        min_date = pd.Timestamp(meta['min_date']) if meta.get('min_date') else pd.NaT
+        max_date = pd.Timestamp(meta['max_date']) if meta.get('max_date') else pd.NaT
         
         # Handle NaT values
         if pd.isna(min_date) or pd.isna(max_date):
@@ -144,8 +224,9 @@ if page == "🏠 Overview":
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric(
             label="Current Account Ownership",
-            value="46%",
-            delta="+11% from 2017",
+            value=f"{metrics.get('current_value', float('nan')):.0f}%",
+            delta=(f"{metrics['change_since_previous']:+.0f}% from {metrics['previous_year']}"
+                   if 'previous_year' in metrics else None),
             delta_color="normal"
         )
         st.markdown('</div>', unsafe_allow_html=True)
@@ -153,9 +234,9 @@ if page == "🏠 Overview":
     with col2:
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric(
-            label="Target (2027)",
-            value="60%",
-            delta="14% to go",
+            label=f"Target ({metrics['target_year']})",
+            value=f"{metrics['target']:.0f}%",
+            delta=f"{metrics.get('gap_to_target', float('nan')):.0f}% to go",
             delta_color="inverse"
         )
         st.markdown('</div>', unsafe_allow_html=True)
@@ -163,9 +244,9 @@ if page == "🏠 Overview":
     with col3:
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric(
-            label="Projected 2025",
-            value="36%",
-            delta="-10% from target",
+            label=f"Projected {metrics.get('projection_year', '')}",
+            value=f"{metrics.get('projection_value', float('nan')):.0f}%",
+            delta=f"{metrics.get('projection_value', float('nan')) - metrics.get('current_value', float('nan')):+.0f}% from current",
             delta_color="off"
         )
         st.markdown('</div>', unsafe_allow_html=True)
@@ -174,8 +255,8 @@ if page == "🏠 Overview":
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric(
             label="Key Events Tracked",
-            value="3",
-            delta="Telebirr, Policies",
+            value=str(metrics['events_tracked']),
+            delta=", ".join(metrics['event_names']) or None,
             delta_color="normal"
         )
         st.markdown('</div>', unsafe_allow_html=True)
@@ -185,32 +266,37 @@ if page == "🏠 Overview":
     # Main overview chart
     st.subheader("Financial Inclusion Trends")
     
-    if 'historical' in data and not data['historical'].empty:
+    observations = load_page_cube('observations')
+    if not observations.empty:
         # Filter for account ownership data
-        account_data = data['historical'][
-            (data['historical']['indicator'] == 'Account Ownership Rate') &
-            (data['historical']['record_type'] == 'observation')
-        ].copy()
+        account_data = observations[observations['indicator'] == 'Account Ownership Rate']
         
         if not account_data.empty:
-            fig = px.line(
-                account_data,
-                x='observation_date',
-                y='value_numeric',
-                title='Account Ownership Rate Over Time',
-                markers=True
-            )
-            fig.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Account Ownership (%)",
-                hovermode='x unified'
-            )
-            # Add target line
-            fig.add_hline(
-                y=60,
-                line_dash="dash",
-                line_color="red",
-                annotation_text="2027 Target (60%)"
+            def build_overview_figure():
+                fig = line_figure(
+                    account_data,
+                    x='observation_date',
+                    y='value_numeric',
+                    title='Account Ownership Rate Over Time',
+                    markers=True
+                )
+                fig.update_layout(
+                    xaxis_title="Date",
+                    yaxis_title="Account Ownership (%)",
+                    hovermode='x unified'
+                )
+                # Add target line
+                fig.add_hline(
+                    y=metrics['target'],
+                    line_dash="dash",
+                    line_color="red",
+                    annotation_text=f"{metrics['target_year']} Target ({metrics['target']:.0f}%)"
+                )
+                return fig
+            
+            fig = figures.get_or_build(
+                figures.key('overview', 'Account Ownership Rate', version=data_version),
+                build_overview_figure
             )
             st.plotly_chart(fig, use_container_width=True)
     
@@ -239,7 +325,8 @@ if page == "🏠 Overview":
 elif page == "📈 Trends":
     st.title("📈 Historical Trends & Analysis")
     
-    if 'historical' in data and not data['historical'].empty:
+    observations = load_page_cube('observations')
+    if not observations.empty:
         # Interactive trend selector
         st.subheader("Interactive Trend Explorer")
         
@@ -247,14 +334,14 @@ elif page == "📈 Trends":
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            indicators = data['historical']['indicator'].unique()
+            indicators = observations['indicator'].unique()
             selected_indicator = st.selectbox(
                 "Select Indicator:",
                 indicators[:5]  # Show first 5 indicators
             )
         
         with col2:
-            pillars = data['historical']['pillar'].unique()
+            pillars = observations['pillar'].unique()
             selected_pillar = st.multiselect(
                 "Select Pillar(s):",
                 pillars,
@@ -269,28 +356,40 @@ elif page == "📈 Trends":
             )
         
         # Filter data based on selections
-        filtered_data = data['historical'][
-            (data['historical']['indicator'] == selected_indicator) &
-            (data['historical']['pillar'].isin(selected_pillar)) &
-            (data['historical']['gender'].isin(gender_filter)) &
-            (data['historical']['record_type'] == 'observation')
+        filtered_data = observations[
+            (observations['indicator'] == selected_indicator) &
+            (observations['pillar'].isin(selected_pillar)) &
+            (observations['gender'].isin(gender_filter))
         ]
+        if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+            filtered_data = filtered_data[
+                filtered_data['observation_date'].between(pd.Timestamp(date_range[0]),
+                                                          pd.Timestamp(date_range[1]))
+            ]
         
         if not filtered_data.empty:
-            # Create interactive plot
-            fig = px.line(
-                filtered_data,
-                x='observation_date',
-                y='value_numeric',
-                color='pillar',
-                title=f'{selected_indicator} Trends',
-                markers=True,
-                hover_data=['location', 'source_name']
-            )
-            fig.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Value",
-                legend_title="Pillar"
+            # Create interactive plot (downsampled, cached per control state)
+            def build_trend_figure():
+                fig = line_figure(
+                    filtered_data,
+                    x='observation_date',
+                    y='value_numeric',
+                    color='pillar',
+                    title=f'{selected_indicator} Trends',
+                    markers=True,
+                    hover_data=['location', 'source_name']
+                )
+                fig.update_layout(
+                    xaxis_title="Date",
+                    yaxis_title="Value",
+                    legend_title="Pillar"
+                )
+                return fig
+            
+            fig = figures.get_or_build(
+                figures.key('trends', selected_indicator, date_range, model_option,
+                            pillar=selected_pillar, gender=gender_filter, version=data_version),
+                build_trend_figure
             )
             st.plotly_chart(fig, use_container_width=True)
             
@@ -329,66 +428,71 @@ elif page == "📈 Trends":
 elif page == "🔮 Forecasts":
     st.title("🔮 Financial Inclusion Forecasts")
     
-    if 'forecast' in data and not data['forecast'].empty:
+    forecast_df = load_page_cube('forecast')
+    if not forecast_df.empty:
         # Model selection
         st.subheader("Forecast Model Visualization")
         
-        # Prepare forecast data
-        forecast_df = data['forecast'].copy()
-        
-        # Create interactive forecast plot
-        fig = go.Figure()
-        
-        # Base forecast
-        fig.add_trace(go.Scatter(
-            x=forecast_df['year'],
-            y=forecast_df['forecast'],
-            mode='lines+markers',
-            name='Base Forecast',
-            line=dict(color='blue', width=3)
-        ))
-        
-        # Confidence interval
-        fig.add_trace(go.Scatter(
-            x=forecast_df['year'].tolist() + forecast_df['year'].tolist()[::-1],
-            y=forecast_df['upper_95'].tolist() + forecast_df['lower_95'].tolist()[::-1],
-            fill='toself',
-            fillcolor='rgba(0,100,255,0.2)',
-            line=dict(color='rgba(255,255,255,0)'),
-            name='95% Confidence Interval'
-        ))
-        
-        # Optimistic scenario
-        fig.add_trace(go.Scatter(
-            x=forecast_df['year'],
-            y=forecast_df['optimistic'],
-            mode='lines',
-            name='Optimistic',
-            line=dict(color='green', dash='dash')
-        ))
-        
-        # Pessimistic scenario
-        fig.add_trace(go.Scatter(
-            x=forecast_df['year'],
-            y=forecast_df['pessimistic'],
-            mode='lines',
-            name='Pessimistic',
-            line=dict(color='red', dash='dash')
-        ))
-        
-        # Target line
-        fig.add_hline(
-            y=60,
-            line_dash="dot",
-            line_color="red",
-            annotation_text="Target: 60%"
-        )
+        # Create interactive forecast plot (cached per model option)
+        def build_forecast_figure():
+            fig = go.Figure()
+        
+            # Base forecast
+            fig.add_trace(go.Scatter(
+                x=forecast_df['year'],
+                y=forecast_df['forecast'],
+                mode='lines+markers',
+                name='Base Forecast',
+                line=dict(color='blue', width=3)
+            ))
+        
+            # Confidence interval
+            fig.add_trace(go.Scatter(
+                x=forecast_df['year'].tolist() + forecast_df['year'].tolist()[::-1],
+                y=forecast_df['upper_95'].tolist() + forecast_df['lower_95'].tolist()[::-1],
+                fill='toself',
+                fillcolor='rgba(0,100,255,0.2)',
+                line=dict(color='rgba(255,255,255,0)'),
+                name='95% Confidence Interval'
+            ))
+        
+            # Optimistic scenario
+            fig.add_trace(go.Scatter(
+                x=forecast_df['year'],
+                y=forecast_df['optimistic'],
+                mode='lines',
+                name='Optimistic',
+                line=dict(color='green', dash='dash')
+            ))
+        
+            # Pessimistic scenario
+            fig.add_trace(go.Scatter(
+                x=forecast_df['year'],
+                y=forecast_df['pessimistic'],
+                mode='lines',
+                name='Pessimistic',
+                line=dict(color='red', dash='dash')
+            ))
+        
+            # Target line
+            fig.add_hline(
+                y=metrics['target'],
+                line_dash="dot",
+                line_color="red",
+                annotation_text=f"Target: {metrics['target']:.0f}%"
+            )
         
-        fig.update_layout(
-            title='Account Ownership Forecast (2025-2027)',
-            xaxis_title="Year",
-            yaxis_title="Account Ownership Rate (%)",
-            hovermode='x unified'
+            fig.update_layout(
+                title='Account Ownership Forecast (2025-2027)',
+                xaxis_title="Year",
+                yaxis_title="Account Ownership Rate (%)",
+                hovermode='x unified'
+            )
+            return fig
+        
+        fig = figures.get_or_build(
+            figures.key('forecasts', 'Account Ownership', None, model_option, version=data_version),
+            build_forecast_figure
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -415,23 +519,23 @@ elif page == "🔮 Forecasts":
         
         with col1:
             st.metric(
-                "2027 Base Forecast",
-                "36.7%",
-                "-23.3% from target"
+                f"{metrics['final_year']} Base Forecast",
+                f"{metrics['final_forecast']:.1f}%",
+                f"{metrics['final_forecast'] - metrics['target']:.1f}% from target"
             )
         
         with col2:
             st.metric(
                 "Optimistic Scenario",
-                "44.1%",
-                "-15.9% from target"
+                f"{metrics['final_optimistic']:.1f}%",
+                f"{metrics['final_optimistic'] - metrics['target']:.1f}% from target"
             )
         
         with col3:
             st.metric(
                 "Annual Growth Required",
-                "7.8%",
-                "vs 4.3% historical"
+                f"{metrics.get('required_annual_growth', float('nan')):.1f}%",
+                f"vs {metrics.get('historical_annual_growth', float('nan')):.1f}% historical"
             )
 
 elif page == "🎯 Inclusion Projections":
@@ -441,11 +545,9 @@ elif page == "🎯 Inclusion Projections":
     st.subheader("Progress Toward 60% Financial Inclusion Target")
     
     # Create progress chart
-    progress_data = pd.DataFrame({
-        'Year': [2014, 2017, 2021, 2025, 2026, 2027],
-        'Account Ownership': [22, 35, 46, 36, 36.3, 36.7],
-        'Type': ['Actual', 'Actual', 'Actual', 'Forecast', 'Forecast', 'Forecast']
-    })
+    indicator_year = load_page_cube('indicator_year')
+    forecast_df = load_page_cube('forecast')
+    progress_data = progress_frame(indicator_year, forecast_df)
     
     fig = px.line(
         progress_data,
@@ -466,7 +568,7 @@ elif page == "🎯 Inclusion Projections":
     
     # Add shaded area for gap
     fig.add_hrect(
-        y0=46, y1=60,
+        y0=metrics.get('current_value', metrics['target']), y1=metrics['target'],
         fillcolor="rgba(255,0,0,0.1)",
         line_width=0,
         annotation_text="Gap to Close",
@@ -487,55 +589,66 @@ elif page == "🎯 Inclusion Projections":
     # Display scenario-specific projections
     col1, col2, col3 = st.columns(3)
     
-    if scenario == "Base Case":
-        with col1:
-            st.info("**2025 Projection:** 36%")
-            st.metric("Gap to Target", "24%")
-        
-        with col2:
-            st.info("**2026 Projection:** 36.3%")
-            st.metric("Gap to Target", "23.7%")
-        
-        with col3:
-            st.info("**2027 Projection:** 36.7%")
-            st.metric("Gap to Target", "23.3%")
+    scenario_column, show = {
+        "Base Case": ('forecast', st.info),
+        "Optimistic (Accelerated Growth)": ('optimistic', st.success),
+        "Pessimistic (Slow Growth)": ('pessimistic', st.error)
+    }[scenario]
     
-    elif scenario == "Optimistic (Accelerated Growth)":
-        with col1:
-            st.success("**2025 Projection:** 43.2%")
-            st.metric("Gap to Target", "16.8%")
-        
-        with col2:
-            st.success("**2026 Projection:** 43.6%")
-            st.metric("Gap to Target", "16.4%")
-        
-        with col3:
-            st.success("**2027 Projection:** 44.1%")
-            st.metric("Gap to Target", "15.9%")
+    if scenario_column in forecast_df.columns:
+        for col, (_, row) in zip((col1, col2, col3), forecast_df.sort_values('year').iterrows()):
+            with col:
+                show(f"**{int(row['year'])} Projection:** {row[scenario_column]:.1f}%")
+                st.metric("Gap to Target", f"{metrics['target'] - row[scenario_column]:.1f}%")
     
-    else:  # Pessimistic
-        with col1:
-            st.error("**2025 Projection:** 28.8%")
-            st.metric("Gap to Target", "31.2%")
+    # Live what-if: switch events off or rescale them against the base forecast
+    engine = scenario_engine(tuple(forecast_df['year'].astype(int))) if not forecast_df.empty else None
+    if engine is not None and 'ACC_OWNERSHIP' in engine.indicators:
+        st.subheader("Custom Event Scenario")
         
+        col1, col2 = st.columns(2)
+        with col1:
+            disabled_events = st.multiselect("Switch off events:", list(engine.event_ids))
         with col2:
-            st.error("**2026 Projection:** 29.1%")
-            st.metric("Gap to Target", "30.9%")
+            magnitude_scale = st.slider("Scale remaining event impacts:", 0.0, 2.0, 1.0, 0.1)
+        lag_scale = st.select_slider("Scale impact lags:", options=list(engine.lag_scales), value=1.0)
         
-        with col3:
-            st.error("**2027 Projection:** 29.4%")
-            st.metric("Gap to Target", "30.6%")
+        weights = engine.weights([{e: (0.0 if e in disabled_events else magnitude_scale)
+                                   for e in engine.event_ids}, {}])
+        lags = np.array([np.full(len(engine.event_ids), lag_scale), np.ones(len(engine.event_ids))])
+        custom, modelled = engine.evaluate(weights, lags)
+        row = engine.indicators.get_loc('ACC_OWNERSHIP')
+        custom_path = forecast_df.sort_values('year')['forecast'].to_numpy() + custom[row] - modelled[row]
+        
+        for col, year, value in zip(st.columns(len(custom_path)), engine.years, custom_path):
+            with col:
+                st.metric(f"{year}", f"{value:.1f}%", f"{value - metrics['target']:.1f}% vs target")
     
     # Consortium questions answers
     st.subheader("Answers to Consortium's Key Questions")
     
     with st.expander("📋 Question 1: When can we realistically reach 60% financial inclusion?"):
-        st.markdown("""
-        **Answer:** Based on current trends and forecasts:
-        - **Base Scenario**: Not by 2027. We project reaching only 36.7% by 2027.
-        - **With Interventions**: Accelerated growth could reach 44.1% by 2027.
-        - **Realistic Timeline**: Early 2030s with aggressive policy interventions.
-        """)
+        answers = goal_seek_answers(metrics['target'], metrics['target_year'])
+        fmt_year = lambda year: "beyond 2050" if pd.isna(year) else str(int(year))
+        lines = [
+            f"- **Base Scenario**: The published forecast reaches {metrics['final_forecast']:.1f}% by {metrics['final_year']}.",
+            f"- **With Interventions**: Accelerated growth could reach {metrics['final_optimistic']:.1f}% by {metrics['final_year']}."
+        ]
+        if answers:
+            lines.append(f"- **Survey Trend Alone**: {metrics['target']:.0f}% is reached in {fmt_year(answers['trend_only'])}; "
+                         f"with modelled events in {fmt_year(answers['with_events'])}.")
+        if 'min_scale' in answers:
+            scale = answers['min_scale']
+            needed = answers['interventions']
+            lines.append(
+                f"- **To Hit {metrics['target_year']}**: "
+                + ("no scaling of the modelled event impacts is enough" if pd.isna(scale)
+                   else f"event impacts must be {scale:.2f}x their modelled size")
+                + ("" if pd.isna(needed['n_interventions'])
+                   else f"; the {int(needed['n_interventions'])} strongest intervention(s) suffice")
+                + "."
+            )
+        st.markdown("**Answer:** Based on current trends and forecasts:\n" + "\n".join(lines))
     
     with st.expander("📋 Question 2: What are the most impactful interventions?"):
         st.markdown("""
@@ -0,0 +1,247 @@
+"""
+Content-addressed cache for forecast and impact-model artifacts.
+
+Artifacts (association matrices, refined impacts, forecast tables) are keyed
+by a SHA-256 fingerprint of everything they are derived from: the input
+records, impact parameters and model configuration. When nothing upstream
+changed the stored artifact is returned without recomputing it. Entries are
+evicted least-recently-used once the cache exceeds its size or entry budget.
+
+Example:
+    cache = ArtifactCache()
+    forecast = cache.get_or_compute(
+        'account_ownership_forecasts',
+        inputs={'observations': obs_df, 'impacts': impacts_df, 'config': {'years': [2025, 2026, 2027]}},
+        compute=lambda: build_forecast(obs_df, impacts_df),
+        output_path='forecasts/account_ownership_forecasts.csv'
+    )
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _update_hash(h, value):
+    """Feed a value into a hash in a type-stable, order-stable way."""
+    if isinstance(value, pd.DataFrame):
+        h.update(b'frame')
+        h.update(json.dumps([list(map(str, value.columns)), list(map(str, value.dtypes))]).encode())
+        h.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(b'series')
+        h.update(str(value.dtype).encode())
+        h.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(b'array')
+        h.update(f"{value.dtype}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        h.update(b'dict')
+        for k in sorted(value, key=str):
+            h.update(str(k).encode())
+            _update_hash(h, value[k])
+    elif isinstance(value, (list, tuple)):
+        h.update(b'list')
+        for item in value:
+            _update_hash(h, item)
+    else:
+        h.update(json.dumps(value, sort_keys=True, default=str).encode())
+
+
+def fingerprint(*parts) -> str:
+    """SHA-256 fingerprint of frames, arrays and JSON-like configuration."""
+    h = hashlib.sha256()
+    for part in parts:
+        _update_hash(h, part)
+    return h.hexdigest()
+
+
+def file_fingerprint(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's bytes, for inputs that live on disk."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+DEFAULT_CACHE_DIR = "models/.artifact_cache"
+
+
+def write_output(artifact: pd.DataFrame, output_path: str) -> bool:
+    """Atomically (re)write an artifact's CSV unless the file already holds it.
+
+    Returns:
+        True if the file was written
+    """
+    body = artifact.to_csv(index=False).encode('utf-8')
+    if os.path.exists(output_path) and os.path.getsize(output_path) == len(body):
+        with open(output_path, 'rb') as f:
+            if f.read() == body:
+                return False
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_path, output_path)
+    return True
+
+
+class ArtifactCache:
+    """LRU, size-bounded on-disk store of DataFrame artifacts keyed by content hash.
+
+    Reads only touch the in-memory access times; they are persisted with the
+    index on the next put, eviction, clear or flush, together with the
+    lifetime hit/miss counts behind report(lifetime=True).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = 512 * 1024 ** 2, max_entries: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.stats_path = os.path.join(cache_dir, 'stats.json')
+        self.stats: Dict[str, Dict[str, int]] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_json(self.index_path)
+        self.lifetime_stats: Dict[str, Dict[str, int]] = self._load_json(self.stats_path)
+
+    @staticmethod
+    def _load_json(path: str) -> Dict:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    @staticmethod
+    def _dump_json(path: str, payload: Dict):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=1)
+        os.replace(tmp_path, path)
+
+    def _save_index(self):
+        self._dump_json(self.index_path, self.index)
+        self._dump_json(self.stats_path, self.lifetime_stats)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _record(self, name: str, outcome: str):
+        for stats in (self.stats, self.lifetime_stats):
+            stats.setdefault(name, {'hits': 0, 'misses': 0})[outcome] += 1
+
+    def key(self, name: str, inputs: Dict) -> str:
+        """Cache key for an artifact name and its inputs."""
+        return fingerprint(name, inputs)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Stored artifact for a key, or None."""
+        entry = self.index.get(key)
+        if entry is None or not os.path.exists(self._path(key)):
+            return None
+        entry['last_access'] = time.time()
+        return pd.read_pickle(self._path(key))
+
+    def flush(self):
+        """Persist access times and hit counts recorded since the last index write."""
+        self._save_index()
+
+    def put(self, key: str, artifact: pd.DataFrame, name: str = ''):
+        """Store an artifact and evict old entries if over budget."""
+        path = self._path(key)
+        tmp_path = path + '.tmp'
+        artifact.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        self.index[key] = {'name': name, 'size': os.path.getsize(path),
+                           'created': now, 'last_access': now}
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        """Drop least-recently-used entries until within budget."""
+        by_age = sorted(self.index.items(), key=lambda item: item[1]['last_access'])
+        total = sum(entry['size'] for _, entry in by_age)
+
+        while by_age and (total > self.max_bytes or
+                          (self.max_entries is not None and len(by_age) > self.max_entries)):
+            key, entry = by_age.pop(0)
+            total -= entry['size']
+            self.index.pop(key, None)
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+
+    def get_or_compute(self, name: str, inputs: Dict, compute: Callable[[], pd.DataFrame],
+                       output_path: Optional[str] = None) -> pd.DataFrame:
+        """Return the cached artifact for these inputs, computing it on a miss.
+
+        Args:
+            name: Artifact name, e.g. 'association_matrix_refined'
+            inputs: Everything the artifact depends on (frames, parameters, config)
+            compute: Builds the artifact when it is not cached
+            output_path: Optional CSV kept in sync with the returned artifact;
+                rewritten atomically whenever its contents differ
+        """
+        key = self.key(name, inputs)
+        artifact = self.get(key)
+
+        if artifact is not None:
+            self._record(name, 'hits')
+            if output_path:
+                write_output(artifact, output_path)
+            return artifact
+
+        self._record(name, 'misses')
+        artifact = compute()
+        self.put(key, artifact, name)
+        if output_path:
+            write_output(artifact, output_path)
+        return artifact
+
+    def clear(self):
+        """Remove every cached artifact."""
+        for key in list(self.index):
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+        self.index = {}
+        self.lifetime_stats = {}
+        self._save_index()
+
+    def report(self, lifetime: bool = False) -> pd.DataFrame:
+        """Hit/miss counts per artifact name for this session (or, with lifetime, the cache's life)."""
+        stats = self.lifetime_stats if lifetime else self.stats
+        rows = [{'artifact': name, 'hits': s['hits'], 'misses': s['misses'],
+                 'hit_rate': s['hits'] / (s['hits'] + s['misses'])}
+                for name, s in stats.items()]
+        report = pd.DataFrame(rows, columns=['artifact', 'hits', 'misses', 'hit_rate'])
+        print(f"📦 Artifact cache: {int(report['hits'].sum())} hits, "
+              f"{int(report['misses'].sum())} misses, {len(self.index)} entries, "
+              f"{sum(e['size'] for e in self.index.values()) / 1024:.1f} KiB")
+        return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Report on (or clear) the artifact cache.")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--clear', action='store_true', help="Remove every cached artifact")
+    args = parser.parse_args(argv)
+
+    cache = ArtifactCache(args.cache_dir)
+    report = cache.report(lifetime=True)
+    if len(report):
+        print(report.to_string(index=False))
+    if args.clear:
+        cache.clear()
+        print(f"✅ Cleared {args.cache_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Lazily imported model and plotting backends, plus an import-time budget check.
+
+Heavy optional packages (statsmodels, prophet, plotly, sklearn, ...) are never
+imported at module level in src/. Code asks the registry for a backend when it
+actually needs one:
+
+    ARIMA = backends.load('arima').ARIMA
+    go = backends.load('plotly')
+
+so jobs that only need DataHandler start with pandas and numpy alone. The
+budget check runs each entry point in a fresh interpreter and reports its
+import time and any heavy package it pulled in:
+
+    python -m src.backends        # exits 1 if a budget is exceeded
+"""
+import importlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+# Backend name -> (module to import, pip package that provides it)
+BACKENDS: Dict[str, Tuple[str, str]] = {
+    'arima': ('statsmodels.tsa.arima.model', 'statsmodels'),
+    'pmdarima': ('pmdarima', 'pmdarima'),
+    'prophet': ('prophet', 'prophet'),
+    'lightgbm': ('lightgbm', 'lightgbm'),
+    'xgboost': ('xgboost', 'xgboost'),
+    'sklearn_linear': ('sklearn.linear_model', 'scikit-learn'),
+    'joblib': ('joblib', 'joblib'),
+    'plotly': ('plotly.graph_objects', 'plotly'),
+    'plotly_express': ('plotly.express', 'plotly'),
+    'matplotlib': ('matplotlib.pyplot', 'matplotlib'),
+}
+
+# Packages that must not be loaded by a plain `import src.<module>`
+HEAVY_MODULES = ('statsmodels', 'prophet', 'pmdarima', 'lightgbm', 'xgboost', 'sklearn',
+                 'plotly', 'streamlit', 'matplotlib', 'joblib', 'scipy')
+
+# Entry point -> (statement run in a fresh interpreter, budget in seconds)
+IMPORT_BUDGETS: Dict[str, Tuple[str, float]] = {
+    'import src.data_handler': ('import src.data_handler', 1.0),
+    'record_type_summary': (
+        "import pandas as pd\n"
+        "from src.data_handler import DataHandler\n"
+        "handler = DataHandler()\n"
+        "handler.df = pd.DataFrame({'record_type': ['observation', 'event'], 'pillar': ['ACCESS', None],\n"
+        "                           'indicator': ['a', 'b'], 'observation_date': ['2024-01-01', '2024-06-01']})\n"
+        "handler.get_record_type_summary()",
+        1.0
+    ),
+    'import src.forecasting': ('import src.forecasting', 1.0),
+    'import src.impact_model': ('import src.impact_model', 1.0),
+    'import src.backtesting': ('import src.backtesting', 1.0),
+    'import src.charts': ('import src.charts', 1.0),
+}
+
+_loaded: Dict[str, object] = {}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def available(name: str) -> bool:
+    """Whether a registered backend's package is installed (without importing it)."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name}. Registered: {sorted(BACKENDS)}")
+    module = BACKENDS[name][0]
+    return importlib.util.find_spec(module.split('.')[0]) is not None
+
+
+def load(name: str):
+    """Import a registered backend on first use and return its module."""
+    if name in _loaded:
+        return _loaded[name]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name}. Registered: {sorted(BACKENDS)}")
+    module, package = BACKENDS[name]
+    try:
+        _loaded[name] = importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(f"Backend '{name}' needs {package}: pip install {package}") from e
+    return _loaded[name]
+
+
+def import_time(statement: str, heavy: Sequence[str] = HEAVY_MODULES,
+                cwd: Optional[str] = None) -> Dict:
+    """Wall time of a statement in a fresh interpreter and the heavy packages it loaded."""
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"exec({statement!r})\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {tuple(heavy)!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': elapsed, 'heavy': heavy}))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                            cwd=cwd or REPO_ROOT, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check_import_budget(budgets: Optional[Dict[str, Tuple[str, float]]] = None,
+                        cwd: Optional[str] = None) -> pd.DataFrame:
+    """Time every budgeted entry point; within_budget is False if too slow or a heavy package loaded."""
+    rows: List[Dict] = []
+    for label, (statement, budget) in (budgets or IMPORT_BUDGETS).items():
+        measured = import_time(statement, cwd=cwd)
+        rows.append({'entry_point': label, 'seconds': measured['seconds'], 'budget': budget,
+                     'heavy_modules': measured['heavy'],
+                     'within_budget': measured['seconds'] <= budget and not measured['heavy']})
+    return pd.DataFrame(rows)
+
+
+def main() -> int:
+    report = check_import_budget()
+    print(report.to_string(index=False))
+    if not report['within_budget'].all():
+        print(f"❌ {int((~report['within_budget']).sum())} entry point(s) over their import budget")
+        return 1
+    print("✅ All entry points within their import budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
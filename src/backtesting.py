@@ -0,0 +1,289 @@
+"""
+Rolling-origin backtesting harness for the forecasting model zoo.
+
+Every candidate model is evaluated on rolling origins across all series:
+train on the first k years, forecast the next `horizon` years, slide k
+forward. The (model, series, origin) tasks fan out over a joblib process
+pool and fitted models are cached on disk with joblib.Memory, so re-running
+the nightly backtest only refits what changed. The cache key includes a
+version of each model (a hash of its classes' source and constructor
+settings), so editing a model class invalidates its fits. Model backends and joblib are
+loaded through src.backends on first use. Results are summarised in an
+accuracy/latency leaderboard.
+"""
+import hashlib
+import inspect
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import backends
+from .forecasting import fit_linear_trend
+
+
+class NaiveModel:
+    """Last observed value carried forward."""
+
+    def fit(self, years, values):
+        self.last = float(values[-1])
+        return self
+
+    def predict(self, years):
+        return np.full(len(years), self.last)
+
+
+class LinearTrendModel:
+    """Linear trend, as in simple_trend_forecast."""
+
+    def fit(self, years, values):
+        self.slope, self.intercept, _ = fit_linear_trend(years, values)
+        return self
+
+    def predict(self, years):
+        return self.slope * np.asarray(years, dtype=float) + self.intercept
+
+
+class ArimaModel:
+    """statsmodels ARIMA on the annual series."""
+
+    def __init__(self, order=(1, 1, 0)):
+        self.order = order
+
+    def fit(self, years, values):
+        ARIMA = backends.load('arima').ARIMA
+
+        self.last_year = int(years[-1])
+        self.result = ARIMA(np.asarray(values, dtype=float), order=self.order).fit()
+        return self
+
+    def predict(self, years):
+        steps = int(max(years) - self.last_year)
+        path = self.result.forecast(steps=steps)
+        return np.asarray(path)[np.asarray(years, dtype=int) - self.last_year - 1]
+
+
+class AutoArimaModel(ArimaModel):
+    """pmdarima auto_arima order selection."""
+
+    def fit(self, years, values):
+        pmdarima = backends.load('pmdarima')
+
+        self.last_year = int(years[-1])
+        self.result = pmdarima.auto_arima(np.asarray(values, dtype=float),
+                                          seasonal=False, suppress_warnings=True,
+                                          error_action='ignore')
+        return self
+
+    def predict(self, years):
+        steps = int(max(years) - self.last_year)
+        path = self.result.predict(n_periods=steps)
+        return np.asarray(path)[np.asarray(years, dtype=int) - self.last_year - 1]
+
+
+class ProphetModel:
+    """Prophet with a yearly-sampled linear trend."""
+
+    def fit(self, years, values):
+        Prophet = backends.load('prophet').Prophet
+
+        history = pd.DataFrame({'ds': pd.to_datetime([f"{int(y)}-12-31" for y in years]),
+                                'y': values})
+        self.model = Prophet(yearly_seasonality=False, weekly_seasonality=False,
+                             daily_seasonality=False)
+        self.model.fit(history)
+        return self
+
+    def predict(self, years):
+        future = pd.DataFrame({'ds': pd.to_datetime([f"{int(y)}-12-31" for y in years])})
+        return self.model.predict(future)['yhat'].to_numpy()
+
+
+class LagBoostingModel:
+    """Gradient boosting on lagged values, forecasting recursively."""
+
+    def __init__(self, backend: str = 'lightgbm', n_lags: int = 2):
+        self.backend = backend
+        self.n_lags = n_lags
+
+    def fit(self, years, values):
+        values = np.asarray(values, dtype=float)
+        if len(values) < self.n_lags + 2:
+            raise ValueError(f"Need at least {self.n_lags + 2} points for {self.backend}")
+
+        X = np.column_stack([values[i:len(values) - self.n_lags + i] for i in range(self.n_lags)])
+        y = values[self.n_lags:]
+
+        if self.backend == 'lightgbm':
+            self.model = backends.load('lightgbm').LGBMRegressor(n_estimators=100, min_child_samples=1, verbose=-1)
+        else:
+            self.model = backends.load('xgboost').XGBRegressor(n_estimators=100, max_depth=2)
+        self.model.fit(X, y)
+
+        self.last_year = int(years[-1])
+        self.history = list(values[-self.n_lags:])
+        return self
+
+    def predict(self, years):
+        steps = int(max(years) - self.last_year)
+        history = list(self.history)
+        path = []
+        for _ in range(steps):
+            nxt = float(self.model.predict(np.asarray(history[-self.n_lags:])[None, :])[0])
+            path.append(nxt)
+            history.append(nxt)
+        return np.asarray(path)[np.asarray(years, dtype=int) - self.last_year - 1]
+
+
+# Model name -> (factory, src.backends name it needs)
+MODEL_REGISTRY = {
+    'naive': (NaiveModel, None),
+    'linear_trend': (LinearTrendModel, None),
+    'arima': (ArimaModel, 'arima'),
+    'auto_arima': (AutoArimaModel, 'pmdarima'),
+    'prophet': (ProphetModel, 'prophet'),
+    'lightgbm': (lambda: LagBoostingModel('lightgbm'), 'lightgbm'),
+    'xgboost': (lambda: LagBoostingModel('xgboost'), 'xgboost'),
+}
+
+
+def available_models() -> List[str]:
+    """Registered models whose backend package is installed."""
+    return [name for name, (_, backend) in MODEL_REGISTRY.items()
+            if backend is None or backends.available(backend)]
+
+
+def model_version(model_name: str) -> str:
+    """Hash of a registered model's class source (and base classes) plus its constructor settings."""
+    factory, _ = MODEL_REGISTRY[model_name]
+    model = factory()
+    digest = hashlib.sha256(repr(sorted(vars(model).items())).encode())
+    for cls in type(model).__mro__[:-1]:
+        digest.update(inspect.getsource(cls).encode())
+    return digest.hexdigest()[:16]
+
+
+def _fit_model(model_name: str, years: np.ndarray, values: np.ndarray, version: str = ''):
+    """Fit one model; cached on disk by joblib.Memory keyed on its arguments.
+
+    version (model_version) is only part of the cache key: it changes when the
+    model's code does, so stale fits are not served.
+    """
+    factory, _ = MODEL_REGISTRY[model_name]
+    start = time.perf_counter()
+    model = factory().fit(years, values)
+    return model, time.perf_counter() - start
+
+
+def _run_task(fit, model_name: str, version: str, series_id, origin_year: int,
+              train_years: np.ndarray, train_values: np.ndarray,
+              test_years: np.ndarray, test_values: np.ndarray) -> List[Dict]:
+    """Fit on one origin and score its forecasts."""
+    base = {'model': model_name, 'series': series_id, 'origin': origin_year}
+    try:
+        model, fit_seconds = fit(model_name, train_years, train_values, version)
+        start = time.perf_counter()
+        predictions = np.asarray(model.predict(test_years), dtype=float)
+        predict_seconds = time.perf_counter() - start
+        error = None
+    except Exception as e:
+        predictions = np.full(len(test_years), np.nan)
+        fit_seconds = predict_seconds = np.nan
+        error = f"{type(e).__name__}: {e}"
+
+    return [
+        dict(base, year=int(year), horizon=int(year - origin_year), actual=actual,
+             prediction=prediction, fit_seconds=fit_seconds,
+             predict_seconds=predict_seconds, error=error)
+        for year, actual, prediction in zip(test_years, test_values, predictions)
+    ]
+
+
+def annual_series(panel: pd.DataFrame, keys: Sequence[str], year_col: str = 'year',
+                  value_col: str = 'value_numeric') -> Dict:
+    """Annual, gap-interpolated (years, values) arrays per series."""
+    series = {}
+    annual = panel.groupby(list(keys) + [year_col])[value_col].mean()
+    for series_id, group in annual.groupby(level=list(range(len(keys)))):
+        if isinstance(series_id, tuple) and len(series_id) == 1:
+            series_id = series_id[0]
+        values = group.droplevel(list(range(len(keys))))
+        full = values.reindex(range(int(values.index.min()), int(values.index.max()) + 1))
+        full = full.interpolate(method='linear')
+        series[series_id] = (full.index.to_numpy(), full.to_numpy(dtype=float))
+    return series
+
+
+def rolling_origin_backtest(panel: pd.DataFrame, models: Optional[Sequence[str]] = None,
+                            keys: Sequence[str] = ('indicator_code',), horizon: int = 3,
+                            min_train: int = 3, n_jobs: int = -1,
+                            cache_dir: Optional[str] = "models/.backtest_cache",
+                            year_col: str = 'year', value_col: str = 'value_numeric') -> pd.DataFrame:
+    """Evaluate models on rolling origins across every series of a panel.
+
+    Args:
+        panel: Long frame with key columns, year and value
+        models: Model names (defaults to every available registered model)
+        keys: Columns identifying a series
+        horizon: Years forecast from each origin
+        min_train: Minimum training years before the first origin
+        n_jobs: joblib worker count (-1 uses all cores)
+        cache_dir: Directory for cached fitted models (None disables caching);
+            fits are keyed on model_version, so edited models are refit
+
+    Returns:
+        One row per (model, series, origin, forecast year) with actual,
+        prediction, fit/predict latency and any fit error
+    """
+    installed = available_models()
+    models = list(models) if models is not None else installed
+    unknown = [m for m in models if m not in MODEL_REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown models: {unknown}")
+    missing = [m for m in models if m not in installed]
+    if missing:
+        print(f"⚠️ Skipping models without their backend installed: {missing}")
+        models = [m for m in models if m in installed]
+
+    joblib = backends.load('joblib')
+    fit = joblib.Memory(cache_dir, verbose=0).cache(_fit_model) if cache_dir else _fit_model
+    versions = {name: model_version(name) for name in models}
+
+    tasks = []
+    for series_id, (years, values) in annual_series(panel, keys, year_col, value_col).items():
+        for k in range(min_train, len(years)):
+            test = slice(k, k + horizon)
+            for model_name in models:
+                tasks.append(joblib.delayed(_run_task)(
+                    fit, model_name, versions[model_name], series_id, int(years[k - 1]),
+                    years[:k], values[:k], years[test], values[test]
+                ))
+
+    rows = joblib.Parallel(n_jobs=n_jobs, prefer='processes')(tasks)
+    results = pd.DataFrame([row for batch in rows for row in batch])
+    print(f"✅ Backtest: {len(tasks)} (model, series, origin) tasks, {len(results)} forecasts")
+    return results
+
+
+def leaderboard(results: pd.DataFrame) -> pd.DataFrame:
+    """Accuracy and latency per model, ranked by mean absolute error."""
+    scored = results.assign(
+        abs_error=(results['prediction'] - results['actual']).abs(),
+        sq_error=(results['prediction'] - results['actual']) ** 2,
+        pct_error=((results['prediction'] - results['actual']).abs()
+                   / results['actual'].abs().replace(0, np.nan)) * 100,
+        failed=results['error'].notna()
+    )
+    board = scored.groupby('model').agg(
+        mae=('abs_error', 'mean'),
+        rmse=('sq_error', lambda s: np.sqrt(s.mean())),
+        mape=('pct_error', 'mean'),
+        forecasts=('prediction', 'count'),
+        failures=('failed', 'sum'),
+        mean_fit_seconds=('fit_seconds', 'mean'),
+        mean_predict_seconds=('predict_seconds', 'mean')
+    )
+    board = board.sort_values('mae').reset_index()
+    board.insert(0, 'rank', np.arange(1, len(board) + 1))
+    return board
@@ -0,0 +1,149 @@
+"""
+Server-side chart helpers for the dashboard.
+
+Long series are downsampled with Largest-Triangle-Three-Buckets (LTTB) before
+they are shipped to the browser, large traces switch to WebGL (Scattergl),
+and built figures are cached as plain dicts keyed by
+(page, indicator, date_range, model_option) so a Streamlit rerun with the
+same controls reuses the serialized figure instead of rebuilding it.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import backends
+
+
+LTTB_THRESHOLD = 1000
+WEBGL_THRESHOLD = 2000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int = LTTB_THRESHOLD) -> np.ndarray:
+    """Indices of the points LTTB keeps out of an x-sorted series.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the mean of the next bucket.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    bucket_edges = (np.floor(np.arange(threshold - 1) * every) + 1).astype(np.int64)
+    bucket_edges[-1] = n - 1
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = bucket_edges[i], bucket_edges[i + 1]
+        next_start = end
+        next_end = bucket_edges[i + 2] if i + 2 < len(bucket_edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def _numeric_x(values: pd.Series) -> np.ndarray:
+    """x values as floats (datetimes become nanoseconds)."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+    return values.to_numpy(dtype=float)
+
+
+def downsample(df: pd.DataFrame, x: str, y: str, threshold: int = LTTB_THRESHOLD,
+               by: Optional[str] = None) -> pd.DataFrame:
+    """LTTB-downsample a long frame, per group of `by` when given."""
+    def one(group: pd.DataFrame) -> pd.DataFrame:
+        group = group.dropna(subset=[x, y]).sort_values(x)
+        if len(group) <= threshold:
+            return group
+        return group.iloc[lttb_indices(_numeric_x(group[x]), group[y].to_numpy(dtype=float), threshold)]
+
+    if by is None:
+        return one(df)
+    parts = [one(group) for _, group in df.groupby(by, observed=True, sort=False)]
+    return pd.concat(parts) if parts else df.iloc[:0]
+
+
+def line_figure(df: pd.DataFrame, x: str, y: str, color: Optional[str] = None,
+                title: str = '', markers: bool = True, hover_data: Sequence[str] = (),
+                threshold: int = LTTB_THRESHOLD, webgl_threshold: int = WEBGL_THRESHOLD):
+    """Line chart with LTTB-downsampled traces, WebGL for large series.
+
+    Drop-in for px.line(df, x, y, color=..., markers=..., hover_data=...).
+    """
+    go = backends.load('plotly')
+
+    fig = go.Figure()
+    groups = df.groupby(color, observed=True, sort=False) if color else [(None, df)]
+    for name, group in groups:
+        n_points = len(group)
+        group = downsample(group, x, y, threshold)
+        trace = go.Scattergl if n_points > webgl_threshold else go.Scatter
+        hover = list(hover_data)
+        fig.add_trace(trace(
+            x=group[x], y=group[y], name=str(name) if name is not None else y,
+            mode='lines+markers' if markers and len(group) <= webgl_threshold else 'lines',
+            customdata=group[hover].to_numpy() if hover else None,
+            hovertemplate=('%{x}<br>%{y}' + ''.join(
+                f"<br>{col}: %{{customdata[{i}]}}" for i, col in enumerate(hover)
+            ) + '<extra></extra>') if hover else None
+        ))
+    fig.update_layout(title=title, showlegend=color is not None)
+    return fig
+
+
+class FigureCache:
+    """In-process LRU cache of serialized figures."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._figures: 'OrderedDict[tuple, Dict]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(page: str, indicator=None, date_range=None, model_option=None, **extra) -> tuple:
+        """Cache key for a chart; extra filters (pillar, gender, data version) are folded in."""
+        def freeze(value):
+            if isinstance(value, (list, tuple, set)):
+                return tuple(str(v) for v in value)
+            return str(value)
+        return (page, freeze(indicator), freeze(date_range), freeze(model_option)) + tuple(
+            (name, freeze(value)) for name, value in sorted(extra.items())
+        )
+
+    def get_or_build(self, key: tuple, build: Callable) -> Dict:
+        """Serialized figure for key, building (and caching) it on a miss."""
+        if key in self._figures:
+            self.hits += 1
+            self._figures.move_to_end(key)
+            return self._figures[key]
+
+        self.misses += 1
+        figure = build()
+        figure = figure.to_dict() if hasattr(figure, 'to_dict') else figure
+        self._figures[key] = figure
+        while len(self._figures) > self.max_entries:
+            self._figures.popitem(last=False)
+        return figure
+
+    def clear(self):
+        self._figures.clear()
+
+    def __len__(self) -> int:
+        return len(self._figures)
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._figures), 'hits': self.hits, 'misses': self.misses}
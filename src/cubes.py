@@ -0,0 +1,220 @@
+"""
+Pre-aggregated dashboard cubes.
+
+A build step materializes the slices each dashboard page needs into small
+Parquet files, so the app never reads or re-aggregates the full enriched
+dataset on a render:
+
+    observations.parquet    observation rows, trimmed to the plotted columns
+    indicator_year.parquet  mean value per indicator/pillar/gender/year
+    events.parquet          tracked events
+    forecast.parquet        forecast series with scenario columns
+    meta.json               build time, row counts and observation date range
+
+Usage:
+    python -m src.cubes [enriched_csv] [forecast_csv] [output_dir]
+"""
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .periods import PERIOD_COLUMN, month_index, parse_dates, period_year
+
+
+HIST_PATH = "data/processed/ethiopia_fi_enriched_combined.csv"
+FORECAST_PATH = "forecasts/account_ownership_forecasts.csv"
+CUBE_DIR = "data/cubes"
+
+OBSERVATION_COLUMNS = ['indicator', 'indicator_code', 'pillar', 'gender', 'location',
+                       'source_name', 'observation_date', 'value_numeric']
+EVENT_COLUMNS = ['record_id', 'indicator', 'category', 'observation_date']
+CATEGORY_COLUMNS = ['indicator', 'indicator_code', 'pillar', 'gender', 'location',
+                    'source_name', 'category']
+CUBE_KEYS = ['indicator_code', 'indicator', 'pillar', 'gender', 'year']
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Low-cardinality strings as categoricals to keep cube files small."""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def build_indicator_year(observations: pd.DataFrame) -> pd.DataFrame:
+    """Mean value and observation count per indicator/pillar/gender/year."""
+    periods = observations[PERIOD_COLUMN] if PERIOD_COLUMN in observations.columns \
+        else month_index(observations['observation_date'])
+    years = period_year(periods)
+    obs = observations.assign(year=np.where(years >= 0, years, np.nan))
+    keys = [k for k in CUBE_KEYS if k in obs.columns]
+    cube = obs.groupby(keys, observed=True, dropna=False).agg(
+        value=('value_numeric', 'mean'),
+        n_obs=('value_numeric', 'count'),
+        last_date=('observation_date', 'max')
+    ).reset_index()
+    cube = cube.dropna(subset=['year'])
+    cube['year'] = cube['year'].astype(int)
+    return cube
+
+
+def _write_atomic(path: str, write):
+    """Write via write(tmp_path), then move into place so readers never see a partial file."""
+    tmp_path = path + '.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def build_cubes(hist_path: str = HIST_PATH, forecast_path: str = FORECAST_PATH,
+                output_dir: str = CUBE_DIR) -> Dict[str, str]:
+    """Materialize every dashboard cube from the enriched dataset and forecasts.
+
+    Returns:
+        Mapping of cube name to written path
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    wanted = set(OBSERVATION_COLUMNS + EVENT_COLUMNS + ['record_type'])
+    hist = pd.read_csv(hist_path, usecols=lambda c: c in wanted)
+    hist['observation_date'] = parse_dates(hist['observation_date'])
+    hist[PERIOD_COLUMN] = month_index(hist['observation_date'])
+
+    obs_cols = [c for c in OBSERVATION_COLUMNS if c in hist.columns]
+    observations = hist.loc[hist['record_type'] == 'observation',
+                            obs_cols + [PERIOD_COLUMN]].reset_index(drop=True)
+    events = hist.loc[hist['record_type'] == 'event',
+                      [c for c in EVENT_COLUMNS if c in hist.columns] + [PERIOD_COLUMN]].reset_index(drop=True)
+
+    cubes = {
+        'observations': _compact(observations),
+        'indicator_year': _compact(build_indicator_year(observations)),
+        'events': _compact(events)
+    }
+    if os.path.exists(forecast_path):
+        cubes['forecast'] = pd.read_csv(forecast_path)
+
+    paths = {}
+    for name, cube in cubes.items():
+        paths[name] = os.path.join(output_dir, f"{name}.parquet")
+        _write_atomic(paths[name], lambda tmp_path, cube=cube: cube.to_parquet(tmp_path, index=False))
+
+    dates = observations['observation_date']
+    meta = {
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+        'source': hist_path,
+        'rows': {name: len(cube) for name, cube in cubes.items()},
+        'min_date': None if dates.isna().all() else dates.min().date().isoformat(),
+        'max_date': None if dates.isna().all() else dates.max().date().isoformat()
+    }
+    paths['meta'] = os.path.join(output_dir, 'meta.json')
+
+    def _dump_meta(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+    # meta.json last: its mtime marks the cubes as fresh (cubes_stale)
+    _write_atomic(paths['meta'], _dump_meta)
+
+    print(f"✅ Built {len(cubes)} cubes in {output_dir}: {meta['rows']}")
+    return paths
+
+
+def load_cube(name: str, cube_dir: str = CUBE_DIR, columns=None) -> pd.DataFrame:
+    """Load one cube (empty frame if it has not been built)."""
+    path = os.path.join(cube_dir, f"{name}.parquet")
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    return pd.read_parquet(path, columns=columns)
+
+
+def load_meta(cube_dir: str = CUBE_DIR) -> Dict:
+    """Build metadata written alongside the cubes."""
+    path = os.path.join(cube_dir, 'meta.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def indicator_series(indicator_year: pd.DataFrame, indicator_code: str,
+                     gender: Optional[str] = 'all') -> pd.Series:
+    """Annual series for one indicator, national ('all') rows when available."""
+    rows = indicator_year[indicator_year['indicator_code'] == indicator_code]
+    if gender is not None and 'gender' in rows.columns and (rows['gender'] == gender).any():
+        rows = rows[rows['gender'] == gender]
+    return rows.groupby('year')['value'].mean().sort_index()
+
+
+def headline_metrics(indicator_year: pd.DataFrame, forecast: pd.DataFrame,
+                     indicator_code: str = 'ACC_OWNERSHIP', target: float = 60.0,
+                     target_year: int = 2027) -> Dict:
+    """Headline numbers for the Overview, Forecasts and Projections pages."""
+    series = indicator_series(indicator_year, indicator_code)
+    metrics = {'target': target, 'target_year': target_year, 'final_year': target_year,
+               'final_forecast': float('nan'), 'final_optimistic': float('nan'),
+               'final_pessimistic': float('nan')}
+
+    if len(series):
+        metrics['current_year'] = int(series.index[-1])
+        metrics['current_value'] = float(series.iloc[-1])
+        metrics['gap_to_target'] = target - metrics['current_value']
+        years_left = max(target_year - metrics['current_year'], 1)
+        metrics['required_annual_growth'] = metrics['gap_to_target'] / years_left
+    if len(series) > 1:
+        metrics['previous_year'] = int(series.index[-2])
+        metrics['previous_value'] = float(series.iloc[-2])
+        metrics['change_since_previous'] = metrics['current_value'] - metrics['previous_value']
+        metrics['historical_annual_growth'] = (
+            (series.iloc[-1] - series.iloc[0]) / (series.index[-1] - series.index[0])
+        )
+
+    if not forecast.empty:
+        first = forecast.sort_values('year').iloc[0]
+        metrics['projection_year'] = int(first['year'])
+        metrics['projection_value'] = float(first['forecast'])
+        at_target = forecast[forecast['year'] == target_year]
+        final = at_target.iloc[0] if len(at_target) else forecast.sort_values('year').iloc[-1]
+        metrics['final_year'] = int(final['year'])
+        for col in ('forecast', 'optimistic', 'pessimistic'):
+            if col in forecast.columns:
+                metrics[f'final_{col}'] = float(final[col])
+
+    return metrics
+
+
+def progress_frame(indicator_year: pd.DataFrame, forecast: pd.DataFrame,
+                   indicator_code: str = 'ACC_OWNERSHIP', scenario: str = 'forecast') -> pd.DataFrame:
+    """Actual survey values followed by forecast values for one scenario."""
+    series = indicator_series(indicator_year, indicator_code)
+    actual = pd.DataFrame({'Year': series.index.astype(int), 'Account Ownership': series.to_numpy(),
+                           'Type': 'Actual'})
+    if forecast.empty or scenario not in forecast.columns:
+        return actual
+    projected = pd.DataFrame({'Year': forecast['year'].astype(int),
+                              'Account Ownership': forecast[scenario].to_numpy(dtype=float).round(1),
+                              'Type': 'Forecast'})
+    return pd.concat([actual, projected], ignore_index=True)
+
+
+def cubes_stale(hist_path: str = HIST_PATH, forecast_path: str = FORECAST_PATH,
+                cube_dir: str = CUBE_DIR) -> bool:
+    """True when cubes are missing or older than their sources."""
+    meta_path = os.path.join(cube_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return True
+    built = os.path.getmtime(meta_path)
+    sources = [p for p in (hist_path, forecast_path) if os.path.exists(p)]
+    return any(os.path.getmtime(p) > built for p in sources)
+
+
+def main():
+    args = sys.argv[1:]
+    build_cubes(*args[:3])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,102 +1,452 @@
 """
 Data handling utilities for Ethiopia Financial Inclusion project.
 """
+import os
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-import warnings
-warnings.filterwarnings('ignore')
+
+from .instrumentation import instrumented
+from .journal import RecordJournal
+from .periods import month_index, parse_dates
+
+
+# Record ID prefix used when generating IDs for each record type
+ID_PREFIXES = {
+    'observation': 'OBS',
+    'event': 'EVT',
+    'impact_link': 'IMP',
+    'target': 'TGT'
+}
+
+# Required fields by record type
+REQUIRED_FIELDS = {
+    'observation': ['pillar', 'indicator', 'value_numeric', 'observation_date'],
+    'event': ['category', 'indicator', 'observation_date'],
+    'impact_link': ['parent_id', 'pillar', 'related_indicator'],
+    'target': ['pillar', 'indicator', 'value_numeric', 'observation_date']
+}
+
+# Rules reported by validate_frame
+VALIDATION_RULES = {
+    'missing_required': "Missing required field",
+    'event_has_pillar': "Event records should not have a pillar (it's assigned via impact_links)",
+    'invalid_code': "Code not listed in reference_codes for this field"
+}
+
+# Columns with a persistent row-position index (single keys and composites)
+INDEX_KEYS = ['record_type', 'pillar', 'indicator_code', 'parent_id', ('record_type', 'pillar')]
+
+
+def _is_parquet_path(path: str) -> bool:
+    return str(path).lower().endswith(('.parquet', '.pq'))
+
+
+def compile_reference_codes(ref_df: Optional[pd.DataFrame]) -> Dict[str, pd.Index]:
+    """Hashed set of valid codes per field of a reference table (field, code, description)."""
+    if ref_df is None or ref_df.empty or not {'field', 'code'} <= set(ref_df.columns):
+        return {}
+    ref = ref_df.dropna(subset=['field', 'code'])
+    return {field: pd.Index(codes.astype(str).unique())
+            for field, codes in ref.groupby('field', sort=False)['code']}
+
+
+def invalid_code_mask(values: pd.Series, valid: pd.Index) -> np.ndarray:
+    """Rows whose non-null value is not in `valid`.
+    
+    Each distinct value is hashed once (factorize) and looked up once, so
+    the cost is one pass over the column however many rows share a code.
+    """
+    positions, uniques = pd.factorize(values)
+    bad = ~pd.Index(uniques).astype(str).isin(valid)
+    # Missing values factorize to -1, which picks the trailing False
+    return np.append(bad, False)[positions]
+
+
+class ChangeSet:
+    """Indicators, events and impact links touched by added records.
+
+    Observations and targets touch their indicator_code; impact links touch
+    themselves, their related_indicator and their parent (an event, or an
+    indicator for indicator -> indicator links).
+    """
+
+    def __init__(self):
+        self.indicators = set()
+        self.events = set()
+        self.impact_links = set()
+
+    @classmethod
+    def from_records(cls, records: pd.DataFrame) -> 'ChangeSet':
+        changes = cls()
+        changes.update(records)
+        return changes
+
+    def update(self, records: pd.DataFrame):
+        if records.empty or 'record_type' not in records.columns:
+            return
+        types = records['record_type']
+
+        def _values(mask, col):
+            return set(records.loc[mask, col].dropna().astype(str)) if col in records.columns else set()
+
+        self.indicators |= _values(types.isin(['observation', 'target']), 'indicator_code')
+        self.events |= _values(types == 'event', 'record_id')
+
+        links = types == 'impact_link'
+        self.impact_links |= _values(links, 'record_id')
+        self.indicators |= _values(links, 'related_indicator')
+        for parent in _values(links, 'parent_id'):
+            is_event = parent.startswith(f"{ID_PREFIXES['event']}_")
+            (self.events if is_event else self.indicators).add(parent)
+
+    def merge(self, other: 'ChangeSet'):
+        self.indicators |= other.indicators
+        self.events |= other.events
+        self.impact_links |= other.impact_links
+
+    def __bool__(self) -> bool:
+        return bool(self.indicators or self.events or self.impact_links)
+
+    def __repr__(self) -> str:
+        return (f"ChangeSet({len(self.indicators)} indicators, {len(self.events)} events, "
+                f"{len(self.impact_links)} impact links)")
+
+
+def _observation_dates(df: pd.DataFrame) -> np.ndarray:
+    if 'observation_date' not in df.columns:
+        return np.full(len(df), np.datetime64('NaT'), dtype='datetime64[ns]')
+    return parse_dates(df['observation_date'])
+
+
+def _group_positions(df: pd.DataFrame, key, offset: int = 0) -> Dict[object, np.ndarray]:
+    """Map each value of `key` (a column or tuple of columns) to its row positions."""
+    cols = list(key) if isinstance(key, tuple) else key
+    groups = df.groupby(cols, sort=False, dropna=True).indices
+    return {value: positions.astype(np.int64) + offset for value, positions in groups.items()}
 
 
 class DataHandler:
     """Handles loading, processing, and saving financial inclusion data."""
     
     def __init__(self, raw_data_path: str = "data/raw/ethiopia_fi_unified_data.csv",
-                 ref_data_path: str = "data/raw/reference_codes.csv"):
+                 ref_data_path: str = "data/raw/reference_codes.csv",
+                 storage: Optional[str] = None,
+                 journal_path: Optional[str] = None):
+        """
+        Args:
+            raw_data_path: Unified dataset, either CSV or Parquet
+            ref_data_path: Reference codes CSV
+            storage: 'csv' or 'parquet' (inferred from raw_data_path when None)
+            journal_path: Optional append-only journal that every add_records
+                batch is written to
+        """
         self.raw_data_path = raw_data_path
         self.ref_data_path = ref_data_path
-        self.df = None
+        self.storage = storage or ('parquet' if _is_parquet_path(raw_data_path) else 'csv')
+        self.journal = RecordJournal(journal_path) if journal_path else None
+        self._df = None
+        self._pending = []
+        self._id_counters = None
+        self._added_count = 0
         self.ref_df = None
+        self._codes = {}
+        self._codes_source = None
+        self.code_errors = None
+        self._indexes = {}
+        self._indexed_df = None
+        self._dates = None
+        self._dated_df = None
+        self.changes = ChangeSet()
+    
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        """The full dataset, including any buffered add_records batches."""
+        self._compact()
+        return self._df
+    
+    @df.setter
+    def df(self, value: Optional[pd.DataFrame]):
+        self._df = value
+        self._pending = []
+        self._id_counters = None
+        self._added_count = 0
+    
+    def _compact(self):
+        """Fold buffered add_records batches into the main frame."""
+        if not self._pending:
+            return
+        previous_df = self._df
+        new_df = pd.concat(self._pending, ignore_index=True)
+        self._pending = []
+        self._df = pd.concat([previous_df, new_df], ignore_index=True)
+        self._update_indexes(previous_df, new_df)
+        if self._dated_df is previous_df:
+            self._dates = np.concatenate([self._dates, _observation_dates(new_df)])
+            self._dated_df = self._df
+    
+    def _next_ids(self, prefix: str, count: int) -> List[str]:
+        """Allocate `count` consecutive record IDs for a prefix."""
+        if self._id_counters is None:
+            self._id_counters = {}
+            for frame in [self._df] + self._pending:
+                if 'record_id' in frame.columns:
+                    self._advance_id_counters(frame['record_id'])
         
-    def load_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Load main data and reference codes."""
-        self.df = pd.read_csv(self.raw_data_path)
+        start = self._id_counters.get(prefix, 0) + 1
+        self._id_counters[prefix] = start + count - 1
+        return [f"{prefix}_{num:04d}" for num in range(start, start + count)]
+    
+    def _advance_id_counters(self, record_ids: pd.Series):
+        """Raise per-prefix counters past the numbers used in `record_ids`."""
+        parts = record_ids.dropna().astype(str).str.extract(r'^([^_]+)_(\d+)')
+        parts = parts.dropna()
+        if parts.empty:
+            return
+        highest = parts[1].astype(np.int64).groupby(parts[0]).max()
+        for prefix, num in highest.items():
+            self._id_counters[prefix] = max(self._id_counters.get(prefix, 0), int(num))
+    
+    def _read_records(self, columns: Optional[List[str]] = None,
+                      filters: Optional[List[Tuple]] = None) -> pd.DataFrame:
+        """Read records from storage, pushing filters down for Parquet."""
+        if self.storage == 'parquet':
+            from .parquet_store import read_records
+            return read_records(self.raw_data_path, columns=columns, filters=filters)
+        
+        usecols = None
+        if columns is not None:
+            usecols = list(dict.fromkeys(list(columns) + [f[0] for f in filters or []]))
+        
+        df = pd.read_csv(self.raw_data_path, usecols=usecols)
+        for col, op, value in filters or []:
+            if op == '==':
+                df = df[df[col] == value]
+            elif op == 'in':
+                df = df[df[col].isin(value)]
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        if columns is not None:
+            df = df[list(columns)]
+        return df.reset_index(drop=True)
+        
+    @instrumented('load')
+    def load_data(self, columns: Optional[List[str]] = None,
+                  filters: Optional[List[Tuple]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Load main data and reference codes.
+        
+        Args:
+            columns: Optional column projection
+            filters: Optional (column, op, value) predicates; with the Parquet
+                backend non-matching row groups are never read
+        """
+        if columns is None and filters is None and self.storage == 'csv':
+            self.df = pd.read_csv(self.raw_data_path)
+        else:
+            self.df = self._read_records(columns=columns, filters=filters)
         self.ref_df = pd.read_csv(self.ref_data_path)
         print(f"✅ Data loaded: {self.df.shape[0]} records, {self.df.shape[1]} columns")
         print(f"✅ Reference codes: {self.ref_df.shape[0]} codes")
+        self.code_errors = self.check_codes(self.df)
         return self.df, self.ref_df
     
+    @property
+    def reference_codes(self) -> Dict[str, pd.Index]:
+        """Valid codes per field, compiled once per ref_df."""
+        if self._codes_source is not self.ref_df:
+            self._codes = compile_reference_codes(self.ref_df)
+            self._codes_source = self.ref_df
+        return self._codes
+    
+    def check_codes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Bulk-check every referenced categorical column of df; warns and returns the errors."""
+        errors = validate_codes(df, self.reference_codes)
+        if not errors.empty:
+            counts = errors.groupby('field').size()
+            detail = ', '.join(f"{field} x{n}" for field, n in counts.items())
+            print(f"⚠️ {len(errors)} values not in reference codes ({detail})")
+        return errors
+    
+    def iter_chunks(self, chunksize: int = 100_000,
+                    columns: Optional[List[str]] = None):
+        """Stream the raw dataset as typed chunks without loading it whole."""
+        from .streaming import iter_chunks
+        return iter_chunks(self.raw_data_path, chunksize=chunksize, columns=columns)
+    
+    def stream_ingest(self, output_path: str = "data/processed/ethiopia_fi_enriched.csv",
+                      chunksize: int = 100_000, **kwargs) -> Dict:
+        """Validate, parse and write the raw dataset chunk by chunk.
+        
+        Memory stays bounded by the chunk size; see streaming.stream_ingest
+        for the routing and error options. Categorical codes are checked
+        against the reference codes, read from ref_data_path if not loaded.
+        """
+        from .streaming import stream_ingest
+        if self.ref_df is None and os.path.exists(self.ref_data_path):
+            self.ref_df = pd.read_csv(self.ref_data_path)
+        kwargs.setdefault('codes', self.reference_codes)
+        return stream_ingest(self.raw_data_path, output_path=output_path,
+                             chunksize=chunksize, **kwargs)
+    
+    @property
+    def observation_dates(self) -> np.ndarray:
+        """observation_date of every row as datetime64, parsed once and extended on add_records."""
+        df = self.df
+        if self._dated_df is not df:
+            self._dates = _observation_dates(df)
+            self._dated_df = df
+        return self._dates
+    
+    @property
+    def periods(self) -> np.ndarray:
+        """Integer month period of every row (see src.periods); -1 where the date is missing."""
+        return month_index(self.observation_dates)
+    
+    def _index(self, key) -> Dict[object, np.ndarray]:
+        """Return the row-position index for a key, building it on first use."""
+        if self._indexed_df is not self.df:
+            # Data was reloaded or replaced, every index is stale
+            self._indexes = {}
+            self._indexed_df = self.df
+        
+        if key not in self._indexes:
+            cols = list(key) if isinstance(key, tuple) else [key]
+            if not all(c in self.df.columns for c in cols):
+                return {}
+            self._indexes[key] = _group_positions(self.df, key)
+        return self._indexes[key]
+    
+    def _update_indexes(self, previous_df: pd.DataFrame, new_df: pd.DataFrame):
+        """Extend the built indexes with rows appended after `previous_df`."""
+        if self._indexed_df is not previous_df:
+            self._indexes = {}
+            self._indexed_df = self.df
+            return
+        
+        offset = len(previous_df)
+        for key, index in self._indexes.items():
+            cols = list(key) if isinstance(key, tuple) else [key]
+            if not all(c in new_df.columns for c in cols):
+                continue
+            for value, positions in _group_positions(new_df, key, offset).items():
+                if value in index:
+                    index[value] = np.concatenate([index[value], positions])
+                else:
+                    index[value] = positions
+        self._indexed_df = self.df
+    
+    def row_positions(self, **criteria) -> np.ndarray:
+        """Row positions matching equality criteria on indexed columns.
+        
+        Example:
+            handler.row_positions(record_type='observation', pillar='ACCESS')
+        """
+        if self.df is None:
+            self.load_data()
+        
+        if set(criteria) == {'record_type', 'pillar'}:
+            index = self._index(('record_type', 'pillar'))
+            return index.get((criteria['record_type'], criteria['pillar']),
+                             np.empty(0, dtype=np.int64))
+        
+        positions = None
+        for col, value in criteria.items():
+            if col not in INDEX_KEYS:
+                raise ValueError(f"No index on column: {col}")
+            hits = self._index(col).get(value, np.empty(0, dtype=np.int64))
+            positions = hits if positions is None else np.intersect1d(positions, hits,
+                                                                      assume_unique=True)
+        return positions if positions is not None else np.arange(len(self.df))
+    
+    def lookup(self, columns: Optional[List[str]] = None, **criteria) -> pd.DataFrame:
+        """Rows matching equality criteria, fetched through the indexes."""
+        positions = self.row_positions(**criteria)
+        df = self.df if columns is None else self.df[columns]
+        return df.take(positions)
+    
+    @instrumented('summarize', rows=lambda result, self: len(self._df))
     def get_record_type_summary(self) -> pd.DataFrame:
         """Get summary statistics by record type."""
         if self.df is None:
             self.load_data()
         
-        summary = {
-            'record_type': [],
-            'count': [],
-            'pillars': [],
-            'indicators': [],
-            'date_range': []
-        }
-        
-        for rt in self.df['record_type'].unique():
-            rt_df = self.df[self.df['record_type'] == rt]
-            summary['record_type'].append(rt)
-            summary['count'].append(len(rt_df))
-            
-            # Get unique pillars
-            if 'pillar' in rt_df.columns:
-                pillars = rt_df['pillar'].dropna().unique()
-                summary['pillars'].append(', '.join(pillars[:3]) + ('...' if len(pillars) > 3 else ''))
-            else:
-                summary['pillars'].append('N/A')
-            
-            # Get unique indicators
-            if 'indicator' in rt_df.columns:
-                indicators = rt_df['indicator'].dropna().unique()
-                summary['indicators'].append(len(indicators))
-            else:
-                summary['indicators'].append(0)
-            
-            # Get date range
-            if 'observation_date' in rt_df.columns:
-                dates = pd.to_datetime(rt_df['observation_date'], errors='coerce')
-                valid_dates = dates.dropna()
-                if not valid_dates.empty:
-                    date_range = f"{valid_dates.min().date()} to {valid_dates.max().date()}"
-                else:
-                    date_range = 'N/A'
-                summary['date_range'].append(date_range)
-            else:
-                summary['date_range'].append('N/A')
+        # Single grouped pass over the frame
+        grouped = self.df.groupby('record_type', sort=False)
+        summary = grouped.size().rename('count').to_frame()
+        
+        # Get unique pillars (first three in order of appearance)
+        if 'pillar' in self.df.columns:
+            pairs = self.df[['record_type', 'pillar']].dropna().drop_duplicates()
+            pillar_lists = pairs.groupby('record_type', sort=False)['pillar'].agg(list)
+            summary['pillars'] = pillar_lists.reindex(summary.index).map(
+                lambda p: ', '.join(p[:3]) + ('...' if len(p) > 3 else '')
+                if isinstance(p, list) else ''
+            )
+        else:
+            summary['pillars'] = 'N/A'
+        
+        # Get unique indicators
+        if 'indicator' in self.df.columns:
+            summary['indicators'] = grouped['indicator'].nunique()
+        else:
+            summary['indicators'] = 0
         
-        return pd.DataFrame(summary)
+        # Get date range
+        if 'observation_date' in self.df.columns:
+            dates = pd.Series(self.observation_dates, index=self.df.index)
+            date_groups = dates.groupby(self.df['record_type'], sort=False)
+            bounds = pd.DataFrame({'min': date_groups.min(), 'max': date_groups.max()})
+            bounds = bounds.reindex(summary.index)
+            summary['date_range'] = [
+                f"{lo.date()} to {hi.date()}" if pd.notna(lo) else 'N/A'
+                for lo, hi in zip(bounds['min'], bounds['max'])
+            ]
+        else:
+            summary['date_range'] = 'N/A'
+        
+        return summary.reset_index()[['record_type', 'count', 'pillars', 'indicators', 'date_range']]
     
-    def filter_by_pillar(self, pillar: str) -> pd.DataFrame:
-        """Filter observations by pillar."""
+    def filter_by_pillar(self, pillar: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Filter observations by pillar.
+        
+        With the Parquet backend and no data loaded yet, only the matching
+        row groups (and requested columns) are read from disk.
+        """
+        if self.df is None and self.storage == 'parquet':
+            return self._read_records(
+                columns=columns,
+                filters=[('record_type', '==', 'observation'), ('pillar', '==', pillar)]
+            )
         if self.df is None:
             self.load_data()
         
-        mask = (self.df['record_type'] == 'observation') & (self.df['pillar'] == pillar)
-        return self.df[mask].copy()
+        return self.lookup(columns=columns, record_type='observation', pillar=pillar)
     
     def get_events_with_impacts(self) -> pd.DataFrame:
         """Get events with their associated impact links."""
-        if self.df is None:
-            self.load_data()
+        event_cols = ['record_id', 'indicator', 'observation_date', 'category']
         
-        # Get events
-        events = self.df[self.df['record_type'] == 'event'].copy()
-        
-        # Get impact links
-        impacts = self.df[self.df['record_type'] == 'impact_link'].copy()
+        if self.df is None and self.storage == 'parquet':
+            # Only the event and impact_link row groups are read
+            events = self._read_records(columns=event_cols,
+                                        filters=[('record_type', '==', 'event')])
+            impacts = self._read_records(filters=[('record_type', '==', 'impact_link')])
+        else:
+            if self.df is None:
+                self.load_data()
+            
+            # Get events
+            events = self.lookup(columns=event_cols, record_type='event')
+            
+            # Get impact links
+            impacts = self.lookup(record_type='impact_link')
         
         # Merge
         if not impacts.empty and not events.empty:
             merged = pd.merge(
                 impacts,
-                events[['record_id', 'indicator', 'observation_date', 'category']],
+                events[event_cols],
                 left_on='parent_id',
                 right_on='record_id',
                 suffixes=('_impact', '_event')
@@ -104,90 +454,139 @@ class DataHandler:
             return merged
         return pd.DataFrame()
     
-    def add_records(self, new_records: List[Dict], record_type: str) -> pd.DataFrame:
+    @instrumented('add')
+    def add_records(self, new_records: List[Dict], record_type: str,
+                    validate: bool = False) -> pd.DataFrame:
         """Add new records to the dataset following the schema.
         
         Args:
-            new_records: List of dictionaries with record data
+            new_records: List of dictionaries (or a DataFrame) with record data
             record_type: Type of records ('observation', 'event', 'impact_link', 'target')
+            validate: Run validate_frame on the batch first and reject it on errors
+        
+        Returns:
+            The added records with their record_ids. Batches are buffered and
+            only concatenated into .df when it is next accessed, so adding
+            many chunks costs time linear in the number of records.
         """
-        if self.df is None:
+        if self._df is None:
             self.load_data()
         
         # Convert to DataFrame
         new_df = pd.DataFrame(new_records)
         new_df['record_type'] = record_type
         
+        if validate:
+            errors = validate_frame(new_df, codes=self.reference_codes)
+            if not errors.empty:
+                counts = errors.groupby(['rule', 'field']).size()
+                detail = ', '.join(f"{rule}:{field} x{n}" for (rule, field), n in counts.items())
+                raise ValueError(f"{len(errors)} validation errors in {record_type} batch ({detail})")
+        else:
+            self.check_codes(new_df)
+        
         # Add record_id if not present
         if 'record_id' not in new_df.columns:
-            # Generate IDs based on existing ones
-            existing_ids = self.df['record_id'].dropna()
-            prefix_map = {
-                'observation': 'OBS',
-                'event': 'EVT',
-                'impact_link': 'IMP',
-                'target': 'TGT'
-            }
-            prefix = prefix_map.get(record_type, 'REC')
-            
-            # Find the next available number
-            existing_nums = []
-            for id_str in existing_ids:
-                if id_str.startswith(prefix):
-                    try:
-                        num = int(id_str.split('_')[1])
-                        existing_nums.append(num)
-                    except:
-                        pass
-            
-            next_num = max(existing_nums) + 1 if existing_nums else 1
-            
-            new_ids = [f"{prefix}_{next_num + i:04d}" for i in range(len(new_df))]
-            new_df['record_id'] = new_ids
+            prefix = ID_PREFIXES.get(record_type, 'REC')
+            new_df['record_id'] = self._next_ids(prefix, len(new_df))
+        elif self._id_counters is not None:
+            self._advance_id_counters(new_df['record_id'])
+        
+        # Buffer the batch; it is folded into the main frame on next access of .df
+        self._pending.append(new_df)
+        self.changes.update(new_df)
+        self._added_count += len(new_df)
         
-        # Append to main dataframe
-        self.df = pd.concat([self.df, new_df], ignore_index=True)
+        if self.journal is not None:
+            self.journal.append(new_df)
         
         print(f"✅ Added {len(new_df)} new {record_type} records")
-        return self.df
+        return new_df
+    
+    def take_changes(self) -> ChangeSet:
+        """Return what add_records touched since the last call and start a new change set."""
+        changes, self.changes = self.changes, ChangeSet()
+        return changes
     
-    def save_enriched_data(self, output_path: str = "data/processed/ethiopia_fi_enriched.csv"):
-        """Save the enriched dataset."""
+    def replay_journal(self) -> int:
+        """Re-apply journaled records on top of the loaded data.
+        
+        Returns:
+            Number of records replayed
+        """
+        if self.journal is None:
+            return 0
+        if self._df is None:
+            self.load_data()
+        
+        replayed = 0
+        for batch in self.journal.iter_batches():
+            self._pending.append(batch)
+            self.changes.update(batch)
+            if self._id_counters is not None:
+                self._advance_id_counters(batch['record_id'])
+            replayed += len(batch)
+        self._added_count += replayed
+        
+        print(f"✅ Replayed {replayed} journaled records")
+        return replayed
+    
+    def flush_journal(self, output_path: str = "data/processed/ethiopia_fi_enriched.csv"):
+        """Save the enriched dataset and truncate the journal."""
+        result = self.save_enriched_data(output_path)
+        if result is not None and self.journal is not None:
+            self.journal.truncate()
+        return result
+    
+    @instrumented('save')
+    def save_enriched_data(self, output_path: str = "data/processed/ethiopia_fi_enriched.csv",
+                           partitioned: bool = False, max_workers: Optional[int] = None):
+        """Save the enriched dataset.
+        
+        Args:
+            output_path: CSV file; written to a temp file and renamed into place
+            partitioned: Instead write zstd Parquet partitions by record_type and year,
+                in parallel, to the directory named after output_path (without
+                extension), committed by its manifest; unchanged partitions are
+                skipped (see partitioned_store)
+            max_workers: Writer threads for the partitioned layout
+        """
         if self.df is None:
             print("⚠️ No data loaded")
             return
         
-        self.df.to_csv(output_path, index=False)
+        if partitioned:
+            from .partitioned_store import partitioned_path, write_partitions
+            output_path = partitioned_path(output_path)
+            write_partitions(self.df, output_path, periods=self.periods, max_workers=max_workers)
+        else:
+            tmp_path = output_path + '.tmp'
+            self.df.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, output_path)
         print(f"✅ Enriched data saved to {output_path}")
         print(f"   Total records: {len(self.df)}")
         
         # Summary of additions
-        original = pd.read_csv(self.raw_data_path)
-        added = len(self.df) - len(original)
-        print(f"   Added {added} new records")
+        print(f"   Added {self._added_count} new records")
         
         return self.df
 
 
-def validate_record(record: Dict, record_type: str) -> List[str]:
+def validate_record(record: Dict, record_type: str,
+                    codes: Optional[Dict[str, pd.Index]] = None) -> List[str]:
     """Validate a record against schema requirements.
     
+    Args:
+        codes: Optional valid codes per field (compile_reference_codes)
+    
     Returns:
         List of validation errors
     """
     errors = []
     
-    # Required fields by record type
-    required_fields = {
-        'observation': ['pillar', 'indicator', 'value_numeric', 'observation_date'],
-        'event': ['category', 'indicator', 'observation_date'],
-        'impact_link': ['parent_id', 'pillar', 'related_indicator'],
-        'target': ['pillar', 'indicator', 'value_numeric', 'observation_date']
-    }
-    
     # Check required fields
-    if record_type in required_fields:
-        for field in required_fields[record_type]:
+    if record_type in REQUIRED_FIELDS:
+        for field in REQUIRED_FIELDS[record_type]:
             if field not in record or pd.isna(record.get(field)):
                 errors.append(f"Missing required field: {field}")
     
@@ -195,4 +594,86 @@ def validate_record(record: Dict, record_type: str) -> List[str]:
     if record_type == 'event' and 'pillar' in record and pd.notna(record.get('pillar')):
         errors.append("Event records should not have a pillar (it's assigned via impact_links)")
     
-    return errors
\ No newline at end of file
+    # Reference code checks
+    for field, valid in (codes or {}).items():
+        value = record.get(field)
+        if value is not None and pd.notna(value) and str(value) not in valid:
+            errors.append(f"Invalid code for {field}: {value}")
+    
+    return errors
+
+
+@instrumented('validate', rows=lambda result, df, *args, **kwargs: len(df))
+def validate_frame(df: pd.DataFrame, record_type: Optional[str] = None,
+                   codes: Optional[Dict[str, pd.Index]] = None) -> pd.DataFrame:
+    """Validate a whole frame against schema requirements with column masks.
+    
+    Applies the same rules as validate_record, one vectorized pass per
+    (record_type, field) pair instead of one Python call per record.
+    
+    Args:
+        df: Records to validate
+        record_type: Type applied to every row; defaults to df['record_type']
+        codes: Optional valid codes per field (compile_reference_codes);
+            every field present in df is checked in bulk
+    
+    Returns:
+        Error table with columns row (index label), field and rule
+        (one of VALIDATION_RULES); empty when the frame is valid
+    """
+    if record_type is not None:
+        types = np.full(len(df), record_type, dtype=object)
+    elif 'record_type' in df.columns:
+        types = df['record_type'].to_numpy()
+    else:
+        types = np.full(len(df), None, dtype=object)
+    
+    errors = []
+    
+    def _collect(mask: np.ndarray, field: str, rule: str):
+        rows = np.flatnonzero(mask)
+        if len(rows):
+            errors.append(pd.DataFrame({'row': df.index[rows], 'field': field, 'rule': rule}))
+    
+    # Check required fields
+    for rt, fields in REQUIRED_FIELDS.items():
+        is_type = types == rt
+        if not is_type.any():
+            continue
+        for field in fields:
+            if field in df.columns:
+                _collect(is_type & df[field].isna().to_numpy(), field, 'missing_required')
+            else:
+                _collect(is_type, field, 'missing_required')
+    
+    # Record type specific validations
+    if 'pillar' in df.columns:
+        _collect((types == 'event') & df['pillar'].notna().to_numpy(), 'pillar', 'event_has_pillar')
+    
+    # Reference code checks
+    for field, valid in (codes or {}).items():
+        if field == 'record_type' and record_type is not None:
+            _collect(np.full(len(df), record_type not in valid), field, 'invalid_code')
+        elif field in df.columns:
+            _collect(invalid_code_mask(df[field], valid), field, 'invalid_code')
+    
+    if not errors:
+        return pd.DataFrame({'row': pd.Series(dtype=df.index.dtype),
+                             'field': pd.Series(dtype=object),
+                             'rule': pd.Series(dtype=object)})
+    return pd.concat(errors, ignore_index=True).sort_values('row', kind='stable').reset_index(drop=True)
+
+
+def validate_codes(df: pd.DataFrame, codes: Dict[str, pd.Index]) -> pd.DataFrame:
+    """Reference-code errors only (row, field, rule, value) for every field in codes."""
+    errors = []
+    for field, valid in codes.items():
+        if field not in df.columns:
+            continue
+        rows = np.flatnonzero(invalid_code_mask(df[field], valid))
+        if len(rows):
+            errors.append(pd.DataFrame({'row': df.index[rows], 'field': field, 'rule': 'invalid_code',
+                                        'value': df[field].to_numpy()[rows]}))
+    if not errors:
+        return pd.DataFrame(columns=['row', 'field', 'rule', 'value'])
+    return pd.concat(errors, ignore_index=True).sort_values('row', kind='stable').reset_index(drop=True)
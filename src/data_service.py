@@ -0,0 +1,307 @@
+"""
+Local data service for the dashboard pages, shared by every dashboard replica.
+
+One process serves precomputed payloads built from the dashboard cubes:
+
+    GET /pages                  page names and the current data version
+    GET /pages/<page>           JSON payload (overview, trends, forecasts, projections)
+    GET /tables/<cube>.arrow    one cube as an Arrow IPC stream
+
+Payloads are built once per data version, not per session or replica. The
+version is a content hash of the cube files. It is recomputed only when a
+file's size or mtime changes, so a rebuild that writes identical cubes
+invalidates nothing. Every response carries a strong ETag; clients that
+send If-None-Match get 304 Not Modified, and gzip is used when the client
+accepts it. Stale cubes are rebuilt from the forecast artifacts first, as
+the dashboard does. Requests only stat the files; a rebuild runs in a
+background thread and the previous version is served until it finishes.
+
+Usage:
+    python -m src.data_service [--host 127.0.0.1] [--port 8765]
+    DATA_SERVICE_URL=http://127.0.0.1:8765 streamlit run dashboard/app.py
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from .artifact_cache import file_fingerprint
+from .cubes import (CUBE_DIR, FORECAST_PATH, HIST_PATH, build_cubes, cubes_stale, headline_metrics,
+                    load_cube, load_meta, progress_frame)
+
+
+CUBE_NAMES = ('observations', 'indicator_year', 'events', 'forecast')
+
+# Page -> cubes sent with it; every page also carries the headline metrics
+PAGES: Dict[str, Tuple[str, ...]] = {
+    'overview': ('observations',),
+    'trends': ('observations',),
+    'forecasts': ('forecast',),
+    'projections': ('forecast',),
+}
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MIN_GZIP_BYTES = 1024
+
+
+def _json_safe(value):
+    """NaN and numpy scalars as plain JSON values."""
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _table_json(df: pd.DataFrame) -> Dict:
+    return json.loads(df.to_json(orient='split', index=False, date_format='iso'))
+
+
+def _arrow_bytes(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class Payload:
+    """Body of one resource in identity and gzip encodings, each with its ETag."""
+
+    def __init__(self, body: bytes, content_type: str):
+        self.content_type = content_type
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.bodies = {'identity': body}
+        self.etags = {'identity': f'"{digest}"'}
+        if len(body) >= MIN_GZIP_BYTES:
+            self.bodies['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+            self.etags['gzip'] = f'"{digest}-gz"'
+
+
+class DataService:
+    """Versioned page and table payloads built from the dashboard cubes.
+
+    Args:
+        cube_dir: Directory of the cube files
+        hist_path, forecast_path: Sources the cubes are rebuilt from when stale
+    """
+
+    def __init__(self, cube_dir: str = CUBE_DIR, hist_path: str = HIST_PATH,
+                 forecast_path: str = FORECAST_PATH):
+        self.cube_dir, self.hist_path, self.forecast_path = cube_dir, hist_path, forecast_path
+        self.version: Optional[str] = None
+        self.builds = 0
+        self._stat = None
+        # (version, payloads), swapped as one reference so requests never see a mix
+        self._published: Tuple[Optional[str], Dict[str, Payload]] = (None, {})
+        # Serializes rebuilds; requests never wait on it once a version is built
+        self._build_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def _cube_paths(self) -> List[str]:
+        return [os.path.join(self.cube_dir, f"{name}.parquet") for name in CUBE_NAMES]
+
+    def _snapshot(self):
+        return tuple((p, st.st_size, st.st_mtime_ns) for p in self._cube_paths()
+                     for st in [os.stat(p)] if os.path.exists(p))
+
+    def _current(self) -> bool:
+        """Whether the payloads match the files on disk; stat calls only."""
+        return (self.version is not None and self._snapshot() == self._stat
+                and not (cubes_stale(self.hist_path, self.forecast_path, self.cube_dir)
+                         and os.path.exists(self.hist_path)))
+
+    def refresh(self, wait: bool = True) -> str:
+        """Current data version, rebuilding the payloads only if cube contents changed.
+
+        Args:
+            wait: Rebuild before returning; otherwise a rebuild runs in a
+                background thread and the previous version is served meanwhile
+                (the first build always blocks)
+        """
+        if self._current():
+            return self.version
+        if wait or self.version is None:
+            self._rebuild()
+        elif self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._rebuild_in_background, daemon=True)
+            self._worker.start()
+        return self.version
+
+    def _rebuild_in_background(self):
+        try:
+            self._rebuild()
+        except Exception as e:
+            print(f"⚠️ Data service rebuild failed, still serving version {self.version}: {e}")
+
+    def _rebuild(self):
+        with self._build_lock:
+            if self._current():
+                return
+            if cubes_stale(self.hist_path, self.forecast_path, self.cube_dir) and os.path.exists(self.hist_path):
+                build_cubes(self.hist_path, self.forecast_path, self.cube_dir)
+            snapshot = self._snapshot()
+            if not snapshot:
+                raise FileNotFoundError(f"No dashboard cubes in {self.cube_dir}; run python -m src.cubes")
+
+            digest = hashlib.sha256()
+            for path, _, _ in snapshot:
+                digest.update(os.path.basename(path).encode())
+                digest.update(file_fingerprint(path).encode())
+            version = digest.hexdigest()[:16]
+            if version != self.version:
+                self._published = (version, self._build(version))
+                self.version = version
+                self.builds += 1
+            self._stat = snapshot
+
+    def _build(self, version: str) -> Dict[str, Payload]:
+        cubes = {name: load_cube(name, self.cube_dir) for name in CUBE_NAMES}
+        metrics = headline_metrics(cubes['indicator_year'], cubes['forecast'])
+        events = cubes['events']
+        metrics['events_tracked'] = len(events)
+        metrics['event_names'] = events['indicator'].astype(str).head(2).tolist() if len(events) else []
+
+        # Build time changes on every cube rebuild, the date range and row counts only with the data
+        meta = {k: v for k, v in load_meta(self.cube_dir).items() if k != 'built_at'}
+        payloads = {'/pages': Payload(json.dumps({'version': version, 'pages': sorted(PAGES)}).encode(),
+                                      'application/json')}
+        for page, tables in PAGES.items():
+            body = {'page': page, 'version': version, 'meta': meta, 'metrics': _json_safe(metrics),
+                    'tables': {name: _table_json(cubes[name]) for name in tables}}
+            if page == 'projections':
+                body['tables']['progress'] = _table_json(progress_frame(cubes['indicator_year'], cubes['forecast']))
+            payloads[f'/pages/{page}'] = Payload(json.dumps(body).encode(), 'application/json')
+        for name, cube in cubes.items():
+            payloads[f'/tables/{name}.arrow'] = Payload(_arrow_bytes(cube),
+                                                        'application/vnd.apache.arrow.stream')
+        print(f"✅ Built data service payloads for version {version}")
+        return payloads
+
+    def respond(self, path: str, if_none_match: Optional[str] = None,
+                accept_encoding: str = '') -> Tuple[int, Dict[str, str], bytes]:
+        """(status, headers, body) for a GET request."""
+        try:
+            self.refresh(wait=False)
+        except FileNotFoundError as e:
+            return 503, {'Content-Type': 'application/json'}, json.dumps({'error': str(e)}).encode()
+        version, payloads = self._published
+        payload = payloads.get(path.split('?')[0].rstrip('/') or '/pages')
+        if payload is None:
+            return 404, {'Content-Type': 'application/json'}, json.dumps({'error': f"Unknown path: {path}"}).encode()
+
+        encoding = 'gzip' if 'gzip' in accept_encoding and 'gzip' in payload.bodies else 'identity'
+        etag = payload.etags[encoding]
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding',
+                   'X-Data-Version': version}
+        tags = [tag.strip() for tag in (if_none_match or '').split(',') if tag.strip()]
+        if '*' in tags or etag in [tag[2:] if tag.startswith('W/') else tag for tag in tags]:
+            return 304, headers, b''
+        headers['Content-Type'] = payload.content_type
+        if encoding == 'gzip':
+            headers['Content-Encoding'] = 'gzip'
+        return 200, headers, payload.bodies[encoding]
+
+
+def make_handler(service: DataService):
+    """Request handler class bound to a service."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, headers, body = service.respond(self.path, self.headers.get('If-None-Match'),
+                                                    self.headers.get('Accept-Encoding', ''))
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, service: Optional[DataService] = None):
+    """Run the data service until interrupted."""
+    service = service or DataService()
+    service.refresh()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"✅ Data service on http://{host}:{server.server_port} (version {service.version})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+class DataServiceClient:
+    """Client that keeps each response and revalidates it with If-None-Match."""
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._cache: Dict[str, Tuple[str, bytes, str]] = {}
+
+    def _get(self, path: str) -> Tuple[bytes, str]:
+        """(decoded body, data version), served from the local copy on 304."""
+        request = urllib.request.Request(self.base_url + path, headers={'Accept-Encoding': 'gzip'})
+        cached = self._cache.get(path)
+        if cached is not None:
+            request.add_header('If-None-Match', cached[0])
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                if response.headers.get('Content-Encoding') == 'gzip':
+                    body = gzip.decompress(body)
+                self._cache[path] = (response.headers['ETag'], body, response.headers['X-Data-Version'])
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or cached is None:
+                raise
+        _, body, version = self._cache[path]
+        return body, version
+
+    def version(self) -> str:
+        return self._get('/pages')[1]
+
+    def page(self, name: str) -> Dict:
+        """Page payload with metrics (NaN restored) and tables as DataFrames."""
+        payload = json.loads(self._get(f'/pages/{name}')[0])
+        payload['metrics'] = {k: float('nan') if v is None else v for k, v in payload['metrics'].items()}
+        payload['tables'] = {name: pd.DataFrame(t['data'], columns=t['columns'])
+                             for name, t in payload['tables'].items()}
+        return payload
+
+    def table(self, name: str) -> pd.DataFrame:
+        """One cube, with its dtypes (datetimes, categoricals) intact."""
+        return pa.ipc.open_stream(self._get(f'/tables/{name}.arrow')[0]).read_all().to_pandas()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve dashboard page payloads with ETag revalidation.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cube-dir', default=CUBE_DIR)
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, DataService(cube_dir=args.cube_dir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Forecasting utilities for Ethiopia Financial Inclusion project.
+
+Promoted from the Task 4 notebook: annual series preparation, linear trend
+forecast, event-augmented forecast and scenario generation. Years come from
+integer month periods (src.periods), so a stored period column is never
+re-parsed.
+"""
+import pandas as pd
+import numpy as np
+
+from .instrumentation import instrumented
+from .periods import PERIOD_COLUMN, month_index, period_year
+
+
+def create_time_series(df, indicator_filter=None, date_col='date', value_col='value_numeric'):
+    """Create time series from observation data.
+
+    date_col may hold dates or integer month periods (e.g. PERIOD_COLUMN).
+    """
+    ts_data = df.copy()
+    ts_data = ts_data.sort_values(date_col)
+
+    # Ensure annual frequency (fill missing years if needed)
+    if len(ts_data) > 0:
+        # Create annual series; rows without a date are dropped
+        ts_data['year'] = period_year(month_index(ts_data[date_col]))
+        ts_data = ts_data[ts_data['year'] >= 0]
+        annual_series = ts_data.groupby('year')[value_col].mean().reset_index()
+
+        # Fill missing years with linear interpolation
+        min_year = annual_series['year'].min()
+        max_year = annual_series['year'].max()
+        full_years = pd.DataFrame({'year': range(min_year, max_year + 1)})
+        annual_series = pd.merge(full_years, annual_series, on='year', how='left')
+        annual_series[value_col] = annual_series[value_col].interpolate(method='linear')
+
+        return annual_series
+    return pd.DataFrame()
+
+
+def fit_linear_trend(years, values):
+    """Least-squares line through (years, values).
+
+    Returns:
+        (slope, intercept, residual standard deviation)
+    """
+    years = np.asarray(years, dtype=float)
+    values = np.asarray(values, dtype=float)
+    slope, intercept = np.polyfit(years, values, 1)
+    residuals = values - (slope * years + intercept)
+    return slope, intercept, np.std(residuals)
+
+
+@instrumented('forecast')
+def simple_trend_forecast(historical_series, forecast_years, t_value=2.0):
+    """Simple linear trend forecasting."""
+    if len(historical_series) < 2:
+        return None
+
+    slope, intercept, std_error = fit_linear_trend(
+        historical_series['year'], historical_series['value_numeric']
+    )
+
+    # Generate forecasts
+    forecast_df = pd.DataFrame({'year': forecast_years})
+    forecast_df['forecast'] = slope * forecast_df['year'].to_numpy(dtype=float) + intercept
+
+    # Calculate confidence intervals (simplified)
+    n = len(historical_series)
+
+    # 95% confidence interval (t_value=2.0 approximates large n)
+    forecast_df['lower_95'] = forecast_df['forecast'] - t_value * std_error * np.sqrt(1 + 1/n)
+    forecast_df['upper_95'] = forecast_df['forecast'] + t_value * std_error * np.sqrt(1 + 1/n)
+
+    return forecast_df
+
+
+def _event_periods(events_df) -> np.ndarray:
+    """Integer month period of each event, from a stored period column when present."""
+    for col in ('event_month', PERIOD_COLUMN):
+        if col in events_df.columns:
+            return events_df[col].to_numpy(dtype=np.int64)
+    return month_index(events_df['event_date'])
+
+
+def future_event_impacts(events_df, impacts_df, indicator, base_year):
+    """Impacts of events after `base_year` on one indicator.
+
+    Uses the first impact link per event, as event_augmented_forecast does.
+
+    Returns:
+        DataFrame with event_id, event_year, impact_estimate, lag_months and sign
+    """
+    event_year = period_year(_event_periods(events_df))
+    future_events = events_df.assign(event_year=event_year)[event_year > base_year]
+    impacts = impacts_df[impacts_df['related_indicator'] == indicator]
+    impacts = impacts.drop_duplicates('parent_id')
+
+    merged = pd.merge(
+        future_events[['record_id', 'event_year']],
+        impacts[['parent_id', 'impact_estimate', 'lag_months', 'impact_direction']],
+        left_on='record_id',
+        right_on='parent_id'
+    )
+
+    return pd.DataFrame({
+        'event_id': merged['record_id'],
+        'event_year': merged['event_year'].astype(int),
+        'impact_estimate': pd.to_numeric(merged['impact_estimate'], errors='coerce').fillna(0.0),
+        'lag_months': pd.to_numeric(merged['lag_months'], errors='coerce').fillna(0.0),
+        'sign': merged['impact_direction'].map({'increase': 1.0, 'decrease': -1.0}).fillna(0.0)
+    })
+
+
+def event_impact_matrix(impacts, years, scale=1.0, lag_months=None):
+    """Gradual impact of each event realised in each forecast year.
+
+    Args:
+        impacts: Output of future_event_impacts
+        years: Forecast years
+        scale: Multiplier on impact magnitudes (scalar or per-impact array)
+        lag_months: Optional per-impact lags overriding impacts['lag_months']
+
+    Returns:
+        Array of shape (n_impacts, n_years)
+    """
+    years = np.asarray(years, dtype=float)
+    if len(impacts) == 0:
+        return np.zeros((0, len(years)))
+
+    lag = impacts['lag_months'].to_numpy(dtype=float) if lag_months is None else np.asarray(lag_months)
+    months_since = (years[None, :] - impacts['event_year'].to_numpy(dtype=float)[:, None]) * 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        proportion = np.where(lag[:, None] > 0,
+                              np.minimum(1.0, months_since / np.where(lag > 0, lag, 1.0)[:, None]),
+                              1.0)
+    proportion = np.where(months_since >= 0, proportion, 0.0)
+
+    signed = impacts['sign'].to_numpy() * impacts['impact_estimate'].to_numpy() * scale
+    return signed[:, None] * proportion
+
+
+def event_impact_by_year(impacts, years, scale=1.0, lag_months=None):
+    """Total gradual event impact realised in each forecast year.
+
+    Returns:
+        Array with one total impact per year (see event_impact_matrix)
+    """
+    return event_impact_matrix(impacts, years, scale, lag_months).sum(axis=0)
+
+
+@instrumented('forecast')
+def event_augmented_forecast(base_forecast, events_df, impacts_df, indicator, base_year):
+    """Augment trend forecast with event impacts."""
+    forecast = base_forecast.copy()
+
+    impacts = future_event_impacts(events_df, impacts_df, indicator, base_year)
+    if impacts.empty:
+        return forecast
+
+    total_impact = event_impact_by_year(impacts, forecast['year'])
+
+    # Apply total impact to forecast
+    forecast['forecast'] += total_impact
+    forecast['lower_95'] += total_impact * 0.8  # Reduced uncertainty
+    forecast['upper_95'] += total_impact * 1.2  # Increased uncertainty
+
+    return forecast
+
+
+def create_scenario_forecasts(base_forecast, optimistic_factor=1.2, pessimistic_factor=0.8):
+    """Create optimistic and pessimistic scenarios."""
+    scenarios = base_forecast.copy()
+
+    # Optimistic scenario (faster growth)
+    scenarios['optimistic'] = base_forecast['forecast'] * optimistic_factor
+    scenarios['optimistic_lower'] = base_forecast['lower_95'] * optimistic_factor
+    scenarios['optimistic_upper'] = base_forecast['upper_95'] * optimistic_factor
+
+    # Pessimistic scenario (slower growth)
+    scenarios['pessimistic'] = base_forecast['forecast'] * pessimistic_factor
+    scenarios['pessimistic_lower'] = base_forecast['lower_95'] * pessimistic_factor
+    scenarios['pessimistic_upper'] = base_forecast['upper_95'] * pessimistic_factor
+
+    return scenarios
+
+
+def _interpolate_rows(matrix: np.ndarray) -> np.ndarray:
+    """Linearly interpolate NaN gaps inside each row (edges stay NaN)."""
+    n_rows, n_cols = matrix.shape
+    observed = ~np.isnan(matrix)
+    cols = np.broadcast_to(np.arange(n_cols), matrix.shape)
+
+    prev_idx = np.maximum.accumulate(np.where(observed, cols, -1), axis=1)
+    next_idx = np.minimum.accumulate(np.where(observed, cols, n_cols)[:, ::-1], axis=1)[:, ::-1]
+    inside = (prev_idx >= 0) & (next_idx < n_cols)
+
+    rows = np.arange(n_rows)[:, None]
+    prev_val = matrix[rows, np.clip(prev_idx, 0, n_cols - 1)]
+    next_val = matrix[rows, np.clip(next_idx, 0, n_cols - 1)]
+    span = np.where(next_idx > prev_idx, next_idx - prev_idx, 1)
+    weight = (cols - prev_idx) / span
+
+    filled = np.where(inside, prev_val + weight * (next_val - prev_val), np.nan)
+    return np.where(observed, matrix, filled)
+
+
+@instrumented('forecast', rows=lambda result, panel, *args, **kwargs: len(panel))
+def batch_trend_forecast(panel: pd.DataFrame, forecast_years, keys=('indicator_code',),
+                         year_col='year', value_col='value_numeric', t_value=2.0) -> pd.DataFrame:
+    """Fit a linear trend to every series of a long panel at once.
+
+    Equivalent to create_time_series followed by simple_trend_forecast for
+    each series: values are averaged per year, interior gaps are linearly
+    interpolated, and the grouped least-squares fit and prediction intervals
+    are computed in closed form over a padded (series x year) matrix.
+
+    Args:
+        panel: Long frame with the key columns, year_col and value_col
+        forecast_years: Years to forecast
+        keys: Columns identifying a series, e.g. indicator x region x gender
+        year_col: Year column; derived from PERIOD_COLUMN when the panel has
+            integer periods but no year column
+        t_value: Multiplier for the 95% interval, as in simple_trend_forecast
+
+    Returns:
+        Long frame with the keys, year, forecast, lower_95, upper_95 and n_obs.
+        Series with fewer than two years get NaN forecasts.
+    """
+    keys = list(keys)
+    if year_col not in panel.columns and PERIOD_COLUMN in panel.columns:
+        years = period_year(panel[PERIOD_COLUMN])
+        panel = panel.assign(**{year_col: np.where(years >= 0, years, np.nan)})
+    annual = panel.groupby(keys + [year_col], sort=False, dropna=False)[value_col].mean().reset_index()
+    annual = annual.dropna(subset=[year_col])
+    if annual.empty:
+        return pd.DataFrame(columns=keys + ['year', 'forecast', 'lower_95', 'upper_95', 'n_obs'])
+
+    series_codes, series_index = pd.MultiIndex.from_frame(annual[keys]).factorize()
+    years = annual[year_col].to_numpy(dtype=np.int64)
+    first_year = years.min()
+    n_years = years.max() - first_year + 1
+
+    matrix = np.full((len(series_index), n_years), np.nan)
+    matrix[series_codes, years - first_year] = annual[value_col].to_numpy(dtype=float)
+    matrix = _interpolate_rows(matrix)
+
+    # Grouped least squares on years centred on each series' mean observed year
+    valid = ~np.isnan(matrix)
+    x = np.arange(n_years, dtype=float)[None, :]
+    y = np.where(valid, matrix, 0.0)
+    n = valid.sum(axis=1).astype(float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = (valid * x).sum(axis=1) / n
+        y_mean = y.sum(axis=1) / n
+        xc = np.where(valid, x - x_mean[:, None], 0.0)
+        slope = np.where(n >= 2, (xc * (y - y_mean[:, None])).sum(axis=1) / (xc ** 2).sum(axis=1), np.nan)
+        intercept = y_mean - slope * x_mean
+        residuals = np.where(valid, matrix - (slope[:, None] * x + intercept[:, None]), 0.0)
+        std_error = np.sqrt((residuals ** 2).sum(axis=1) / n)
+        half_width = t_value * std_error * np.sqrt(1 + 1 / n)
+
+    horizon = np.asarray(forecast_years, dtype=float) - first_year
+    forecast = slope[:, None] * horizon[None, :] + intercept[:, None]
+
+    result = pd.DataFrame(
+        np.repeat(series_index.to_frame(index=False).to_numpy(dtype=object), len(horizon), axis=0),
+        columns=keys
+    )
+    result['year'] = np.tile(np.asarray(forecast_years), len(series_index))
+    result['forecast'] = forecast.ravel()
+    result['lower_95'] = (forecast - half_width[:, None]).ravel()
+    result['upper_95'] = (forecast + half_width[:, None]).ravel()
+    result['n_obs'] = np.repeat(n.astype(int), len(horizon))
+    return result
@@ -0,0 +1,123 @@
+"""
+Goal-seek queries on the trend and event-augmented forecast.
+
+The event-augmented forecast is linear in the impact scale:
+
+    forecast(year, scale, growth) = growth * trend(year) + scale * impacts(year)
+
+so inverse queries are answered for whole parameter grids at once: paths for
+every (scale, growth) combination are one broadcast, the earliest crossing
+year is an argmax over a boolean matrix, the minimum scale is solved in
+closed form, and the minimum number of interventions is read off cumulative,
+best-first intervention contributions.
+
+Example:
+    seeker = GoalSeeker.from_records(series, events_df, impacts_df, 'ACC_OWNERSHIP', base_year=2024)
+    seeker.earliest_year(60, scales=np.linspace(0, 3, 301))
+    seeker.minimum_scale(60, by_years=[2027, 2030])
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .forecasting import event_impact_matrix, fit_linear_trend, future_event_impacts
+
+
+class GoalSeeker:
+    """Inverse queries against a linear trend plus event impacts.
+
+    Args:
+        historical_series: Annual series with year and value_numeric columns
+        impacts: Output of forecasting.future_event_impacts (may be empty)
+        years: Search horizon
+    """
+
+    def __init__(self, historical_series: pd.DataFrame, impacts: Optional[pd.DataFrame] = None,
+                 years: Optional[Sequence[int]] = None):
+        last_year = int(historical_series['year'].max())
+        self.years = np.asarray(years if years is not None else range(last_year + 1, 2051), dtype=np.int64)
+        slope, intercept, _ = fit_linear_trend(historical_series['year'], historical_series['value_numeric'])
+        self.trend = slope * self.years.astype(float) + intercept
+
+        if impacts is None:
+            impacts = pd.DataFrame(columns=['event_id', 'event_year', 'impact_estimate', 'lag_months', 'sign'])
+        self.impacts = impacts.reset_index(drop=True)
+        self.contributions = event_impact_matrix(self.impacts, self.years)
+        self.impact_path = self.contributions.sum(axis=0)
+
+    @classmethod
+    def from_records(cls, historical_series: pd.DataFrame, events_df: pd.DataFrame,
+                     impacts_df: pd.DataFrame, indicator: str, base_year: int,
+                     years: Optional[Sequence[int]] = None) -> 'GoalSeeker':
+        """Seeker over the events after base_year that affect indicator."""
+        impacts = future_event_impacts(events_df, impacts_df, indicator, base_year)
+        return cls(historical_series, impacts, years)
+
+    def _year_positions(self, by_years) -> np.ndarray:
+        by_years = np.asarray(by_years)
+        positions = np.searchsorted(self.years, by_years)
+        found = self.years[np.minimum(positions, len(self.years) - 1)] == by_years
+        if not found.all():
+            raise ValueError(f"Years outside the search horizon {self.years[0]}-{self.years[-1]}")
+        return positions
+
+    def paths(self, scales=1.0, growth=1.0) -> np.ndarray:
+        """Forecast paths for every (scale, growth) combination, shape (n_combos, n_years)."""
+        scales, growth = np.broadcast_arrays(np.atleast_1d(np.asarray(scales, dtype=float)),
+                                             np.atleast_1d(np.asarray(growth, dtype=float)))
+        return growth[:, None] * self.trend[None, :] + scales[:, None] * self.impact_path[None, :]
+
+    def earliest_year(self, target: float, scales=1.0, growth=1.0) -> pd.DataFrame:
+        """Earliest horizon year each (scale, growth) combination reaches target.
+
+        Scales and growth factors broadcast against each other; pass
+        np.meshgrid outputs (raveled) for a full grid. earliest_year is NaN
+        when the target is not reached within the horizon.
+        """
+        scales, growth = np.broadcast_arrays(np.atleast_1d(np.asarray(scales, dtype=float)),
+                                             np.atleast_1d(np.asarray(growth, dtype=float)))
+        reached = self.paths(scales, growth) >= target
+        first = reached.argmax(axis=1)
+        earliest = np.where(reached.any(axis=1), self.years[first], np.nan)
+        return pd.DataFrame({'scale': scales, 'growth': growth, 'earliest_year': earliest})
+
+    def minimum_scale(self, target: float, by_years: Sequence[int], growth=1.0) -> pd.DataFrame:
+        """Smallest impact scale reaching target in each year (closed form).
+
+        min_scale is 0 when the trend alone suffices and NaN when no
+        non-negative scale helps (no positive impacts realised by then).
+        """
+        positions = self._year_positions(by_years)
+        growth = np.broadcast_to(np.asarray(growth, dtype=float), positions.shape)
+        shortfall = target - growth * self.trend[positions]
+        impact = self.impact_path[positions]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = np.where(shortfall <= 0, 0.0, np.where(impact > 0, shortfall / impact, np.nan))
+        return pd.DataFrame({'year': np.asarray(by_years), 'growth': growth, 'min_scale': scale})
+
+    def minimum_interventions(self, target: float, by_years: Sequence[int], scale: float = 1.0) -> pd.DataFrame:
+        """Fewest events (largest contributions first) reaching target in each year.
+
+        n_interventions is NaN when even every positive intervention falls short.
+        """
+        positions = self._year_positions(by_years)
+        columns = ['year', 'n_interventions', 'events']
+        rows = []
+
+        contributions = self.contributions[:, positions] * scale
+        order = np.argsort(-contributions, axis=0)
+        ranked = np.take_along_axis(contributions, order, axis=0)
+        cumulative = np.vstack([np.zeros(len(positions)), np.cumsum(np.maximum(ranked, 0.0), axis=0)])
+        shortfall = target - self.trend[positions]
+
+        # First k whose cumulative contribution covers the shortfall, per year
+        covered = cumulative >= shortfall[None, :]
+        n_needed = np.where(covered.any(axis=0), covered.argmax(axis=0), -1)
+
+        for j, year in enumerate(np.asarray(by_years)):
+            k = n_needed[j]
+            events = self.impacts['event_id'].to_numpy()[order[:k, j]].tolist() if k > 0 else []
+            rows.append({'year': int(year), 'n_interventions': k if k >= 0 else np.nan, 'events': events})
+        return pd.DataFrame(rows, columns=columns)
@@ -0,0 +1,355 @@
+"""
+Hierarchical forecasts reconciled across location, region and gender.
+
+Every node of the hierarchy gets its own trend forecast (one batched
+batch_trend_forecast call), then the forecasts are made coherent with a
+sparse summing matrix S (nodes x bottom series):
+
+    national -> urban / rural -> region, each crossed with gender
+
+    y_tilde = S (S' W^-1 S)^-1 S' W^-1 y_hat = y_hat - W C' (C W C')^-1 C y_hat
+
+with C = [I, -S_agg] the aggregation constraints.
+
+W sets the method: 'ols' (identity), 'wls_struct' (number of bottom series
+under each node), 'wls_var' (in-sample residual variances) or 'mint_shrink'
+(variances shrunk towards the full residual covariance). The shrunk
+covariance is diagonal plus rank T (T = historical years), so it is applied
+with the Woodbury identity. The solve uses the constraint form: C W C' is a
+sparse matrix plus a thin low-rank update, factorized with one sparse LU
+(S' W^-1 S would turn dense, since the national node touches every bottom
+series). No dense nodes x nodes matrix is built.
+
+Rates (percentages) do not add up across groups; pass aggregation='mean'
+and population shares as weights so parents are weighted averages.
+"""
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from .forecasting import batch_trend_forecast
+from .periods import month_index, period_year
+
+
+# Value each column takes on a node that aggregates over it
+TOTALS = {'location': 'national', 'region': 'all', 'gender': 'all'}
+METHODS = ('ols', 'wls_struct', 'wls_var', 'mint_shrink')
+
+
+def normalize_keys(frame: pd.DataFrame, columns: Sequence[str], totals: Dict[str, str] = TOTALS) -> pd.DataFrame:
+    """Fill missing hierarchy columns with their total token (e.g. region NaN -> 'all')."""
+    values = {col: (frame[col] if col in frame.columns else pd.Series(np.nan, index=frame.index))
+              .astype(object).where(lambda s: s.notna(), totals[col]) for col in columns}
+    return frame.assign(**values)
+
+
+def finest_series(keyed: pd.DataFrame, columns: Sequence[str], totals: Dict[str, str] = TOTALS):
+    """Series at the finest level present in a keyed frame, and that level's columns.
+
+    The level of a series is the set of columns it does not total over, so
+    national-only data has level () and a national gender split ('gender',).
+    The level with the most columns wins (ties go to the one with more
+    series); series at other levels are aggregates of it or are left out.
+
+    Returns:
+        (unique series of that level, its columns)
+    """
+    keys = keyed[list(columns)].drop_duplicates()
+    specific = np.column_stack([(keys[col] != totals[col]).to_numpy() for col in columns])
+    labels = pd.Series([tuple(c for c, on in zip(columns, row) if on) for row in specific], index=keys.index)
+    counts = labels.value_counts()
+    grouping = max(counts.index, key=lambda g: (len(g), counts[g]))
+    return keys[(labels == grouping).to_numpy()].reset_index(drop=True), list(grouping)
+
+
+class Hierarchy:
+    """Nodes and sparse summing matrix of nested levels crossed with other attributes.
+
+    Bottom series may stop above the full detail (national x gender, say):
+    columns they total over are simply left out of the hierarchy.
+
+    Args:
+        bottom: Bottom series, one row per combination of levels + cross
+            columns, all at the same level
+        levels: Nested columns, coarsest first (region within location)
+        cross: Columns crossed with every level (gender)
+        aggregation: 'sum' for counts; 'mean' for rates (weighted averages)
+        weights: Positive weight of each bottom series, aligned with bottom
+            (population shares for rates; default 1); applied to the aggregate
+            rows only, the bottom rows are always the identity
+    """
+
+    def __init__(self, bottom: pd.DataFrame, levels: Sequence[str] = ('location', 'region'),
+                 cross: Sequence[str] = ('gender',), aggregation: str = 'sum',
+                 weights: Optional[Sequence[float]] = None, totals: Dict[str, str] = TOTALS):
+        if aggregation not in ('sum', 'mean'):
+            raise ValueError(f"Unknown aggregation: {aggregation}")
+        self.levels, self.cross, self.totals = list(levels), list(cross), totals
+        self.columns = self.levels + self.cross
+        self.bottom = bottom[self.columns].drop_duplicates().reset_index(drop=True)
+        m = len(self.bottom)
+        if m == 0:
+            raise ValueError("Hierarchy needs at least one bottom series")
+        weights = np.ones(m) if weights is None else np.asarray(weights, dtype=float)
+        if weights.shape != (m,):
+            raise ValueError(f"Expected {m} bottom-series weights, got {weights.size}")
+        if not (np.isfinite(weights) & (weights > 0)).all():
+            raise ValueError("Bottom-series weights must be positive and not missing")
+
+        # Columns the bottom series actually break down by
+        specific = {col: (self.bottom[col] != totals[col]).to_numpy() for col in self.columns}
+        mixed = [col for col, on in specific.items() if on.any() and not on.all()]
+        if mixed:
+            raise ValueError(f"Bottom series must all be at one level; mixed totals in {mixed}")
+        present_levels = [col for col in self.levels if specific[col].all()]
+        present_cross = [col for col in self.cross if specific[col].all()]
+
+        node_frames, blocks = [], []
+        for depth in range(len(present_levels) + 1):
+            for n_cross in range(len(present_cross) + 1):
+                for crossed in combinations(present_cross, n_cross):
+                    grouping = present_levels[:depth] + list(crossed)
+                    if grouping:
+                        codes, uniques = pd.MultiIndex.from_frame(self.bottom[grouping]).factorize()
+                        nodes = pd.DataFrame(list(uniques), columns=grouping)
+                    else:
+                        codes, nodes = np.zeros(m, dtype=np.int64), pd.DataFrame(index=[0])
+                    for col in self.columns:
+                        if col not in grouping:
+                            nodes[col] = totals[col]
+                    nodes['level'] = ' x '.join(grouping) if grouping else 'total'
+                    finest = depth == len(present_levels) and n_cross == len(present_cross)
+                    block = sparse.csr_matrix((np.ones(m) if finest else weights, (codes, np.arange(m))),
+                                              shape=(len(nodes), m))
+                    if aggregation == 'mean' and not finest:
+                        totals_w = np.asarray(block.sum(axis=1)).ravel()
+                        scale = np.divide(1.0, totals_w, out=np.zeros_like(totals_w), where=totals_w != 0)
+                        block = sparse.diags(scale) @ block
+                    node_frames.append(nodes[self.columns + ['level']])
+                    blocks.append(block)
+
+        self.nodes = pd.concat(node_frames, ignore_index=True)
+        self.S = sparse.vstack(blocks).tocsr()
+
+    @classmethod
+    def from_panel(cls, panel: pd.DataFrame, levels: Sequence[str] = ('location', 'region'),
+                   cross: Sequence[str] = ('gender',), totals: Dict[str, str] = TOTALS,
+                   **kwargs) -> 'Hierarchy':
+        """Hierarchy whose bottom series are the finest rows of a panel (see finest_series)."""
+        columns = list(levels) + list(cross)
+        bottom, _ = finest_series(normalize_keys(panel, columns, totals), columns, totals)
+        return cls(bottom, levels, cross, totals=totals, **kwargs)
+
+    @property
+    def index(self) -> pd.MultiIndex:
+        return pd.MultiIndex.from_frame(self.nodes[self.columns])
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+def shrinkage_covariance(residuals: np.ndarray):
+    """Schafer-Strimmer shrinkage of the residual covariance, as diagonal + low rank.
+
+    Computed from T x T products only, so it is cheap for thousands of series.
+
+    Args:
+        residuals: Shape (T, n); missing residuals as 0
+
+    Returns:
+        (diagonal d of shape (n,), factor U of shape (n, T), lambda) with
+        W = diag(d) + U U' = lambda * diag(cov) + (1 - lambda) * cov
+    """
+    t, _ = residuals.shape
+    variance = (residuals ** 2).sum(axis=0) / t
+    scale = np.sqrt(np.where(variance > 0, variance, 1.0))
+    xs = residuals / scale
+
+    # Off-diagonal sums of squared correlations and of their estimated variances
+    gram = xs @ xs.T
+    col_sq = (xs ** 2).sum(axis=0)
+    row_sq = (xs ** 2).sum(axis=1)
+    corr_sq = ((gram ** 2).sum() - (col_sq ** 2).sum()) / t ** 2
+    var_sum = ((row_sq ** 2).sum() - (xs ** 4).sum()
+               - ((gram ** 2).sum() - (col_sq ** 2).sum()) / t) / (t * (t - 1)) if t > 1 else 0.0
+    lam = float(np.clip(var_sum / corr_sq, 0.0, 1.0)) if corr_sq > 0 else 1.0
+
+    # Keep the diagonal invertible for series the trend fits exactly
+    floor = 1e-8 * max(variance.mean(), 1.0)
+    diagonal = lam * np.maximum(variance, floor) + (1 - lam) * floor
+    factor = residuals.T * np.sqrt((1 - lam) / t)
+    return diagonal, factor, lam
+
+
+def reconcile(S: sparse.csr_matrix, base: np.ndarray, method: str = 'ols',
+              residuals: Optional[np.ndarray] = None) -> np.ndarray:
+    """Coherent forecasts for every node of S.
+
+    Args:
+        S: Summing matrix (nodes x bottom series) ending with the identity
+            block of the bottom series, as Hierarchy builds it
+        base: Base forecasts, shape (nodes, horizons); aggregate rows may be
+            NaN (nodes without a base forecast), bottom rows may not
+        method: One of METHODS
+        residuals: In-sample residuals (T, nodes) for 'wls_var' and 'mint_shrink'
+
+    Returns:
+        Reconciled forecasts, shape (nodes, horizons)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}. Choose from {METHODS}")
+    n, m = S.shape
+    if (S[n - m:] != sparse.identity(m, format='csr')).nnz:
+        raise ValueError("S must end with the identity block of the bottom series")
+    base = np.asarray(base, dtype=float).reshape(n, -1)
+    if np.isnan(base[n - m:]).any():
+        raise ValueError("Every bottom series needs a base forecast")
+
+    # Aggregates without a base forecast add no constraint; they are filled from S at the end
+    observed = np.flatnonzero(~np.isnan(base[:n - m]).any(axis=1))
+    kept = np.concatenate([observed, np.arange(n - m, n)])
+    S_agg, k = S[observed], len(observed)
+    y = base[kept]
+    if k == 0:
+        return S @ y
+
+    factor = None
+    if method == 'ols':
+        diagonal = np.ones(len(kept))
+    elif method == 'wls_struct':
+        diagonal = np.asarray((S[kept] != 0).sum(axis=1), dtype=float).ravel()
+    else:
+        if residuals is None:
+            raise ValueError(f"Method '{method}' needs in-sample residuals")
+        diagonal, factor, _ = shrinkage_covariance(residuals[:, kept])
+        if method == 'wls_var':
+            diagonal = diagonal + (factor ** 2).sum(axis=1)
+            factor = None
+
+    # y_tilde = y - W C' (C W C')^-1 C y with constraints C = [I, -S_agg]. For diagonal
+    # D, C D C' = D_agg + S_agg D_bottom S_agg' stays sparse (unlike S' W^-1 S)
+    constraints = sparse.hstack([sparse.identity(k), -S_agg]).tocsr()
+    lu = splu((sparse.diags(diagonal[:k]) + S_agg @ sparse.diags(diagonal[k:]) @ S_agg.T).tocsc())
+    gap = constraints @ y
+    if factor is None:
+        multipliers = lu.solve(gap)
+    else:
+        # Woodbury with W = D + U U': (K + V V')^-1 = K^-1 - K^-1 V (I + V' K^-1 V)^-1 V' K^-1
+        v = constraints @ factor
+        k_gap, k_v = lu.solve(gap), lu.solve(v)
+        multipliers = k_gap - k_v @ np.linalg.solve(np.eye(v.shape[1]) + v.T @ k_v, v.T @ k_gap)
+
+    spread = constraints.T @ multipliers
+    adjustment = diagonal[:, None] * spread
+    if factor is not None:
+        adjustment += factor @ (factor.T @ spread)
+    return S @ (y[k:] - adjustment[k:])
+
+
+class HierarchicalForecaster:
+    """Trend forecasts for every node of a location/region x gender hierarchy, reconciled.
+
+    Args:
+        forecast_years: Years to forecast
+        levels, cross, aggregation: See Hierarchy
+        method: Reconciliation method (see METHODS)
+    """
+
+    def __init__(self, forecast_years: Sequence[int], levels: Sequence[str] = ('location', 'region'),
+                 cross: Sequence[str] = ('gender',), aggregation: str = 'mean', method: str = 'mint_shrink',
+                 totals: Dict[str, str] = TOTALS):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method: {method}. Choose from {METHODS}")
+        self.forecast_years = [int(y) for y in forecast_years]
+        self.levels, self.cross, self.totals = list(levels), list(cross), totals
+        self.columns = self.levels + self.cross
+        self.aggregation, self.method = aggregation, method
+
+    def _annual(self, observations: pd.DataFrame) -> pd.DataFrame:
+        panel = normalize_keys(observations, self.columns, self.totals)
+        years = period_year(month_index(panel['observation_date'])) if 'year' not in panel.columns \
+            else panel['year'].to_numpy()
+        panel = panel.assign(year=years, value_numeric=pd.to_numeric(panel['value_numeric'], errors='coerce'))
+        panel = panel[(panel['year'] >= 0) & panel['value_numeric'].notna()]
+        return panel.groupby(self.columns + ['year'], sort=False)['value_numeric'].mean().reset_index()
+
+    def fit(self, observations: pd.DataFrame, weights: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Base and reconciled forecasts for one indicator's observations.
+
+        Args:
+            observations: Rows of one indicator with the hierarchy columns,
+                value_numeric and observation_date (or year)
+            weights: Optional bottom-series weights (hierarchy columns + weight);
+                every fitted bottom series needs a positive weight
+
+        Returns:
+            One row per (node, year) with level, base and reconciled forecasts
+        """
+        annual = self._annual(observations)
+        keys = self.columns
+        base = batch_trend_forecast(annual, self.forecast_years, keys=keys)
+
+        # Bottom series are the finest level with a base forecast (two or more years)
+        fitted = base.dropna(subset=['forecast'])
+        if fitted.empty:
+            raise ValueError("No series with two or more years of observations to forecast")
+        fitted_bottom, grouping = finest_series(fitted, keys, self.totals)
+        observed, observed_grouping = finest_series(annual, keys, self.totals)
+        if len(observed_grouping) > len(grouping):
+            print(f"⚠️ Series below {' x '.join(grouping) or 'total'} have fewer than two years; left out")
+        elif len(observed) > len(fitted_bottom):
+            print(f"⚠️ {len(observed) - len(fitted_bottom)} bottom series with fewer than two years left out")
+        bottom_weights = None
+        if weights is not None:
+            matched = fitted_bottom.merge(normalize_keys(weights, keys, self.totals)[keys + ['weight']],
+                                          on=keys, how='left')
+            missing = matched.loc[matched['weight'].isna(), keys]
+            if len(missing):
+                raise ValueError(f"No weight for {len(missing)} bottom series, e.g. "
+                                 f"{missing.iloc[0].to_dict()}")
+            bottom_weights = matched['weight'].to_numpy(dtype=float)
+        hierarchy = Hierarchy(fitted_bottom, self.levels, self.cross, self.aggregation,
+                              bottom_weights, self.totals)
+
+        node_index = hierarchy.index
+        base_matrix = self._matrix(base, node_index, 'forecast', self.forecast_years)
+
+        residuals = None
+        if self.method in ('wls_var', 'mint_shrink'):
+            history = sorted(annual['year'].unique())
+            fitted = self._matrix(batch_trend_forecast(annual, history, keys=keys), node_index, 'forecast', history)
+            actual = self._matrix(annual.rename(columns={'value_numeric': 'forecast'}), node_index, 'forecast', history)
+            residuals = np.nan_to_num(actual - fitted).T
+
+        reconciled = reconcile(hierarchy.S, base_matrix, self.method, residuals)
+        n_years = len(self.forecast_years)
+        result = hierarchy.nodes.loc[np.repeat(np.arange(len(hierarchy)), n_years)].reset_index(drop=True)
+        result['year'] = np.tile(self.forecast_years, len(hierarchy))
+        result['base'] = base_matrix.ravel()
+        result['reconciled'] = reconciled.ravel()
+        result['method'] = self.method
+        return result
+
+    def _matrix(self, frame: pd.DataFrame, node_index: pd.MultiIndex, value_col: str,
+                years: Sequence[int]) -> np.ndarray:
+        """(nodes, years) matrix of a long frame's values; NaN where a node has none."""
+        wide = frame.pivot_table(index=self.columns, columns='year', values=value_col, aggfunc='mean')
+        return wide.reindex(index=node_index, columns=list(years)).to_numpy(dtype=float)
+
+    def run(self, observations: pd.DataFrame, indicator_codes: Optional[List[str]] = None,
+            weights: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Reconciled forecasts for every indicator (one hierarchy per indicator)."""
+        codes = indicator_codes or observations['indicator_code'].dropna().unique().tolist()
+        frames = []
+        for code in codes:
+            rows = observations[observations['indicator_code'] == code]
+            if rows.empty:
+                continue
+            frames.append(self.fit(rows, weights).assign(indicator_code=code))
+        result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        print(f"✅ Reconciled {len(codes)} indicator hierarchies ({self.method})")
+        return result
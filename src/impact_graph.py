@@ -0,0 +1,208 @@
+"""
+Sparse event x indicator impact graph with multi-hop, lag-aware propagation.
+
+Impact links become edges of a directed graph stored as SciPy CSR matrices:
+
+    event -> indicator       impact_link whose parent_id is an event (EVT_ id)
+    indicator -> indicator   impact_link whose parent_id is an indicator code;
+                             its impact_estimate is the pass-through per unit
+                             change of the parent indicator and is required
+                             (links without one are dropped with a warning)
+
+Indirect chains such as Safaricom entry -> AFF_DATA_INCOME -> USG_P2P_COUNT
+-> ACC_OWNERSHIP are followed hop by hop with sparse products. Lags add up
+along a path, so propagation keeps one sparse (event x indicator) matrix per
+cumulative lag. The dense association matrix is only materialized on request.
+"""
+import os
+from collections import defaultdict
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .artifact_cache import ArtifactCache, write_output
+from .data_handler import ID_PREFIXES
+from .impact_model import direction_signs, impact_estimates, impact_proportions
+
+
+def _csr_by_lag(rows: np.ndarray, cols: np.ndarray, weights: np.ndarray, lags: np.ndarray,
+                shape) -> Dict[int, sparse.csr_matrix]:
+    """One CSR matrix per distinct lag (duplicate edges are summed)."""
+    matrices = {}
+    for lag in np.unique(lags):
+        mask = lags == lag
+        matrices[int(lag)] = sparse.csr_matrix((weights[mask], (rows[mask], cols[mask])), shape=shape)
+    return matrices
+
+
+class ImpactGraph:
+    """Event and indicator nodes with signed, lagged impact edges.
+
+    Args:
+        impacts: impact_link records (parent_id, related_indicator,
+            impact_direction, impact_estimate/impact_magnitude, lag_months,
+            relationship_type)
+        relationship_types: Only keep links of these types (default: all)
+        signed: Apply impact_direction signs to magnitudes
+    """
+
+    def __init__(self, impacts: pd.DataFrame, relationship_types: Optional[Sequence[str]] = None,
+                 signed: bool = True):
+        if 'record_type' in impacts.columns:
+            impacts = impacts[impacts['record_type'] == 'impact_link']
+        if relationship_types is not None:
+            impacts = impacts[impacts['relationship_type'].isin(relationship_types)]
+        impacts = impacts.reset_index(drop=True)
+
+        # An indicator link's estimate is a pass-through per unit, not a
+        # percentage-point effect, so magnitude-label defaults do not apply
+        from_indicator = ~impacts['parent_id'].astype(str).str.startswith(f"{ID_PREFIXES['event']}_")
+        unestimated = from_indicator & pd.to_numeric(impacts['impact_estimate'], errors='coerce').isna()
+        if unestimated.any():
+            print(f"⚠️ Dropping {int(unestimated.sum())} indicator -> indicator link(s) without an impact_estimate")
+            impacts = impacts[~unestimated].reset_index(drop=True)
+
+        parents = impacts['parent_id'].astype(str)
+        targets = impacts['related_indicator'].astype(str)
+        from_indicator = ~parents.str.startswith(f"{ID_PREFIXES['event']}_")
+
+        self.indicators = pd.Index(pd.unique(pd.concat([targets, parents[from_indicator]])))
+        self.events = pd.Index(pd.unique(parents[~from_indicator]))
+
+        weights = impact_estimates(impacts).to_numpy(dtype=float)
+        if signed:
+            weights = weights * direction_signs(impacts['impact_direction'])
+        lags = np.rint(np.nan_to_num(pd.to_numeric(impacts['lag_months'], errors='coerce')
+                                     .to_numpy(dtype=float))).astype(np.int64)
+
+        ev = ~from_indicator.to_numpy()
+        self.direct = _csr_by_lag(self.events.get_indexer(parents[ev]),
+                                  self.indicators.get_indexer(targets[ev]),
+                                  weights[ev], lags[ev], (len(self.events), len(self.indicators)))
+        ind = from_indicator.to_numpy()
+        self.links = _csr_by_lag(self.indicators.get_indexer(parents[ind]),
+                                 self.indicators.get_indexer(targets[ind]),
+                                 weights[ind], lags[ind], (len(self.indicators), len(self.indicators)))
+
+    @classmethod
+    def from_csv(cls, path: str = "models/impacts_refined.csv", **kwargs) -> 'ImpactGraph':
+        return cls(pd.read_csv(path), **kwargs)
+
+    def add_indicator_links(self, links: pd.DataFrame):
+        """Add indicator -> indicator edges (source, target, elasticity, lag_months)."""
+        for code in pd.unique(pd.concat([links['source'], links['target']])):
+            if code not in self.indicators:
+                self._add_indicator(code)
+        lags = np.rint(links['lag_months'].fillna(0).to_numpy(dtype=float)).astype(np.int64)
+        new = _csr_by_lag(self.indicators.get_indexer(links['source']),
+                          self.indicators.get_indexer(links['target']),
+                          links['elasticity'].to_numpy(dtype=float), lags,
+                          (len(self.indicators), len(self.indicators)))
+        for lag, matrix in new.items():
+            self.links[lag] = self.links[lag] + matrix if lag in self.links else matrix
+
+    def _add_indicator(self, code: str):
+        """Grow every matrix by one indicator column (and row for links)."""
+        self.indicators = self.indicators.append(pd.Index([code]))
+        n = len(self.indicators)
+        self.direct = {lag: sparse.csr_matrix((m.data, m.indices, m.indptr), shape=(m.shape[0], n))
+                       for lag, m in self.direct.items()}
+        self.links = {lag: sparse.csr_matrix(sparse.block_diag([m, sparse.csr_matrix((1, 1))]))
+                      for lag, m in self.links.items()}
+
+    def propagate(self, max_hops: int = 3, horizon_months: Optional[int] = None) -> Dict:
+        """Effects reaching each indicator, keyed by (hops, cumulative lag).
+
+        Returns:
+            {(hops, lag_months): CSR (events x indicators)}; hop 1 is the direct links
+        """
+        frontier = {lag: m for lag, m in self.direct.items()
+                    if horizon_months is None or lag <= horizon_months}
+        effects = {(1, lag): m for lag, m in frontier.items() if m.nnz}
+
+        for hops in range(2, max_hops + 1):
+            arrivals = defaultdict(lambda: None)
+            for lag, reached in frontier.items():
+                for link_lag, link in self.links.items():
+                    arrival = lag + link_lag
+                    if horizon_months is not None and arrival > horizon_months:
+                        continue
+                    step = reached @ link
+                    if step.nnz:
+                        arrivals[arrival] = step if arrivals[arrival] is None else arrivals[arrival] + step
+            frontier = {lag: m for lag, m in arrivals.items() if m is not None}
+            effects.update({(hops, lag): m for lag, m in frontier.items()})
+            if not frontier:
+                break
+        return effects
+
+    def paths_frame(self, max_hops: int = 3, horizon_months: Optional[int] = None) -> pd.DataFrame:
+        """Long event/indicator/hops/lag_months/effect frame of propagated effects."""
+        parts = []
+        for (hops, lag), matrix in self.propagate(max_hops, horizon_months).items():
+            coo = matrix.tocoo()
+            parts.append(pd.DataFrame({'event_id': self.events[coo.row], 'indicator': self.indicators[coo.col],
+                                       'hops': hops, 'lag_months': lag, 'effect': coo.data}))
+        columns = ['event_id', 'indicator', 'hops', 'lag_months', 'effect']
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        frame = pd.concat(parts, ignore_index=True)
+        return frame[frame['effect'] != 0].sort_values(['event_id', 'indicator', 'hops', 'lag_months'],
+                                                       ignore_index=True)
+
+    def total_effects(self, max_hops: int = 3, months: Optional[float] = None) -> sparse.csr_matrix:
+        """Events x indicators effect summed over paths.
+
+        With months set, each path contributes the share realised after that
+        many months (gradual ramp over its cumulative lag); otherwise its full effect.
+        """
+        total = sparse.csr_matrix((len(self.events), len(self.indicators)))
+        for (_, lag), matrix in self.propagate(max_hops).items():
+            share = 1.0 if months is None else float(impact_proportions(months, lag))
+            total = total + matrix * share
+        return total.tocsr()
+
+    def to_dense(self, max_hops: int = 1, months: Optional[float] = None) -> pd.DataFrame:
+        """Dense events x indicators association matrix."""
+        return pd.DataFrame(self.total_effects(max_hops, months).toarray(),
+                            index=pd.Index(self.events, name='record_id'), columns=self.indicators)
+
+    def association_frame(self, max_hops: int = 1, events: Optional[pd.DataFrame] = None,
+                          months: Optional[float] = None) -> pd.DataFrame:
+        """Dense association matrix as a frame, optionally with event metadata columns."""
+        dense = self.to_dense(max_hops, months).reset_index()
+        if events is not None:
+            meta = events[['record_id', 'indicator', 'category', 'observation_date']].rename(
+                columns={'indicator': 'event_name'})
+            dense = meta.merge(dense, on='record_id', how='right')
+        return dense
+
+    def fingerprint_inputs(self) -> Dict:
+        """Everything the matrices are built from, for ArtifactCache keys."""
+        def edges(matrices):
+            return {str(lag): [m.indptr, m.indices, m.data] for lag, m in sorted(matrices.items())}
+        return {'events': list(self.events), 'indicators': list(self.indicators),
+                'direct': edges(self.direct), 'links': edges(self.links)}
+
+    def export_csv(self, path: str, max_hops: int = 1, events: Optional[pd.DataFrame] = None,
+                   months: Optional[float] = None, cache: Optional[ArtifactCache] = None) -> pd.DataFrame:
+        """Write the dense association matrix, optionally with event metadata columns.
+
+        With a cache, an unchanged graph and settings reuse the stored matrix
+        (named after the file, e.g. association_matrix_refined).
+        """
+        if cache is None:
+            dense = self.association_frame(max_hops, events, months)
+            write_output(dense, path)
+        else:
+            inputs = {'graph': self.fingerprint_inputs(), 'events': events,
+                      'config': {'max_hops': max_hops, 'months': months}}
+            name = os.path.splitext(os.path.basename(path))[0]
+            dense = cache.get_or_compute(name, inputs, lambda: self.association_frame(max_hops, events, months),
+                                         output_path=path)
+            cache.flush()
+        print(f"✅ Association matrix ({len(dense)} events x {len(self.indicators)} indicators, "
+              f"{max_hops} hop(s)) written to {path}")
+        return dense
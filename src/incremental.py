@@ -0,0 +1,314 @@
+"""
+Incremental re-forecasting driven by dependency tracking.
+
+Every forecast series and association-matrix row records what it was
+computed from:
+
+    forecast series (indicator)   the indicator's observations, the impact
+                                  links targeting it and their parent events
+    association row (event)       the event and its impact links
+
+Dependencies are saved next to each output (<output>.deps.json) and loaded
+into an inverted index from each indicator, event and impact link to the
+outputs that read it. A ChangeSet from DataHandler.add_records is looked up
+in that index, so only the affected series are refit and only their rows
+are replaced; a monthly refresh costs time proportional to what changed.
+
+Example:
+    handler.add_records([new_findex_row], 'observation')
+    changes = handler.take_changes()
+    IncrementalForecaster(range(2025, 2031)).refresh(handler.df, changes)
+    refresh_association_matrix(handler.df, changes)
+"""
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import pandas as pd
+
+from .artifact_cache import DEFAULT_CACHE_DIR, ArtifactCache
+from .data_handler import ID_PREFIXES, ChangeSet
+from .forecasting import batch_trend_forecast, event_impact_by_year, future_event_impacts
+from .periods import PERIOD_COLUMN, month_index, period_year
+
+
+FORECAST_STORE = "forecasts/indicator_forecasts.csv"
+ASSOCIATION_STORE = "models/association_matrix_incremental.csv"
+DEPENDENCY_KINDS = ('indicators', 'events', 'impact_links')
+ASSOCIATION_META = ['record_id', 'event_name', 'category', 'observation_date']
+
+
+class DependencyIndex:
+    """Outputs keyed by name, each with the indicators, events and impact links it read."""
+
+    def __init__(self, dependencies: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        self.dependencies: Dict[str, Dict[str, List[str]]] = {}
+        self._readers = {kind: {} for kind in DEPENDENCY_KINDS}
+        for output, deps in (dependencies or {}).items():
+            self.set(output, **deps)
+
+    def set(self, output: str, indicators: Iterable[str] = (), events: Iterable[str] = (),
+            impact_links: Iterable[str] = ()):
+        """Record (or replace) the inputs of one output."""
+        self.drop([output])
+        deps = {'indicators': sorted(set(indicators)), 'events': sorted(set(events)),
+                'impact_links': sorted(set(impact_links))}
+        self.dependencies[output] = deps
+        for kind, ids in deps.items():
+            for node in ids:
+                self._readers[kind].setdefault(node, set()).add(output)
+
+    def drop(self, outputs: Iterable[str]):
+        for output in outputs:
+            deps = self.dependencies.pop(output, None)
+            if deps is None:
+                continue
+            for kind, ids in deps.items():
+                for node in ids:
+                    self._readers[kind].get(node, set()).discard(output)
+
+    def affected(self, changes: ChangeSet) -> Set[str]:
+        """Outputs that read any changed indicator, event or impact link."""
+        dirty = set()
+        for kind in DEPENDENCY_KINDS:
+            readers = self._readers[kind]
+            for node in getattr(changes, kind):
+                dirty |= readers.get(node, set())
+        return dirty
+
+    def save(self, path: str, **meta):
+        _atomic_write(path, lambda tmp: _dump_json(tmp, {**meta, 'dependencies': self.dependencies}))
+
+    @classmethod
+    def load(cls, path: str):
+        """(index, meta) from a saved dependency file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        return cls(payload.pop('dependencies')), payload
+
+
+def _dump_json(path: str, payload: Dict):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=1)
+
+
+def _atomic_write(path: str, write):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _deps_path(output_path: str) -> str:
+    return os.path.splitext(output_path)[0] + '.deps.json'
+
+
+def _records(df: pd.DataFrame, record_type: str) -> pd.DataFrame:
+    return df[df['record_type'] == record_type]
+
+
+def _impact_links(df: pd.DataFrame) -> pd.DataFrame:
+    impacts = _records(df, 'impact_link')
+    return impacts.assign(parent_id=impacts['parent_id'].astype(str),
+                          related_indicator=impacts['related_indicator'].astype(str),
+                          record_id=impacts['record_id'].astype(str))
+
+
+def _is_event(ids: pd.Series) -> pd.Series:
+    return ids.str.startswith(f"{ID_PREFIXES['event']}_")
+
+
+class IncrementalForecaster:
+    """Event-augmented trend forecasts per series, refit only where inputs changed.
+
+    Args:
+        forecast_years: Years to forecast
+        output_path: Forecast store (one row per series and year)
+        keys: Columns identifying a series; must include indicator_code, the
+            unit dependencies are tracked at
+        cache_dir: ArtifactCache for refit series, keyed by the records they
+            read; None disables it
+    """
+
+    def __init__(self, forecast_years: Sequence[int], output_path: str = FORECAST_STORE,
+                 keys: Sequence[str] = ('indicator_code',), cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        if 'indicator_code' not in keys:
+            raise ValueError("keys must include 'indicator_code'")
+        self.forecast_years = [int(y) for y in forecast_years]
+        self.output_path = output_path
+        self.deps_path = _deps_path(output_path)
+        self.keys = list(keys)
+        self.cache_dir = cache_dir
+        self._cache: Optional[ArtifactCache] = None
+
+    def dependencies(self, impacts: pd.DataFrame, codes: Iterable[str]) -> Dict[str, Dict[str, List[str]]]:
+        """What each indicator's forecast reads: itself, its impact links and their parent events."""
+        codes = list(codes)
+        links = impacts[impacts['related_indicator'].isin(codes)]
+        deps = {code: {'indicators': [code], 'events': [], 'impact_links': []} for code in codes}
+        for code, group in links.groupby('related_indicator', sort=False):
+            deps[code]['impact_links'] = group['record_id'].tolist()
+            deps[code]['events'] = group.loc[_is_event(group['parent_id']), 'parent_id'].tolist()
+        return deps
+
+    def forecast(self, df: pd.DataFrame, codes: Iterable[str]) -> pd.DataFrame:
+        """Trend plus event impacts for every series of the given indicators.
+
+        With a cache, a set of indicators whose observations, impact links and
+        linked events are unchanged is not refit.
+        """
+        codes = sorted(codes)
+        if self.cache_dir is None:
+            return self._forecast(df, codes)
+        if self._cache is None:
+            self._cache = ArtifactCache(self.cache_dir)
+
+        observations = _records(df, 'observation')
+        impacts = _impact_links(df)
+        impacts = impacts[impacts['related_indicator'].isin(codes)]
+        events = _records(df, 'event')
+        inputs = {
+            'observations': observations[observations['indicator_code'].isin(codes)],
+            'impacts': impacts,
+            'events': events[events['record_id'].astype(str).isin(impacts['parent_id'])],
+            'config': {'codes': codes, 'years': self.forecast_years, 'keys': self.keys}
+        }
+        result = self._cache.get_or_compute('indicator_forecasts', inputs, lambda: self._forecast(df, codes))
+        self._cache.flush()
+        return result
+
+    def _forecast(self, df: pd.DataFrame, codes: List[str]) -> pd.DataFrame:
+        observations = _records(df, 'observation')
+        observations = observations[observations['indicator_code'].isin(codes)]
+        years = period_year(month_index(observations['observation_date']))
+        observations = observations.assign(
+            year=years, value_numeric=pd.to_numeric(observations['value_numeric'], errors='coerce')
+        )[years >= 0]
+        if observations.empty:
+            return pd.DataFrame(columns=self.keys + ['year', 'trend', 'event_impact', 'forecast',
+                                                     'lower_95', 'upper_95', 'n_obs'])
+
+        result = batch_trend_forecast(observations, self.forecast_years, keys=self.keys)
+        result = result.rename(columns={'forecast': 'trend'})
+
+        # Event impacts per indicator, after each indicator's last observed year
+        events = _records(df, 'event')
+        events = events.assign(**{PERIOD_COLUMN: month_index(events['observation_date'])})
+        impacts = _records(df, 'impact_link')
+        last_year = observations.groupby('indicator_code')['year'].max()
+        impact = pd.DataFrame(
+            [event_impact_by_year(future_event_impacts(events, impacts, code, last_year[code]),
+                                  self.forecast_years) for code in last_year.index],
+            index=last_year.index, columns=self.forecast_years
+        ).stack()
+        lookup = pd.MultiIndex.from_arrays([result['indicator_code'], result['year']])
+        result['event_impact'] = impact.reindex(lookup).fillna(0.0).to_numpy()
+
+        result['forecast'] = result['trend'] + result['event_impact']
+        result['lower_95'] += result['event_impact'] * 0.8
+        result['upper_95'] += result['event_impact'] * 1.2
+        return result[self.keys + ['year', 'trend', 'event_impact', 'forecast',
+                                   'lower_95', 'upper_95', 'n_obs']]
+
+    def _load(self):
+        """(stored forecasts, dependency index) or None when a full build is needed."""
+        if not (os.path.exists(self.output_path) and os.path.exists(self.deps_path)):
+            return None
+        index, meta = DependencyIndex.load(self.deps_path)
+        if meta.get('forecast_years') != self.forecast_years or meta.get('keys') != self.keys:
+            return None
+        return pd.read_csv(self.output_path, dtype={'indicator_code': str}), index
+
+    def refresh(self, df: pd.DataFrame, changes: Optional[ChangeSet] = None) -> Dict:
+        """Bring the forecast store up to date with df.
+
+        Args:
+            df: Unified dataset (e.g. DataHandler.df after add_records)
+            changes: What changed since the store was written; None (or a
+                store from other years/keys) rebuilds every series
+
+        Returns:
+            Dict with the 'refit' indicator codes and the number of 'kept' rows
+        """
+        impacts = _impact_links(df)
+        observed = set(_records(df, 'observation')['indicator_code'].dropna().astype(str))
+        stored = self._load() if changes is not None else None
+
+        if stored is None:
+            existing, index = None, DependencyIndex()
+            dirty = observed
+        else:
+            existing, index = stored
+            dirty = (index.affected(changes) | changes.indicators) & observed
+
+        if existing is not None and not dirty:
+            print(f"✅ Forecasts up to date ({len(existing)} rows kept)")
+            return {'refit': [], 'kept': len(existing)}
+
+        refit = self.forecast(df, sorted(dirty))
+        kept = existing[~existing['indicator_code'].isin(dirty)] if existing is not None else None
+        frames = [frame for frame in (kept, refit) if frame is not None and not frame.empty]
+        result = pd.concat(frames, ignore_index=True) if frames else refit
+        result = result.sort_values(self.keys + ['year'], kind='stable', ignore_index=True)
+
+        for code, deps in self.dependencies(impacts, sorted(dirty)).items():
+            index.set(code, **deps)
+        _atomic_write(self.output_path, lambda tmp: result.to_csv(tmp, index=False))
+        index.save(self.deps_path, forecast_years=self.forecast_years, keys=self.keys)
+
+        n_kept = 0 if kept is None else len(kept)
+        print(f"✅ Refit {len(dirty)} indicator(s), kept {n_kept} forecast rows unchanged")
+        if self._cache is not None:
+            self._cache.report()
+        return {'refit': sorted(dirty), 'kept': n_kept}
+
+
+def refresh_association_matrix(df: pd.DataFrame, changes: Optional[ChangeSet] = None,
+                               output_path: str = ASSOCIATION_STORE) -> Dict:
+    """Rebuild only the association-matrix rows of events whose inputs changed.
+
+    Rows are one-hop (direct event -> indicator links), so a row depends on
+    its event and that event's impact links alone.
+
+    Returns:
+        Dict with the 'rebuilt' event ids and the number of 'kept' rows
+    """
+    from .impact_graph import ImpactGraph
+
+    deps_path = _deps_path(output_path)
+    impacts = _impact_links(df)
+    impacts = impacts[_is_event(impacts['parent_id'])]
+    events = _records(df, 'event').assign(record_id=lambda e: e['record_id'].astype(str))
+
+    if changes is None or not (os.path.exists(output_path) and os.path.exists(deps_path)):
+        existing, index = None, DependencyIndex()
+        dirty = set(impacts['parent_id'])
+    else:
+        existing = pd.read_csv(output_path, dtype={'record_id': str})
+        index, _ = DependencyIndex.load(deps_path)
+        dirty = (index.affected(changes) | changes.events) & set(impacts['parent_id'])
+
+    if existing is not None and not dirty:
+        print(f"✅ Association matrix up to date ({len(existing)} rows kept)")
+        return {'rebuilt': [], 'kept': len(existing)}
+
+    links = impacts[impacts['parent_id'].isin(dirty)]
+    rows = ImpactGraph(links).association_frame(events=events[events['record_id'].isin(dirty)])
+    kept = existing[~existing['record_id'].isin(dirty)] if existing is not None else None
+    result = pd.concat([kept, rows], ignore_index=True) if kept is not None else rows
+
+    meta = [c for c in ASSOCIATION_META if c in result.columns]
+    indicator_cols = [c for c in result.columns if c not in meta]
+    result[indicator_cols] = result[indicator_cols].fillna(0.0)
+    result = result[meta + indicator_cols].sort_values('record_id', kind='stable', ignore_index=True)
+
+    for event, group in links.groupby('parent_id', sort=False):
+        index.set(event, events=[event], impact_links=group['record_id'])
+    _atomic_write(output_path, lambda tmp: result.to_csv(tmp, index=False))
+    index.save(deps_path)
+
+    n_kept = 0 if kept is None else len(kept)
+    print(f"✅ Rebuilt {len(dirty)} association row(s), kept {n_kept} unchanged")
+    return {'rebuilt': sorted(dirty), 'kept': n_kept}
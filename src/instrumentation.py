@@ -0,0 +1,182 @@
+"""
+Opt-in timing and memory instrumentation for pipeline stages.
+
+Disabled by default; when off, instrumented functions run with one flag
+check of overhead. Enable it in code or from the environment:
+
+    from src import instrumentation
+    instrumentation.enable("metrics.jsonl", trace_memory=True)
+
+    FI_METRICS=metrics.jsonl python run_pipeline.py    # '-' writes to stderr
+
+Every stage emits one JSON line with wall time, CPU time, row count and
+throughput, the peak RSS of the whole process so far (process_peak_rss_mb,
+not the stage's own) and, with trace_memory, the tracemalloc peak of the
+outermost stage. Nested stages record their parent, so a slow 'load' inside
+'forecast' is attributable.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+_config = {'enabled': False, 'path': None, 'trace_memory': False}
+_records: List[Dict] = []
+_local = threading.local()
+_lock = threading.Lock()
+
+
+def enable(path: Optional[str] = None, trace_memory: bool = False):
+    """Start recording stages; path is a JSON-lines file ('-' for stderr, None to keep in memory)."""
+    _config.update(enabled=True, path=path, trace_memory=trace_memory)
+
+
+def disable():
+    _config['enabled'] = False
+
+
+def is_enabled() -> bool:
+    return _config['enabled']
+
+
+def records() -> List[Dict]:
+    """Stage records captured in this process."""
+    return list(_records)
+
+
+def clear():
+    _records.clear()
+
+
+def _process_peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _emit(record: Dict):
+    with _lock:
+        _records.append(record)
+        path = _config['path']
+        if path is None:
+            return
+        line = json.dumps(record, default=str)
+        if path == '-':
+            print(line, file=sys.stderr)
+        else:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+@contextmanager
+def stage(name: str, rows: Optional[int] = None, **tags):
+    """Time a block of work; set record['rows'] inside the block if not known upfront.
+
+    Example:
+        with stage('load', source=path) as record:
+            df = pd.read_csv(path)
+            record['rows'] = len(df)
+    """
+    if not _config['enabled']:
+        yield {}
+        return
+
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    outermost = not stack
+    trace = _config['trace_memory'] and outermost and not tracemalloc.is_tracing()
+
+    record = {'stage': name, 'rows': rows, 'parent': stack[-1] if stack else None, **tags}
+    stack.append(name)
+    if trace:
+        tracemalloc.start()
+    started = datetime.now()
+    wall, cpu = time.perf_counter(), time.process_time()
+    status = 'ok'
+
+    try:
+        yield record
+    except BaseException as e:
+        status = f"error: {type(e).__name__}"
+        raise
+    finally:
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        traced_peak = None
+        if trace:
+            traced_peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            tracemalloc.stop()
+        stack.pop()
+
+        rows = record.get('rows')
+        record.update({
+            'ts': started.isoformat(timespec='milliseconds'),
+            'wall_s': round(wall, 6),
+            'cpu_s': round(cpu, 6),
+            'rows_per_s': round(rows / wall, 1) if rows and wall > 0 else None,
+            'process_peak_rss_mb': _process_peak_rss_mb(),
+            'traced_peak_mb': traced_peak,
+            'status': status,
+            'pid': os.getpid()
+        })
+        _emit(record)
+
+
+def _default_rows(result, *args, **kwargs) -> Optional[int]:
+    """Row count of a frame result, or of the first frame of a tuple result."""
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    return len(result) if isinstance(result, (pd.DataFrame, pd.Series)) else None
+
+
+def instrumented(name: str, rows: Callable = _default_rows):
+    """Decorator form of stage(); rows(result, *args, **kwargs) gives the row count."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _config['enabled']:
+                return func(*args, **kwargs)
+            with stage(name, function=func.__qualname__) as record:
+                result = func(*args, **kwargs)
+                record['rows'] = rows(result, *args, **kwargs)
+                return result
+        return wrapper
+    return decorator
+
+
+def summary(path: Optional[str] = None) -> pd.DataFrame:
+    """Per-stage totals from captured records or a JSON-lines metrics file."""
+    if path is not None:
+        frame = pd.read_json(path, lines=True)
+    else:
+        frame = pd.DataFrame(_records)
+    if frame.empty:
+        return frame
+    return frame.groupby('stage').agg(
+        calls=('wall_s', 'size'),
+        total_wall_s=('wall_s', 'sum'),
+        total_cpu_s=('cpu_s', 'sum'),
+        rows=('rows', 'sum'),
+        max_process_peak_rss_mb=('process_peak_rss_mb', 'max')
+    ).sort_values('total_wall_s', ascending=False).reset_index()
+
+
+if os.environ.get('FI_METRICS'):
+    enable(os.environ['FI_METRICS'], trace_memory=os.environ.get('FI_METRICS_TRACE') == '1')
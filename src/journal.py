@@ -0,0 +1,89 @@
+"""
+Append-only on-disk journal of records added to the unified dataset.
+
+Each ``append`` writes one JSON object per record to the end of the journal
+file and syncs it, so enrichment work survives a crash before the enriched
+dataset is saved. The journal can be replayed into a DataHandler and is
+truncated once its records have been flushed to the enriched output.
+"""
+import json
+import os
+from typing import Iterator, Optional
+
+import pandas as pd
+
+
+class RecordJournal:
+    """JSON-lines journal of added records."""
+
+    def __init__(self, path: str = "data/processed/add_records.journal.jsonl"):
+        self.path = path
+
+    def append(self, records: pd.DataFrame) -> int:
+        """Append records to the journal and sync them to disk.
+
+        Returns:
+            Number of records written
+        """
+        if records.empty:
+            return 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        payload = records.to_json(orient='records', lines=True, date_format='iso')
+        if not payload.endswith('\n'):
+            payload += '\n'
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(records)
+
+    def iter_batches(self, batch_size: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Yield journaled records in batches, skipping a torn final line.
+
+        Raises:
+            ValueError: If a line before the last one cannot be decoded
+        """
+        if not os.path.exists(self.path):
+            return
+
+        batch, torn = [], None
+        with open(self.path, 'rb') as f:
+            for number, line in enumerate(f, start=1):
+                if torn is not None:
+                    # A crash mid-write can only tear the last line
+                    raise ValueError(f"Corrupt journal line {torn} in {self.path}")
+                if not line.strip():
+                    continue
+                try:
+                    batch.append(json.loads(line))
+                except ValueError:
+                    torn = number
+                    continue
+                if len(batch) >= batch_size:
+                    yield pd.DataFrame(batch)
+                    batch = []
+        if batch:
+            yield pd.DataFrame(batch)
+
+    def read(self) -> Optional[pd.DataFrame]:
+        """Read the whole journal (None when empty)."""
+        batches = list(self.iter_batches())
+        if not batches:
+            return None
+        return pd.concat(batches, ignore_index=True)
+
+    def truncate(self):
+        """Discard all journaled records."""
+        if os.path.exists(self.path):
+            open(self.path, 'w').close()
+
+    def __len__(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return sum(1 for line in f if line.strip())
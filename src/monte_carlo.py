@@ -0,0 +1,286 @@
+"""
+Parallel, streaming Monte Carlo uncertainty engine for forecasts.
+
+Each draw jointly samples the trend prediction error (Student-t with the
+fitted residual scale), every event impact magnitude and every impact lag.
+Draws are generated in fixed-size batches, each with its own ``SeedSequence``
+spawned from the root seed by batch index, and the batches are shared out
+over a process pool. Results therefore depend only on the seed, the number
+of draws and the batch size, not on the worker count. Workers only return
+fixed-size histogram sketches, never the raw draws, so memory does not grow
+with the number of draws.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .artifact_cache import ArtifactCache
+from .forecasting import fit_linear_trend
+from .instrumentation import instrumented
+
+
+DEFAULT_QUANTILES = (0.025, 0.05, 0.5, 0.95, 0.975)
+
+
+def quantile_column(q: float) -> str:
+    """Column name for a quantile, e.g. 0.025 -> 'p2.5'."""
+    return f"p{q * 100:g}"
+
+
+class QuantileSketch:
+    """Mergeable fixed-bin histogram sketch, one row of bins per forecast year.
+
+    Values outside [low, high] are clamped into the edge bins while the exact
+    extremes are tracked separately, so quantile error is bounded by the bin
+    width inside the range.
+    """
+
+    def __init__(self, low: np.ndarray, high: np.ndarray, n_bins: int = 20_000):
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.n_bins = n_bins
+        self.counts = np.zeros((len(self.low), n_bins), dtype=np.int64)
+        self.minimum = np.full(len(self.low), np.inf)
+        self.maximum = np.full(len(self.low), -np.inf)
+        self.total = 0
+        self.sum = np.zeros(len(self.low))
+        self.sum_sq = np.zeros(len(self.low))
+
+    def update(self, draws: np.ndarray):
+        """Add a (n_draws, n_years) block of draws."""
+        width = (self.high - self.low) / self.n_bins
+        bins = np.floor((draws - self.low) / width).astype(np.int64)
+        np.clip(bins, 0, self.n_bins - 1, out=bins)
+
+        offsets = np.arange(len(self.low)) * self.n_bins
+        flat = np.bincount((bins + offsets).ravel(), minlength=self.counts.size)
+        self.counts += flat.reshape(self.counts.shape)
+
+        self.minimum = np.minimum(self.minimum, draws.min(axis=0))
+        self.maximum = np.maximum(self.maximum, draws.max(axis=0))
+        self.total += len(draws)
+        self.sum += draws.sum(axis=0)
+        self.sum_sq += np.square(draws).sum(axis=0)
+
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch with identical bins into this one."""
+        self.counts += other.counts
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        self.total += other.total
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Interpolated quantiles, shape (len(qs), n_years)."""
+        width = (self.high - self.low) / self.n_bins
+        cumulative = np.cumsum(self.counts, axis=1)
+        result = np.empty((len(qs), len(self.low)))
+
+        for j in range(len(self.low)):
+            for i, q in enumerate(qs):
+                target = q * self.total
+                b = int(np.searchsorted(cumulative[j], target, side='left'))
+                b = min(b, self.n_bins - 1)
+                before = cumulative[j, b - 1] if b > 0 else 0
+                in_bin = self.counts[j, b]
+                fraction = (target - before) / in_bin if in_bin else 0.5
+                value = self.low[j] + (b + fraction) * width[j]
+                result[i, j] = np.clip(value, self.minimum[j], self.maximum[j])
+        return result
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.sum / self.total
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(np.maximum(self.sum_sq / self.total - self.mean ** 2, 0.0))
+
+
+def _draw_batch(params: Dict, rng: np.random.Generator, n: int) -> np.ndarray:
+    """Draw n joint samples of the forecast path, shape (n, n_years)."""
+    years = params['years']
+    trend = params['trend'][None, :]
+    noise = rng.standard_t(params['dof'], size=(n, 1)) * params['trend_scale'][None, :]
+    draws = trend + noise
+
+    if len(params['impact_estimate']):
+        magnitude = params['impact_estimate'] * rng.lognormal(
+            mean=-0.5 * params['magnitude_sd'] ** 2, sigma=params['magnitude_sd'],
+            size=(n, len(params['impact_estimate']))
+        )
+        lag = np.maximum(params['lag_months'] + rng.normal(0.0, params['lag_sd'],
+                                                           size=magnitude.shape), 0.0)
+        months_since = (years[None, None, :] - params['event_year'][None, :, None]) * 12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            proportion = np.where(lag[:, :, None] > 0,
+                                  np.minimum(1.0, months_since / np.maximum(lag, 1e-9)[:, :, None]),
+                                  1.0)
+        proportion = np.where(months_since >= 0, proportion, 0.0)
+        draws += np.einsum('ni,niy->ny', magnitude * params['sign'], proportion)
+
+    return draws
+
+
+def _run_worker(params: Dict, batches: Sequence[Tuple[int, np.random.SeedSequence, int]],
+                low: np.ndarray, high: np.ndarray, n_bins: int):
+    """Process-pool entry point: draw (index, seed, size) batches into one sketch.
+
+    Returns:
+        The sketch and {batch index: (sum, sum of squares)}, so the moments
+        can be added up in batch order whichever worker drew each batch
+    """
+    sketch = QuantileSketch(low, high, n_bins)
+    moments = {}
+    for index, seed_seq, n in batches:
+        draws = _draw_batch(params, np.random.default_rng(seed_seq), n)
+        sketch.update(draws)
+        moments[index] = (draws.sum(axis=0), np.square(draws).sum(axis=0))
+    return sketch, moments
+
+
+class MonteCarloForecaster:
+    """Monte Carlo forecast bands for one indicator.
+
+    Args:
+        historical_series: Annual series with year and value_numeric columns
+        forecast_years: Years to forecast
+        impacts: Output of forecasting.future_event_impacts (optional)
+        magnitude_sd: Log-scale spread of impact magnitudes (0.3 is roughly +/-30%)
+        lag_sd: Standard deviation of impact lags in months
+    """
+
+    def __init__(self, historical_series: pd.DataFrame, forecast_years: Sequence[int],
+                 impacts: Optional[pd.DataFrame] = None, magnitude_sd: float = 0.3,
+                 lag_sd: float = 3.0):
+        years = np.asarray(forecast_years, dtype=float)
+        x = historical_series['year'].to_numpy(dtype=float)
+        slope, intercept, std_error = fit_linear_trend(x, historical_series['value_numeric'])
+        n = len(x)
+        sxx = np.sum((x - x.mean()) ** 2)
+
+        if impacts is None or impacts.empty:
+            impacts = pd.DataFrame(columns=['event_year', 'impact_estimate', 'lag_months', 'sign'])
+
+        self.forecast_years = list(forecast_years)
+        self.params = {
+            'years': years,
+            'trend': slope * years + intercept,
+            # Prediction-interval scale of a simple linear regression
+            'trend_scale': std_error * np.sqrt(1 + 1 / n + (years - x.mean()) ** 2 / sxx),
+            'dof': max(n - 2, 1),
+            'event_year': impacts['event_year'].to_numpy(dtype=float),
+            'impact_estimate': impacts['impact_estimate'].to_numpy(dtype=float),
+            'lag_months': impacts['lag_months'].to_numpy(dtype=float),
+            'sign': impacts['sign'].to_numpy(dtype=float),
+            'magnitude_sd': magnitude_sd,
+            'lag_sd': lag_sd
+        }
+
+    def _sketch_bounds(self, rng: np.random.Generator):
+        """Histogram range from a pilot run, widened well past its extremes."""
+        pilot = _draw_batch(self.params, rng, 20_000)
+        spread = np.maximum(pilot.max(axis=0) - pilot.min(axis=0), 1e-6)
+        return pilot.min(axis=0) - spread, pilot.max(axis=0) + spread
+
+    @instrumented('forecast', rows=lambda result, self, n_draws=1_000_000, *args, **kwargs: n_draws)
+    def run(self, n_draws: int = 1_000_000, quantiles: Sequence[float] = DEFAULT_QUANTILES,
+            seed: int = 42, n_workers: Optional[int] = None, batch_size: int = 100_000,
+            n_bins: int = 20_000, cache: Optional[ArtifactCache] = None) -> pd.DataFrame:
+        """Simulate n_draws joint paths and summarise them.
+
+        Args:
+            n_draws: Total number of draws
+            quantiles: Quantiles to report (one column per quantile)
+            seed: Root seed; each batch gets an independent spawned stream
+            n_workers: Processes to fan out over (1 runs in-process); does
+                not change the result
+            batch_size: Draws generated per vectorized batch; part of the
+                result's identity along with seed and n_draws
+            n_bins: Histogram resolution of the streaming sketch
+            cache: Optional ArtifactCache; the same model parameters and
+                settings return the stored bands without simulating
+
+        Returns:
+            DataFrame with year, mc_mean, mc_std and one pN column per quantile
+        """
+        if n_draws < 1:
+            raise ValueError(f"n_draws must be at least 1, got {n_draws}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        if cache is not None:
+            # Worker count does not change the result, so it is not part of the key
+            inputs = {'params': self.params, 'forecast_years': self.forecast_years,
+                      'config': {'n_draws': n_draws, 'quantiles': list(quantiles), 'seed': seed,
+                                 'batch_size': batch_size, 'n_bins': n_bins}}
+            result = cache.get_or_compute('monte_carlo_bands', inputs, lambda: self.run(
+                n_draws, quantiles, seed, n_workers, batch_size, n_bins))
+            cache.flush()
+            return result
+        root = np.random.SeedSequence(seed)
+        pilot_seq, = root.spawn(1)
+        low, high = self._sketch_bounds(np.random.default_rng(pilot_seq))
+
+        sizes = [batch_size] * (n_draws // batch_size) + ([n_draws % batch_size] if n_draws % batch_size else [])
+        batches = list(zip(range(len(sizes)), root.spawn(len(sizes)), sizes))
+        n_workers = min(n_workers or min(os.cpu_count() or 1, 8), len(batches))
+
+        if n_workers == 1:
+            results = [_run_worker(self.params, batches, low, high, n_bins)]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                futures = [pool.submit(_run_worker, self.params, batches[i::n_workers], low, high, n_bins)
+                           for i in range(n_workers)]
+                results = [f.result() for f in futures]
+
+        sketch = QuantileSketch(low, high, n_bins)
+        moments = {}
+        for other, worker_moments in results:
+            sketch.merge(other)
+            moments.update(worker_moments)
+        # Bin counts and extremes merge exactly; float sums are added in batch order
+        sketch.sum, sketch.sum_sq = np.zeros(len(low)), np.zeros(len(low))
+        for index in sorted(moments):
+            sketch.sum += moments[index][0]
+            sketch.sum_sq += moments[index][1]
+
+        result = pd.DataFrame({'year': self.forecast_years,
+                               'mc_mean': sketch.mean,
+                               'mc_std': sketch.std})
+        for q, values in zip(quantiles, sketch.quantiles(quantiles)):
+            result[quantile_column(q)] = values
+
+        print(f"✅ Monte Carlo: {sketch.total:,} draws in {len(batches)} batch(es) "
+              f"across {n_workers} worker(s)")
+        return result
+
+
+def write_quantile_columns(forecast_path: str, mc_result: pd.DataFrame,
+                           update_bands: bool = True, output_path: Optional[str] = None) -> pd.DataFrame:
+    """Merge Monte Carlo quantile columns into a forecast CSV.
+
+    Args:
+        forecast_path: Forecast CSV with a year column
+        mc_result: Output of MonteCarloForecaster.run
+        update_bands: Replace lower_95/upper_95 with p2.5/p97.5 when available
+        output_path: Where to write (defaults to overwriting forecast_path)
+    """
+    forecast = pd.read_csv(forecast_path)
+    new_cols = [c for c in mc_result.columns if c != 'year']
+    forecast = forecast.drop(columns=[c for c in new_cols if c in forecast.columns])
+    forecast = forecast.merge(mc_result, on='year', how='left')
+
+    if update_bands and {'p2.5', 'p97.5'} <= set(forecast.columns):
+        forecast['lower_95'] = forecast['p2.5']
+        forecast['upper_95'] = forecast['p97.5']
+
+    path = output_path or forecast_path
+    tmp_path = path + '.tmp'
+    forecast.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    print(f"✅ Quantile columns {new_cols} written to {output_path or forecast_path}")
+    return forecast
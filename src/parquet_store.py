@@ -0,0 +1,140 @@
+"""
+Columnar Parquet storage backend for the unified financial inclusion dataset.
+
+Records are written to a single Parquet file sorted by ``record_type`` and
+``pillar`` so that every row group holds exactly one (record_type, pillar)
+combination. Row-group statistics then let readers skip everything that does
+not match a filter, and only the requested columns are decoded.
+
+Convert the raw CSV once with:
+
+    python -m src.parquet_store data/raw/ethiopia_fi_unified_data.csv
+"""
+import argparse
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .partitioned_store import arrow_table
+
+
+PARTITION_COLS = ['record_type', 'pillar']
+DEFAULT_ROW_GROUP_SIZE = 250_000
+
+Filters = List[Tuple[str, str, object]]
+
+
+def default_parquet_path(csv_path: str) -> str:
+    """Derive the Parquet path that sits next to a CSV file."""
+    root, _ = os.path.splitext(csv_path)
+    return root + '.parquet'
+
+
+def write_partitioned(df: pd.DataFrame, parquet_path: str,
+                      partition_cols: Sequence[str] = PARTITION_COLS,
+                      row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Write a frame with one row group (or more, if large) per partition key.
+
+    Object columns mixing Python types (as add_records batches can) are
+    stored as strings; the file is replaced atomically.
+
+    Returns:
+        Number of row groups written
+    """
+    keys = [c for c in partition_cols if c in df.columns]
+    if keys:
+        df = df.sort_values(keys, na_position='last', kind='stable')
+    df = df.reset_index(drop=True)
+    table = arrow_table(df)
+    tmp_path = parquet_path + '.tmp'
+    if df.empty:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, parquet_path)
+        return 0
+
+    n_groups = 0
+
+    # Boundaries where any partition key changes
+    boundaries = [0]
+    if keys:
+        key_frame = df[keys].astype(object).fillna('')
+        changed = (key_frame != key_frame.shift()).any(axis=1).to_numpy()
+        boundaries.extend(int(i) for i in changed.nonzero()[0] if i > 0)
+    boundaries.append(len(df))
+
+    # Readers never see a partly written file: write aside, then replace
+    with pq.ParquetWriter(tmp_path, table.schema, compression='snappy') as writer:
+        for start, stop in zip(boundaries[:-1], boundaries[1:]):
+            for chunk_start in range(start, stop, row_group_size):
+                chunk_stop = min(chunk_start + row_group_size, stop)
+                writer.write_table(table.slice(chunk_start, chunk_stop - chunk_start))
+                n_groups += 1
+    os.replace(tmp_path, parquet_path)
+
+    return n_groups
+
+
+def convert_csv_to_parquet(csv_path: str, parquet_path: Optional[str] = None,
+                           partition_cols: Sequence[str] = PARTITION_COLS,
+                           row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> str:
+    """One-shot conversion of a unified-schema CSV into the Parquet backend.
+
+    Args:
+        csv_path: Source CSV file
+        parquet_path: Destination file (defaults to the CSV path with a .parquet suffix)
+        partition_cols: Columns whose values define row-group boundaries
+        row_group_size: Maximum rows per row group
+
+    Returns:
+        Path of the written Parquet file
+    """
+    parquet_path = parquet_path or default_parquet_path(csv_path)
+    df = pd.read_csv(csv_path)
+    n_groups = write_partitioned(df, parquet_path, partition_cols, row_group_size)
+    print(f"✅ Converted {len(df)} records to {parquet_path} ({n_groups} row groups)")
+    return parquet_path
+
+
+def read_records(parquet_path: str, columns: Optional[List[str]] = None,
+                 filters: Optional[Filters] = None) -> pd.DataFrame:
+    """Read records with column projection and row-group predicate pushdown.
+
+    Args:
+        parquet_path: Parquet file written by ``write_partitioned``
+        columns: Columns to decode (None for all)
+        filters: pyarrow-style conjunction, e.g. [('record_type', '==', 'event')]
+    """
+    if columns is not None and filters:
+        # Filter columns must be read to apply the predicate, drop them afterwards
+        read_cols = list(dict.fromkeys(list(columns) + [f[0] for f in filters]))
+    else:
+        read_cols = columns
+
+    table = pq.read_table(parquet_path, columns=read_cols, filters=filters or None)
+    df = table.to_pandas()
+
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point for the CSV to Parquet conversion."""
+    parser = argparse.ArgumentParser(
+        description="Convert a unified-schema CSV into the partitioned Parquet backend."
+    )
+    parser.add_argument('csv_path', help="Source CSV file")
+    parser.add_argument('parquet_path', nargs='?', default=None,
+                        help="Destination Parquet file (default: next to the CSV)")
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help="Maximum rows per row group")
+    args = parser.parse_args(argv)
+
+    convert_csv_to_parquet(args.csv_path, args.parquet_path,
+                           row_group_size=args.row_group_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Partitioned, compressed and atomically committed output for the enriched dataset.
+
+The frame is split by record_type and observation year, and each partition
+is written as its own zstd-compressed Parquet file by a thread pool (Arrow
+encodes and compresses outside the GIL):
+
+    <output_dir>/record_type=observation/year=2024-<fingerprint>.parquet
+    <output_dir>/manifest.json
+
+Partition files are named by a fingerprint of their content and never
+overwritten, so the only commit point is the atomic replace of
+manifest.json. A crash mid-save leaves the previous manifest pointing at
+complete files from the previous save. Partitions whose fingerprint matches
+the manifest are not written again. Files no longer referenced are removed
+after the commit.
+
+Readers go through the manifest:
+
+    df = read_partitions('data/processed/ethiopia_fi_enriched', record_types=['observation'])
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .periods import month_index, period_year
+
+
+MANIFEST_NAME = 'manifest.json'
+PARTITION_SUFFIX = '.parquet'
+COMPRESSION = 'zstd'
+
+
+def partitioned_path(output_path: str) -> str:
+    """Directory for the partitioned layout of a single-file output path."""
+    return os.path.splitext(output_path)[0]
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a partition (values, row order and column names)."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update('\x1f'.join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def split_partitions(df: pd.DataFrame, date_col: str = 'observation_date',
+                     periods: Optional[np.ndarray] = None) -> Dict[tuple, pd.DataFrame]:
+    """Rows of df keyed by (record_type, year); year is None when the date is missing.
+
+    Args:
+        periods: Integer month periods of df's rows, if already parsed
+            (DataHandler.periods); otherwise parsed from date_col
+    """
+    record_types = df['record_type'].astype(object).where(df['record_type'].notna(), 'unknown') \
+        if 'record_type' in df.columns else pd.Series('unknown', index=df.index)
+    if periods is None:
+        periods = month_index(df[date_col]) if date_col in df.columns else np.full(len(df), -1)
+    years = period_year(periods)
+    keys = pd.DataFrame({'record_type': record_types.to_numpy(), 'year': years})
+    return {(record_type, None if year < 0 else int(year)): df.iloc[positions]
+            for (record_type, year), positions in keys.groupby(['record_type', 'year'], sort=True).indices.items()}
+
+
+def _relative_path(record_type: str, year: Optional[int], digest: str) -> str:
+    year_label = 'none' if year is None else str(year)
+    return os.path.join(f"record_type={record_type}", f"year={year_label}-{digest}{PARTITION_SUFFIX}")
+
+
+def arrow_table(df: pd.DataFrame) -> pa.Table:
+    """Arrow table of a partition; object columns Arrow cannot type are stored as strings."""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    normalized = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        values = df[col]
+        normalized[col] = values.astype(str).where(values.notna(), None)
+    return pa.Table.from_pandas(normalized, preserve_index=False)
+
+
+def _fsync_dir(path: str):
+    """Persist a directory's entries (new or renamed files); a no-op where unsupported."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_file(df: pd.DataFrame, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    pq.write_table(arrow_table(df), tmp_path, compression=COMPRESSION)
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_manifest(output_dir: str) -> Optional[Dict]:
+    """The committed manifest, or None if nothing has been saved yet."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_partitions(df: pd.DataFrame, output_dir: str, date_col: str = 'observation_date',
+                     periods: Optional[np.ndarray] = None, max_workers: Optional[int] = None) -> Dict:
+    """Write changed partitions in parallel and commit them with the manifest.
+
+    Args:
+        df: Frame to save
+        output_dir: Directory holding the partitions and manifest.json
+        date_col: Column whose year partitions the rows
+        periods: Already parsed periods of df's rows (see split_partitions)
+        max_workers: Writer threads (default: one per changed partition, up to the CPU count)
+
+    Returns:
+        The committed manifest plus 'written' and 'skipped' partition counts
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    previous = load_manifest(output_dir) or {'partitions': []}
+    committed = {entry['path'] for entry in previous['partitions']}
+
+    entries, pending = [], []
+    for (record_type, year), part in split_partitions(df, date_col, periods).items():
+        digest = fingerprint(part)
+        rel_path = _relative_path(record_type, year, digest)
+        entries.append({'record_type': record_type, 'year': year, 'rows': len(part),
+                        'fingerprint': digest, 'path': rel_path})
+        if rel_path not in committed or not os.path.exists(os.path.join(output_dir, rel_path)):
+            pending.append((part, os.path.join(output_dir, rel_path)))
+
+    if pending:
+        workers = max_workers or min(len(pending), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda job: _write_file(*job), pending))
+        # Partition files and their directory entries are durable before the manifest points at them
+        for partition_dir in sorted({os.path.dirname(path) for _, path in pending}):
+            _fsync_dir(partition_dir)
+        _fsync_dir(output_dir)
+
+    manifest = {
+        'written_at': datetime.now().isoformat(timespec='seconds'),
+        'format': 'parquet',
+        'rows': len(df),
+        'columns': [str(c) for c in df.columns],
+        'partitions': entries
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(manifest_path + '.tmp', manifest_path)
+    _fsync_dir(output_dir)
+
+    # Only files no committed manifest points at any more
+    live = {entry['path'] for entry in entries}
+    for rel_path in committed - live:
+        stale = os.path.join(output_dir, rel_path)
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    skipped = len(entries) - len(pending)
+    print(f"✅ Saved {len(df)} records to {output_dir}: "
+          f"{len(pending)} partition(s) written, {skipped} unchanged")
+    return {**manifest, 'written': len(pending), 'skipped': skipped}
+
+
+def read_partitions(output_dir: str, record_types: Optional[Sequence[str]] = None,
+                    years: Optional[Sequence[int]] = None,
+                    columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Concatenate the committed partitions, optionally only some record types and years."""
+    manifest = load_manifest(output_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No {MANIFEST_NAME} in {output_dir}")
+    selected = [entry for entry in manifest['partitions']
+                if (record_types is None or entry['record_type'] in record_types)
+                and (years is None or entry['year'] in years)]
+    frames = [pq.read_table(os.path.join(output_dir, entry['path']), columns=columns).to_pandas()
+              for entry in selected]
+    if not frames:
+        return pd.DataFrame(columns=columns or manifest['columns'])
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,90 @@
+"""
+Canonical integer periods shared by the data handler, impact model and forecaster.
+
+Dates are parsed once into a month number, year * 12 + month - 1, and kept
+next to the data. Everything downstream (lags, impact ramps, annual
+grouping) is integer numpy arithmetic on those numbers:
+
+    year  = period // 12
+    month = period % 12 + 1
+
+-1 marks a missing or unparseable date. Integer input is taken to be
+periods already, so passing a stored period column never re-parses.
+"""
+import warnings
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+MISSING = -1
+PERIOD_COLUMN = 'period'
+EPOCH_MONTH = 1970 * 12   # datetime64[M] counts months from 1970-01
+
+
+def parse_dates(dates) -> np.ndarray:
+    """Dates as a datetime64[ns] array (NaT when missing); datetime input is not re-parsed.
+
+    Each value is parsed on its own (ISO 8601 first, then any other format),
+    never by a format inferred from its neighbours, so a value parses the
+    same in a full frame as in any chunk of it.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return pd.Series(dates).to_numpy(dtype='datetime64[ns]')
+    values = pd.Series(dates)
+    parsed = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        # Mixed date formats only warn about per-element parsing; keep that local
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            parsed[retry] = pd.to_datetime(values[retry], format='mixed', errors='coerce')
+    return parsed.to_numpy(dtype='datetime64[ns]')
+
+
+def month_index(dates) -> np.ndarray:
+    """Integer month number (year * 12 + month - 1) for dates; -1 marks missing."""
+    if pd.api.types.is_integer_dtype(getattr(dates, 'dtype', None)):
+        return np.asarray(dates, dtype=np.int64)
+    parsed = parse_dates(dates)
+    months = parsed.astype('datetime64[M]').astype(np.int64) + EPOCH_MONTH
+    months[np.isnat(parsed)] = MISSING
+    return months
+
+
+def scalar_month(value) -> int:
+    """month_index for one value, without building a Series for dates and periods."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if value is None or pd.isna(value):
+        return MISSING
+    if hasattr(value, 'year') and hasattr(value, 'month'):
+        return value.year * 12 + value.month - 1
+    return int(month_index([value])[0])
+
+
+def period_year(periods) -> np.ndarray:
+    """Calendar year of each period; -1 stays -1."""
+    periods = np.asarray(periods, dtype=np.int64)
+    return np.where(periods >= 0, periods // 12, MISSING)
+
+
+def year_end_period(years) -> np.ndarray:
+    """Period of December in each year."""
+    return np.asarray(years, dtype=np.int64) * 12 + 11
+
+
+def period_start(periods) -> pd.DatetimeIndex:
+    """Month-start timestamps for periods, for display only (NaT for -1)."""
+    periods = np.asarray(periods, dtype=np.int64)
+    months = (periods - EPOCH_MONTH).astype('datetime64[M]')
+    return pd.DatetimeIndex(np.where(periods >= 0, months, np.datetime64('NaT')).astype('datetime64[ns]'))
+
+
+def add_period_column(df: pd.DataFrame, date_col: str = 'observation_date',
+                      period_col: str = PERIOD_COLUMN, periods: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Copy of df with its integer period column (parsed from date_col unless given)."""
+    if periods is None:
+        periods = month_index(df[date_col]) if date_col in df.columns else np.full(len(df), MISSING)
+    return df.assign(**{period_col: periods})
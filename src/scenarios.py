@@ -0,0 +1,161 @@
+"""
+What-if scenario evaluation by linear superposition of impact response curves.
+
+Every impact link in models/impacts_refined.csv gets one precomputed response
+curve (its signed impact level at the end of each year) per lag scale on a
+small grid. Because the impact model is additive across links, any scenario
+that switches events on or off or rescales their magnitudes is a weighted
+sum of those curves, so a batch of scenarios is a single matrix product:
+
+    values = baseline + (event_weights @ incidence) @ basis
+
+Example:
+    engine = ScenarioEngine.from_csv(years=range(2025, 2031), events=events_df)
+    engine.set_baseline('ACC_OWNERSHIP', base_forecast['forecast'])
+    engine.run([{'EVT_0007': 0.0}, {'EVT_0008': 1.5}])
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .impact_model import direction_signs, impact_estimates, impact_proportions
+from .periods import month_index, year_end_period
+
+
+IMPACTS_PATH = "models/impacts_refined.csv"
+DEFAULT_LAG_SCALES = (0.5, 0.75, 1.0, 1.5, 2.0)
+
+
+class ScenarioEngine:
+    """Batched what-if evaluation over precomputed per-impact response curves.
+
+    Args:
+        impacts: Impact links (record_id, parent_id, related_indicator,
+            impact_direction, impact_magnitude/impact_estimate, lag_months)
+        years: Years at whose end impact levels are evaluated
+        events: Optional event records used to date impacts whose own
+            observation_date is missing
+        lag_scales: Lag multipliers precomputed for lag what-ifs
+        impact_type: Ramp shape for links without an impact_type column
+    """
+
+    def __init__(self, impacts: pd.DataFrame, years: Sequence[int],
+                 events: Optional[pd.DataFrame] = None,
+                 lag_scales: Sequence[float] = DEFAULT_LAG_SCALES, impact_type: str = 'gradual'):
+        if 'record_type' in impacts.columns:
+            impacts = impacts[impacts['record_type'] == 'impact_link']
+        impacts = impacts.reset_index(drop=True)
+
+        self.years = np.asarray(list(years), dtype=np.int64)
+        self.lag_scales = np.asarray(lag_scales, dtype=float)
+        if not np.isclose(self.lag_scales, 1.0).any():
+            self.lag_scales = np.sort(np.append(self.lag_scales, 1.0))
+        self._unit_lag = int(np.argmin(np.abs(self.lag_scales - 1.0)))
+
+        self.impact_ids = pd.Index(impacts['record_id'].astype(str))
+        parents = impacts['parent_id'].astype(str)
+        self.event_ids = pd.Index(parents.unique())
+        self.indicators = pd.Index(impacts['related_indicator'].unique())
+
+        # Event date per impact: its own date, else the parent event's date
+        event_month = month_index(impacts.get('observation_date', pd.Series(pd.NaT, index=impacts.index)))
+        if events is not None:
+            event_months = pd.Series(month_index(events['observation_date']),
+                                     index=events['record_id'].astype(str))
+            fallback = parents.map(event_months).fillna(-1).to_numpy(dtype=np.int64)
+            event_month = np.where(event_month < 0, fallback, event_month)
+
+        # Signed level of each impact at the end of each year, per lag scale
+        months_since = year_end_period(self.years)[None, None, :] - event_month[None, :, None]
+        lag = pd.to_numeric(impacts['lag_months'], errors='coerce').to_numpy(dtype=float)
+        kind = impacts['impact_type'].fillna(impact_type).to_numpy()[None, :, None] \
+            if 'impact_type' in impacts.columns else impact_type
+        proportion = impact_proportions(months_since, self.lag_scales[:, None, None] * lag[None, :, None], kind)
+        proportion[:, event_month < 0, :] = 0.0
+
+        magnitude = impact_estimates(impacts).to_numpy() * direction_signs(impacts['impact_direction'])
+        curves = magnitude[None, :, None] * proportion
+
+        # Place each curve in its indicator's block: basis is (lag scale, impact, indicator x year)
+        n_impacts, n_years = len(impacts), len(self.years)
+        basis = np.zeros((len(self.lag_scales), n_impacts, len(self.indicators), n_years))
+        basis[:, np.arange(n_impacts), self.indicators.get_indexer(impacts['related_indicator']), :] = curves
+        self.basis = basis.reshape(len(self.lag_scales), n_impacts, -1)
+
+        # Event -> impact incidence, so event weights fan out to their links
+        self.incidence = np.zeros((len(self.event_ids), n_impacts))
+        self.incidence[self.event_ids.get_indexer(parents), np.arange(n_impacts)] = 1.0
+
+        self.baseline = np.zeros((len(self.indicators), n_years))
+
+    @classmethod
+    def from_csv(cls, path: str = IMPACTS_PATH, years: Sequence[int] = range(2025, 2031), **kwargs):
+        """Engine over the refined impact links on disk."""
+        return cls(pd.read_csv(path), years, **kwargs)
+
+    def set_baseline(self, indicator: str, values: Sequence[float]):
+        """Trend forecast (one value per year) that scenario impacts are added to."""
+        if indicator not in self.indicators:
+            raise ValueError(f"No impact links target indicator: {indicator}")
+        self.baseline[self.indicators.get_loc(indicator)] = np.asarray(values, dtype=float)
+
+    def weights(self, scenarios: List[Dict[str, float]], default: float = 1.0) -> np.ndarray:
+        """(n_scenarios, n_events) weight matrix from {event_id: weight} dicts.
+
+        Events not named in a scenario keep the default weight.
+        """
+        matrix = np.full((len(scenarios), len(self.event_ids)), default, dtype=float)
+        for i, scenario in enumerate(scenarios):
+            if not scenario:
+                continue
+            cols = self.event_ids.get_indexer(list(scenario))
+            if (cols < 0).any():
+                unknown = [e for e, c in zip(scenario, cols) if c < 0]
+                raise ValueError(f"Unknown events: {unknown}")
+            matrix[i, cols] = list(scenario.values())
+        return matrix
+
+    def lag_index(self, lag_scales: np.ndarray) -> np.ndarray:
+        """Nearest precomputed lag scale for each requested multiplier."""
+        lag_scales = np.asarray(lag_scales, dtype=float)
+        return np.abs(lag_scales[..., None] - self.lag_scales).argmin(axis=-1)
+
+    def evaluate(self, event_weights: np.ndarray, lag_scales: Optional[np.ndarray] = None) -> np.ndarray:
+        """Indicator paths for a batch of scenarios.
+
+        Args:
+            event_weights: (n_scenarios, n_events) magnitude weights, columns
+                ordered as self.event_ids (0 switches an event off)
+            lag_scales: Optional (n_scenarios, n_events) lag multipliers,
+                snapped to the nearest precomputed scale
+
+        Returns:
+            Array of shape (n_scenarios, n_indicators, n_years)
+        """
+        event_weights = np.atleast_2d(np.asarray(event_weights, dtype=float))
+        impact_weights = event_weights @ self.incidence
+
+        if lag_scales is None:
+            flat = impact_weights @ self.basis[self._unit_lag]
+        else:
+            lag_idx = self.lag_index(np.atleast_2d(lag_scales)) @ self.incidence
+            curves = self.basis[lag_idx.astype(np.int64), np.arange(self.basis.shape[1])]
+            flat = np.einsum('si,sic->sc', impact_weights, curves)
+
+        return flat.reshape(len(event_weights), *self.baseline.shape) + self.baseline
+
+    def run(self, scenarios: List[Dict[str, float]],
+            lag_scales: Optional[List[Dict[str, float]]] = None) -> pd.DataFrame:
+        """Evaluate named-event scenarios into a long scenario/indicator/year frame."""
+        values = self.evaluate(
+            self.weights(scenarios),
+            None if lag_scales is None else self.weights(lag_scales, default=1.0)
+        )
+        n_scenarios, n_indicators, n_years = values.shape
+        return pd.DataFrame({
+            'scenario': np.repeat(np.arange(n_scenarios), n_indicators * n_years),
+            'indicator': np.tile(np.repeat(self.indicators.to_numpy(), n_years), n_scenarios),
+            'year': np.tile(self.years, n_scenarios * n_indicators),
+            'value': values.ravel()
+        })
@@ -0,0 +1,231 @@
+"""
+Bounded-memory streaming ingestion for unified-schema dumps.
+
+Large dumps are read chunk by chunk with a fixed schema, so every chunk has
+the same dtypes regardless of what it contains. Validation, date parsing and
+per-record-type routing run on one chunk at a time, and the record type
+summary and enriched output are built incrementally. Peak memory is bounded
+by the chunk size plus the (small) vocabulary of pillars and indicators.
+"""
+import os
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .data_handler import compile_reference_codes, validate_frame
+from .instrumentation import instrumented
+from .periods import parse_dates
+
+
+NUMERIC_COLUMNS = ['value_numeric', 'impact_estimate', 'lag_months', 'fiscal_year']
+DATE_COLUMNS = ['observation_date', 'period_start', 'period_end', 'collection_date']
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def prepare_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Coerce numeric columns and parse date columns of a raw chunk."""
+    for col in NUMERIC_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+    for col in DATE_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = pd.Series(parse_dates(chunk[col]), index=chunk.index)
+    return chunk
+
+
+def iter_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Yield typed chunks of a CSV or Parquet dataset.
+
+    Text columns are read as strings and numeric/date columns are coerced per
+    chunk, so dtypes never drift between chunks. Row labels continue across
+    chunks, matching positions in the source file.
+    """
+    if str(path).lower().endswith(('.parquet', '.pq')):
+        import pyarrow.parquet as pq
+
+        offset = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield prepare_chunk(chunk)
+        return
+
+    reader = pd.read_csv(path, chunksize=chunksize, usecols=columns, dtype=str)
+    for chunk in reader:
+        yield prepare_chunk(chunk)
+
+
+class RecordTypeSummaryAccumulator:
+    """Incremental version of DataHandler.get_record_type_summary."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.pillars: Dict[str, List[str]] = {}
+        self.indicators: Dict[str, set] = {}
+        self.min_dates: Dict[str, pd.Timestamp] = {}
+        self.max_dates: Dict[str, pd.Timestamp] = {}
+
+    def update(self, chunk: pd.DataFrame):
+        """Fold one chunk into the running summary."""
+        if chunk.empty or 'record_type' not in chunk.columns:
+            return
+        grouped = chunk.groupby('record_type', sort=False)
+
+        for rt, n in grouped.size().items():
+            self.counts[rt] = self.counts.get(rt, 0) + int(n)
+
+        if 'pillar' in chunk.columns:
+            pairs = chunk[['record_type', 'pillar']].dropna().drop_duplicates()
+            for rt, pillar in zip(pairs['record_type'], pairs['pillar']):
+                seen = self.pillars.setdefault(rt, [])
+                # Four pillars are enough to know whether to print '...'
+                if len(seen) < 4 and pillar not in seen:
+                    seen.append(pillar)
+
+        if 'indicator' in chunk.columns:
+            pairs = chunk[['record_type', 'indicator']].dropna().drop_duplicates()
+            for rt, values in pairs.groupby('record_type', sort=False)['indicator']:
+                self.indicators.setdefault(rt, set()).update(values)
+
+        if 'observation_date' in chunk.columns:
+            dates = pd.Series(parse_dates(chunk['observation_date']), index=chunk.index)
+            date_groups = dates.groupby(chunk['record_type'], sort=False)
+            for rt, lo in date_groups.min().dropna().items():
+                self.min_dates[rt] = min(self.min_dates.get(rt, lo), lo)
+            for rt, hi in date_groups.max().dropna().items():
+                self.max_dates[rt] = max(self.max_dates.get(rt, hi), hi)
+
+    def result(self) -> pd.DataFrame:
+        """Summary frame with the same layout as get_record_type_summary."""
+        rows = []
+        for rt, count in self.counts.items():
+            pillars = self.pillars.get(rt, [])
+            if rt in self.min_dates:
+                date_range = f"{self.min_dates[rt].date()} to {self.max_dates[rt].date()}"
+            else:
+                date_range = 'N/A'
+            rows.append({
+                'record_type': rt,
+                'count': count,
+                'pillars': ', '.join(pillars[:3]) + ('...' if len(pillars) > 3 else ''),
+                'indicators': len(self.indicators.get(rt, ())),
+                'date_range': date_range
+            })
+        return pd.DataFrame(rows, columns=['record_type', 'count', 'pillars', 'indicators', 'date_range'])
+
+
+class IncrementalCsvWriter:
+    """Append chunks to a CSV, published atomically when closed."""
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.tmp_path = f"{output_path}.tmp"
+        self.rows = 0
+        self._columns = None
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.tmp_path, 'w', encoding='utf-8', newline='')
+
+    def write(self, chunk: pd.DataFrame):
+        if self._columns is None:
+            self._columns = list(chunk.columns)
+            chunk.to_csv(self._file, index=False, date_format='%Y-%m-%d')
+        else:
+            chunk.reindex(columns=self._columns).to_csv(
+                self._file, index=False, header=False, date_format='%Y-%m-%d'
+            )
+        self.rows += len(chunk)
+
+    def close(self, commit: bool = True):
+        if self._file.closed:
+            return
+        self._file.close()
+        if commit:
+            os.replace(self.tmp_path, self.output_path)
+        else:
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+
+
+@instrumented('load', rows=lambda result, *args, **kwargs: result['rows'])
+def stream_ingest(source_path: str, output_path: Optional[str] = None,
+                  route_dir: Optional[str] = None, error_path: Optional[str] = None,
+                  chunksize: int = DEFAULT_CHUNKSIZE, drop_invalid: bool = True,
+                  codes: Optional[Dict[str, pd.Index]] = None,
+                  ref_df: Optional[pd.DataFrame] = None) -> Dict:
+    """Validate, parse, route and write a dataset one chunk at a time.
+
+    Args:
+        source_path: Unified-schema CSV or Parquet file
+        output_path: Enriched output CSV (all valid records)
+        route_dir: Directory for one CSV per record_type
+        error_path: CSV receiving the (row, field, rule) validation errors
+        chunksize: Rows per chunk
+        drop_invalid: Leave rows with validation errors out of the outputs
+        codes: Valid codes per field (compile_reference_codes), checked on
+            every chunk
+        ref_df: Reference codes table, compiled once when codes is not given
+
+    Returns:
+        Dict with the record type 'summary' frame, 'rows' read,
+        'rows_written' and 'errors' per rule
+    """
+    if codes is None:
+        codes = compile_reference_codes(ref_df)
+    summary = RecordTypeSummaryAccumulator()
+    writers: Dict[str, IncrementalCsvWriter] = {}
+    error_counts: Dict[str, int] = {}
+    rows_read = 0
+    rows_written = 0
+
+    def _writer(key: str, path: str) -> IncrementalCsvWriter:
+        if key not in writers:
+            writers[key] = IncrementalCsvWriter(path)
+        return writers[key]
+
+    try:
+        for chunk in iter_chunks(source_path, chunksize=chunksize):
+            rows_read += len(chunk)
+
+            errors = validate_frame(chunk, codes=codes)
+            if not errors.empty:
+                for rule, n in errors['rule'].value_counts().items():
+                    error_counts[rule] = error_counts.get(rule, 0) + int(n)
+                if error_path:
+                    _writer('__errors__', error_path).write(errors)
+                if drop_invalid:
+                    chunk = chunk.drop(index=np.unique(errors['row'].to_numpy()))
+
+            summary.update(chunk)
+
+            if output_path:
+                _writer('__output__', output_path).write(chunk)
+            if route_dir and 'record_type' in chunk.columns:
+                for rt, part in chunk.groupby('record_type', sort=False):
+                    _writer(rt, os.path.join(route_dir, f"{rt}.csv")).write(part)
+            rows_written += len(chunk)
+    except BaseException:
+        for writer in writers.values():
+            writer.close(commit=False)
+        raise
+
+    for writer in writers.values():
+        writer.close()
+
+    print(f"✅ Streamed {rows_read} records ({rows_written} written, "
+          f"{sum(error_counts.values())} validation errors)")
+    return {
+        'summary': summary.result(),
+        'rows': rows_read,
+        'rows_written': rows_written,
+        'errors': error_counts
+    }
@@ -0,0 +1,161 @@
+"""
+Synthetic unified-schema data for benchmarks and scale tests.
+
+Generates schema-valid observation, event, impact_link and target records in
+the same column layout as data/raw/ethiopia_fi_unified_data.csv. Impact links
+always point at generated events and generated indicator codes, so every
+downstream step (validation, impact modelling, forecasting) runs on the
+output. Generation is vectorized and takes a few seconds at 10^7 rows.
+"""
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+UNIFIED_COLUMNS = [
+    'record_id', 'parent_id', 'record_type', 'category', 'pillar', 'indicator', 'indicator_code',
+    'indicator_direction', 'value_numeric', 'value_text', 'value_type', 'unit', 'observation_date',
+    'period_start', 'period_end', 'fiscal_year', 'gender', 'location', 'region', 'source_name',
+    'source_type', 'source_url', 'confidence', 'related_indicator', 'relationship_type',
+    'impact_direction', 'impact_magnitude', 'impact_estimate', 'lag_months', 'evidence_basis',
+    'comparable_country', 'collected_by', 'collection_date', 'original_text', 'notes'
+]
+
+# Record-type mix of the real dataset, roughly
+RECORD_SHARES = {'observation': 0.90, 'event': 0.03, 'impact_link': 0.05, 'target': 0.02}
+
+VOCABULARY = {
+    'pillar': ['ACCESS', 'USAGE', 'GENDER', 'AFFORDABILITY'],
+    'category': ['product_launch', 'market_entry', 'policy', 'infrastructure', 'regulation'],
+    'gender': ['all', 'male', 'female'],
+    'location': ['national', 'urban', 'rural'],
+    'confidence': ['high', 'medium', 'low'],
+    'relationship_type': ['direct', 'indirect', 'enabling'],
+    'impact_direction': ['increase', 'decrease'],
+    'impact_magnitude': ['high', 'medium', 'low'],
+    'source_type': ['survey', 'operator', 'regulator', 'research'],
+}
+
+PREFIXES = {'observation': 'OBS', 'event': 'EVT', 'impact_link': 'IMP', 'target': 'TGT'}
+
+
+def _counts(n_rows: int) -> Dict[str, int]:
+    """Rows per record type, at least one of each and summing to n_rows."""
+    counts = {t: max(1, int(n_rows * share)) for t, share in RECORD_SHARES.items()}
+    counts['observation'] = max(1, n_rows - sum(v for t, v in counts.items() if t != 'observation'))
+    return counts
+
+
+def _choice(rng: np.random.Generator, field: str, n: int) -> np.ndarray:
+    return np.asarray(VOCABULARY[field], dtype=object)[rng.integers(0, len(VOCABULARY[field]), n)]
+
+
+def _dates(rng: np.random.Generator, n: int, start: str = '2011-01-01', end: str = '2025-12-31') -> np.ndarray:
+    lo, hi = pd.Timestamp(start).value // 86_400_000_000_000, pd.Timestamp(end).value // 86_400_000_000_000
+    days = rng.integers(lo, hi + 1, n).astype('datetime64[D]')
+    return np.datetime_as_string(days)
+
+
+def _ids(prefix: str, n: int) -> np.ndarray:
+    return np.char.add(f"{prefix}_", np.char.zfill(np.arange(1, n + 1).astype(str), 4)).astype(object)
+
+
+def generate_unified_data(n_rows: int, seed: int = 0, n_indicators: int = None) -> pd.DataFrame:
+    """Schema-valid synthetic unified dataset with n_rows records.
+
+    Args:
+        n_rows: Total records (10^3 to 10^7 are the benchmark sizes)
+        seed: Random seed
+        n_indicators: Distinct indicator codes (defaults to ~sqrt(n_rows), 10-500)
+    """
+    rng = np.random.default_rng(seed)
+    counts = _counts(n_rows)
+    n_indicators = n_indicators or int(np.clip(np.sqrt(n_rows), 10, 500))
+
+    codes = np.char.add('IND_', np.char.zfill(np.arange(n_indicators).astype(str), 3)).astype(object)
+    code_pillar = _choice(rng, 'pillar', n_indicators)
+    frames = []
+
+    for record_type in ('observation', 'target'):
+        n = counts[record_type]
+        which = rng.integers(0, n_indicators, n)
+        frames.append(pd.DataFrame({
+            'record_id': _ids(PREFIXES[record_type], n),
+            'record_type': record_type,
+            'pillar': code_pillar[which],
+            'indicator': np.char.add('Indicator ', codes[which].astype(str)).astype(object),
+            'indicator_code': codes[which],
+            'value_numeric': np.round(rng.uniform(0, 100, n), 2),
+            'value_type': 'percentage',
+            'unit': '%',
+            'observation_date': _dates(rng, n) if record_type == 'observation'
+            else _dates(rng, n, '2025-01-01', '2030-12-31'),
+            'gender': _choice(rng, 'gender', n),
+            'location': _choice(rng, 'location', n),
+            'source_type': _choice(rng, 'source_type', n),
+            'confidence': _choice(rng, 'confidence', n),
+        }))
+
+    n_events = counts['event']
+    event_ids = _ids(PREFIXES['event'], n_events)
+    event_dates = _dates(rng, n_events, '2015-01-01', '2027-12-31')
+    frames.append(pd.DataFrame({
+        'record_id': event_ids,
+        'record_type': 'event',
+        'category': _choice(rng, 'category', n_events),
+        'indicator': np.char.add('Event ', event_ids.astype(str)).astype(object),
+        'indicator_code': np.char.add('EVT_CODE_', np.arange(n_events).astype(str)).astype(object),
+        'observation_date': event_dates,
+        'gender': 'all',
+        'location': 'national',
+        'confidence': _choice(rng, 'confidence', n_events),
+    }))
+
+    n_links = counts['impact_link']
+    parent = rng.integers(0, n_events, n_links)
+    target = rng.integers(0, n_indicators, n_links)
+    magnitude = _choice(rng, 'impact_magnitude', n_links)
+    frames.append(pd.DataFrame({
+        'record_id': _ids(PREFIXES['impact_link'], n_links),
+        'parent_id': event_ids[parent],
+        'record_type': 'impact_link',
+        'pillar': code_pillar[target],
+        'indicator': np.char.add('Impact on ', codes[target].astype(str)).astype(object),
+        'observation_date': event_dates[parent],
+        'gender': 'all',
+        'location': 'national',
+        'confidence': _choice(rng, 'confidence', n_links),
+        'related_indicator': codes[target],
+        'relationship_type': _choice(rng, 'relationship_type', n_links),
+        'impact_direction': np.where(rng.random(n_links) < 0.85, 'increase', 'decrease').astype(object),
+        'impact_magnitude': magnitude,
+        'impact_estimate': np.where(rng.random(n_links) < 0.7, np.round(rng.uniform(1, 20, n_links), 1), np.nan),
+        'lag_months': rng.integers(1, 37, n_links),
+    }))
+
+    df = pd.concat(frames, ignore_index=True)
+    df['collected_by'] = 'synthetic'
+    return df.reindex(columns=UNIFIED_COLUMNS)
+
+
+def reference_codes() -> pd.DataFrame:
+    """Reference codes (field, code, description) covering the generator's vocabulary."""
+    rows = [('record_type', t, f"{t} record") for t in RECORD_SHARES]
+    rows += [(field, code, f"{field} {code}") for field, codes in VOCABULARY.items() for code in codes]
+    return pd.DataFrame(rows, columns=['field', 'code', 'description'])
+
+
+def write_synthetic(directory: str, n_rows: int, seed: int = 0) -> Tuple[str, str]:
+    """Write a synthetic unified CSV and matching reference codes.
+
+    Returns:
+        (data_path, reference_codes_path)
+    """
+    os.makedirs(directory, exist_ok=True)
+    data_path = os.path.join(directory, f"synthetic_{n_rows}.csv")
+    ref_path = os.path.join(directory, 'reference_codes.csv')
+    generate_unified_data(n_rows, seed).to_csv(data_path, index=False)
+    reference_codes().to_csv(ref_path, index=False)
+    return data_path, ref_path
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+
+COLUMNS = [
+    'record_id', 'parent_id', 'record_type', 'category', 'pillar', 'indicator',
+    'indicator_code', 'value_numeric', 'observation_date', 'gender', 'location',
+    'confidence', 'related_indicator', 'relationship_type', 'impact_direction',
+    'impact_magnitude', 'impact_estimate', 'lag_months',
+]
+
+ROWS = [
+    ('REC_0001', None, 'observation', None, 'ACCESS', 'Account Ownership Rate', 'ACC_OWNERSHIP',
+     22.0, '2014-12-31', 'all', 'national', 'high', None, None, None, None, None, None),
+    ('REC_0002', None, 'observation', None, 'ACCESS', 'Account Ownership Rate', 'ACC_OWNERSHIP',
+     35.0, '2017-12-31', 'all', 'national', 'high', None, None, None, None, None, None),
+    ('REC_0003', None, 'observation', None, 'ACCESS', 'Account Ownership Rate', 'ACC_OWNERSHIP',
+     46.0, '2021-12-31', 'all', 'national', 'high', None, None, None, None, None, None),
+    ('REC_0004', None, 'observation', None, 'USAGE', 'P2P Transaction Count', 'USG_P2P_COUNT',
+     49.7, '2024-06-30', 'all', 'national', 'medium', None, None, None, None, None, None),
+    ('REC_0005', None, 'target', None, 'ACCESS', 'Account Ownership Rate', 'ACC_OWNERSHIP',
+     70.0, '2025-12-31', 'all', 'national', 'high', None, None, None, None, None, None),
+    ('EVT_0001', None, 'event', 'product_launch', None, 'Telebirr Launch', 'EVT_TELEBIRR',
+     None, '2021-05-17', 'all', 'national', 'high', None, None, None, None, None, None),
+    ('EVT_0002', None, 'event', 'market_entry', None, 'Safaricom Ethiopia Commercial Launch',
+     'EVT_SAFARICOM', None, '2022-08-01', 'all', 'national', 'high', None, None, None, None, None, None),
+    ('IMP_0001', 'EVT_0001', 'impact_link', None, 'ACCESS', 'Telebirr effect on Account Ownership',
+     None, 15.0, '2021-05-17', 'all', 'national', 'medium', 'ACC_OWNERSHIP', 'direct',
+     'increase', 'high', 15.0, 12),
+    ('IMP_0002', 'EVT_0002', 'impact_link', None, 'USAGE', 'Safaricom effect on P2P',
+     None, None, '2022-08-01', 'all', 'national', 'medium', 'USG_P2P_COUNT', 'indirect',
+     'increase', 'medium', None, 24),
+]
+
+REFERENCE_CODES = [
+    ('record_type', 'observation'), ('record_type', 'event'), ('record_type', 'impact_link'),
+    ('record_type', 'target'), ('pillar', 'ACCESS'), ('pillar', 'USAGE'), ('pillar', 'GENDER'),
+    ('pillar', 'AFFORDABILITY'), ('confidence', 'high'), ('confidence', 'medium'),
+    ('confidence', 'low'), ('impact_direction', 'increase'), ('impact_direction', 'decrease'),
+    ('relationship_type', 'direct'), ('relationship_type', 'indirect'),
+    ('relationship_type', 'enabling'), ('category', 'product_launch'),
+    ('category', 'market_entry'), ('category', 'policy'),
+]
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(ROWS, columns=COLUMNS)
+
+
+@pytest.fixture
+def data_paths(tmp_path, sample_df):
+    raw_path = tmp_path / 'ethiopia_fi_unified_data.csv'
+    ref_path = tmp_path / 'reference_codes.csv'
+    sample_df.to_csv(raw_path, index=False)
+    pd.DataFrame(
+        [(field, code, f"{code} description") for field, code in REFERENCE_CODES],
+        columns=['field', 'code', 'description']
+    ).to_csv(ref_path, index=False)
+    return str(raw_path), str(ref_path)
@@ -0,0 +1,117 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.artifact_cache import ArtifactCache, fingerprint, main
+from src.data_handler import DataHandler
+from src.impact_graph import ImpactGraph
+from src.incremental import IncrementalForecaster
+
+
+def test_fingerprint_tracks_content_not_identity(sample_df):
+    config = {'years': [2025, 2026, 2027], 'scale': 1.0}
+    assert fingerprint(sample_df, config) == fingerprint(sample_df.copy(), dict(config))
+
+    changed = sample_df.copy()
+    changed.loc[0, 'value_numeric'] = 23
+    assert fingerprint(changed, config) != fingerprint(sample_df, config)
+    assert fingerprint(sample_df, {**config, 'scale': 1.2}) != fingerprint(sample_df, config)
+
+
+def test_get_or_compute_hits_after_first_run(tmp_path, sample_df):
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return sample_df[sample_df['record_type'] == 'observation'].reset_index(drop=True)
+
+    output = tmp_path / 'observations.csv'
+    first = cache.get_or_compute('obs', {'records': sample_df}, compute, str(output))
+    second = cache.get_or_compute('obs', {'records': sample_df}, compute, str(output))
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert output.exists()
+
+    # A fresh cache instance reuses the on-disk index
+    reopened = ArtifactCache(str(tmp_path / 'cache'))
+    reopened.get_or_compute('obs', {'records': sample_df}, compute)
+    assert len(calls) == 1
+
+    report = cache.report()
+    assert report.loc[0, ['hits', 'misses']].tolist() == [1, 1]
+
+
+def test_lru_eviction_by_entry_count(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'), max_entries=2)
+    frames = {name: pd.DataFrame({'x': [i]}) for i, name in enumerate('abc')}
+    for name, frame in frames.items():
+        cache.get_or_compute(name, {'config': name}, lambda frame=frame: frame)
+
+    assert len(cache.index) == 2
+    assert cache.get(cache.key('a', {'config': 'a'})) is None
+    assert cache.get(cache.key('c', {'config': 'c'})) is not None
+
+
+def test_hit_rewrites_stale_output_and_reads_skip_index(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    output = tmp_path / 'artifact.csv'
+    old, new = pd.DataFrame({'x': [1]}), pd.DataFrame({'x': [2]})
+    cache.get_or_compute('a', {'config': 1}, lambda: old, str(output))
+    cache.get_or_compute('a', {'config': 2}, lambda: new, str(output))
+
+    # Inputs revert: the hit brings the output file back in line with the artifact
+    index_mtime = os.stat(cache.index_path).st_mtime_ns
+    cache.get_or_compute('a', {'config': 1}, lambda: new, str(output))
+    pd.testing.assert_frame_equal(pd.read_csv(output), old)
+    assert os.stat(cache.index_path).st_mtime_ns == index_mtime
+
+    cache.flush()
+    key = cache.key('a', {'config': 1})
+    assert ArtifactCache(str(tmp_path / 'cache')).index[key]['last_access'] == cache.index[key]['last_access']
+
+
+def test_forecast_step_uses_cache(data_paths, tmp_path):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    cache_dir = str(tmp_path / 'cache')
+    first = IncrementalForecaster(range(2025, 2028), output_path=str(tmp_path / 'f.csv'), cache_dir=cache_dir)
+    expected = first.forecast(handler.df, ['ACC_OWNERSHIP'])
+
+    second = IncrementalForecaster(range(2025, 2028), output_path=str(tmp_path / 'g.csv'), cache_dir=cache_dir)
+    second._forecast = lambda *args: pytest.fail("cached forecast was recomputed")
+    pd.testing.assert_frame_equal(second.forecast(handler.df, ['ACC_OWNERSHIP']), expected)
+
+
+def test_association_matrix_export_uses_cache(sample_df, tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    path = str(tmp_path / 'association_matrix_refined.csv')
+    events = sample_df[sample_df['record_type'] == 'event']
+    first = ImpactGraph(sample_df).export_csv(path, events=events, cache=cache)
+    second = ImpactGraph(sample_df).export_csv(path, events=events, cache=cache)
+    pd.testing.assert_frame_equal(first, second)
+
+    graph = ImpactGraph(sample_df)
+    graph.add_indicator_links(pd.DataFrame({'source': ['ACC_OWNERSHIP'], 'target': ['GEN_GAP_ACC'],
+                                            'elasticity': [-0.5], 'lag_months': [12]}))
+    graph.export_csv(path, max_hops=2, events=events, cache=cache)
+    assert 'GEN_GAP_ACC' in pd.read_csv(path).columns
+    assert cache.report().loc[0, ['artifact', 'hits', 'misses']].tolist() == ['association_matrix_refined', 1, 2]
+
+
+def test_lifetime_report_and_cli(tmp_path, capsys):
+    cache_dir = str(tmp_path / 'cache')
+    for _ in range(2):
+        ArtifactCache(cache_dir).get_or_compute('a', {'config': 1}, lambda: pd.DataFrame({'x': [1]}))
+    ArtifactCache(cache_dir).flush()
+    assert ArtifactCache(cache_dir).report(lifetime=True)[['hits', 'misses']].values.tolist() == [[0, 1]]
+
+    cache = ArtifactCache(cache_dir)
+    cache.get_or_compute('a', {'config': 1}, lambda: pd.DataFrame({'x': [1]}))
+    cache.flush()
+    main(['--cache-dir', cache_dir, '--clear'])
+    out = capsys.readouterr().out
+    assert '1 hits, 1 misses' in out and 'Cleared' in out
+    assert ArtifactCache(cache_dir).index == {}
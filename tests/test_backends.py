@@ -0,0 +1,34 @@
+"""Tests for the lazy backend registry and import budget."""
+import pytest
+
+from src import backends
+
+
+def test_registry_lookup():
+    assert backends.available('joblib') in (True, False)
+    with pytest.raises(ValueError):
+        backends.available('not_a_backend')
+    with pytest.raises(ValueError):
+        backends.load('not_a_backend')
+
+
+def test_load_caches_module(monkeypatch):
+    monkeypatch.setitem(backends.BACKENDS, 'json_backend', ('json', 'json'))
+    module = backends.load('json_backend')
+    assert module is backends.load('json_backend')
+    backends._loaded.pop('json_backend')
+
+
+def test_missing_backend_names_package(monkeypatch):
+    monkeypatch.setitem(backends.BACKENDS, 'missing', ('no_such_package_xyz', 'no-such-package'))
+    assert not backends.available('missing')
+    with pytest.raises(ImportError, match='pip install no-such-package'):
+        backends.load('missing')
+
+
+def test_entry_points_skip_heavy_backends():
+    report = backends.check_import_budget({
+        label: (statement, 5.0) for label, (statement, _) in backends.IMPORT_BUDGETS.items()
+    })
+    assert (report['heavy_modules'].str.len() == 0).all(), report
+    assert report['within_budget'].all()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from src import backtesting
+from src.backtesting import leaderboard, rolling_origin_backtest
+
+
+def _panel():
+    years = np.arange(2011, 2025)
+    return pd.concat([
+        pd.DataFrame({'indicator_code': 'ACC_OWNERSHIP', 'year': years,
+                      'value_numeric': 10 + 2.5 * (years - 2011)}),
+        pd.DataFrame({'indicator_code': 'USG_P2P_COUNT', 'year': years[::2],
+                      'value_numeric': 5 + 1.0 * (years[::2] - 2011)}),
+    ], ignore_index=True)
+
+
+def test_backtest_scores_every_origin(tmp_path):
+    results = rolling_origin_backtest(_panel(), models=['naive', 'linear_trend'],
+                                      horizon=2, min_train=3, n_jobs=2,
+                                      cache_dir=str(tmp_path / 'cache'))
+
+    assert set(results['model']) == {'naive', 'linear_trend'}
+    first = results[(results['series'] == 'ACC_OWNERSHIP') & (results['model'] == 'naive')]
+    assert first['origin'].min() == 2013
+    assert results['error'].isna().all()
+
+    board = leaderboard(results)
+    assert board.iloc[0]['model'] == 'linear_trend'
+    assert board.iloc[0]['mae'] < 1e-8
+    assert board.iloc[1]['mae'] > 0
+
+
+def test_backtest_reuses_cached_fits(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    first = rolling_origin_backtest(_panel(), models=['linear_trend'], n_jobs=1, cache_dir=cache_dir)
+    second = rolling_origin_backtest(_panel(), models=['linear_trend'], n_jobs=1, cache_dir=cache_dir)
+    # Cached fits return the latency recorded on the original fit
+    pd.testing.assert_series_equal(first['fit_seconds'], second['fit_seconds'])
+
+
+def test_model_change_invalidates_cached_fits(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+
+    def cached_fits():
+        return {p.parent for p in cache_dir.rglob('output.pkl')}
+
+    rolling_origin_backtest(_panel(), models=['linear_trend'], n_jobs=1, cache_dir=str(cache_dir))
+    fits = cached_fits()
+    assert fits
+    rolling_origin_backtest(_panel(), models=['linear_trend'], n_jobs=1, cache_dir=str(cache_dir))
+    assert cached_fits() == fits
+
+    monkeypatch.setattr(backtesting, 'model_version', lambda name: 'edited')
+    rolling_origin_backtest(_panel(), models=['linear_trend'], n_jobs=1, cache_dir=str(cache_dir))
+    assert len(cached_fits()) == 2 * len(fits)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.charts import FigureCache, downsample, line_figure, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500.0)
+    y[4321] = 5.0  # spike must survive
+
+    kept = lttb_indices(x, y, 200)
+    assert len(kept) == 200
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert 4321 in kept
+
+
+def test_lttb_short_series_untouched():
+    assert lttb_indices(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_downsample_per_group_with_dates():
+    dates = pd.date_range('2000-01-01', periods=3000, freq='D')
+    df = pd.DataFrame({'observation_date': np.tile(dates, 2),
+                       'value_numeric': np.random.default_rng(0).normal(size=6000),
+                       'pillar': np.repeat(['ACCESS', 'USAGE'], 3000)})
+    small = downsample(df, 'observation_date', 'value_numeric', threshold=100, by='pillar')
+    assert small.groupby('pillar').size().tolist() == [100, 100]
+
+
+def test_figure_cache_lru_and_stats():
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def build(n):
+        builds.append(n)
+        return {'data': [n]}
+
+    keys = [FigureCache.key('trends', 'Account Ownership Rate', ('2014-01-01', '2021-12-31'),
+                            'Base Model', pillar=[p]) for p in ('ACCESS', 'USAGE', 'GENDER')]
+    cache.get_or_build(keys[0], lambda: build(0))
+    assert cache.get_or_build(keys[0], lambda: build(0)) == {'data': [0]}
+    cache.get_or_build(keys[1], lambda: build(1))
+    cache.get_or_build(keys[2], lambda: build(2))
+
+    assert builds == [0, 1, 2]
+    assert len(cache) == 2
+    assert cache.stats() == {'entries': 2, 'hits': 1, 'misses': 3}
+
+
+def test_line_figure_switches_to_webgl():
+    pytest.importorskip('plotly')
+    df = pd.DataFrame({'x': np.arange(5000), 'y': np.arange(5000.0), 'c': 'a'})
+    fig = line_figure(df, 'x', 'y', color='c', threshold=1000, webgl_threshold=2000)
+    assert fig.data[0].type == 'scattergl'
+    assert len(fig.data[0].x) == 1000
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from src.cubes import build_cubes, cubes_stale, headline_metrics, load_cube, load_meta, progress_frame
+
+
+@pytest.fixture
+def forecast_path(tmp_path):
+    path = tmp_path / 'forecast.csv'
+    pd.DataFrame({'year': [2025, 2026, 2027], 'forecast': [36.0, 36.3, 36.7],
+                  'lower_95': [22.7, 23.0, 23.4], 'upper_95': [49.3, 49.6, 50.0],
+                  'optimistic': [43.2, 43.6, 44.1], 'pessimistic': [28.8, 29.1, 29.4]}
+                 ).to_csv(path, index=False)
+    return str(path)
+
+
+def test_build_cubes_writes_small_page_cubes(tmp_path, data_paths, forecast_path):
+    raw_path, _ = data_paths
+    cube_dir = str(tmp_path / 'cubes')
+    paths = build_cubes(raw_path, forecast_path, cube_dir)
+
+    assert set(paths) == {'observations', 'indicator_year', 'events', 'forecast', 'meta'}
+    assert not cubes_stale(raw_path, forecast_path, cube_dir)
+
+    observations = load_cube('observations', cube_dir)
+    assert len(observations) == 4
+    assert 'record_type' not in observations.columns
+
+    cube = load_cube('indicator_year', cube_dir)
+    acc = cube[cube['indicator_code'] == 'ACC_OWNERSHIP'].sort_values('year')
+    assert acc['year'].tolist() == [2014, 2017, 2021]
+    assert acc['value'].tolist() == [22.0, 35.0, 46.0]
+
+    assert len(load_cube('events', cube_dir)) == 2
+    assert load_meta(cube_dir)['max_date'] == '2024-06-30'
+
+
+def test_headline_metrics_match_dashboard_figures(tmp_path, data_paths, forecast_path):
+    raw_path, _ = data_paths
+    cube_dir = str(tmp_path / 'cubes')
+    build_cubes(raw_path, forecast_path, cube_dir)
+
+    metrics = headline_metrics(load_cube('indicator_year', cube_dir), load_cube('forecast', cube_dir))
+    assert metrics['current_value'] == 46.0
+    assert metrics['change_since_previous'] == 11.0
+    assert metrics['previous_year'] == 2017
+    assert metrics['projection_value'] == 36.0
+    assert metrics['final_forecast'] == 36.7
+    assert metrics['final_optimistic'] == 44.1
+
+    progress = progress_frame(load_cube('indicator_year', cube_dir), load_cube('forecast', cube_dir))
+    assert progress['Year'].tolist() == [2014, 2017, 2021, 2025, 2026, 2027]
+    assert progress['Account Ownership'].tolist() == [22, 35, 46, 36, 36.3, 36.7]
+    assert progress['Type'].tolist() == ['Actual'] * 3 + ['Forecast'] * 3
+
+
+def test_interrupted_build_keeps_previous_meta(tmp_path, data_paths, forecast_path, monkeypatch):
+    raw_path, _ = data_paths
+    cube_dir = str(tmp_path / 'cubes')
+    build_cubes(raw_path, forecast_path, cube_dir)
+    before = load_meta(cube_dir)
+
+    def crash(obj, f, **kwargs):
+        f.write('{"built_at": ')
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr('src.cubes.json.dump', crash)
+    with pytest.raises(KeyboardInterrupt):
+        build_cubes(raw_path, forecast_path, cube_dir)
+    monkeypatch.undo()
+    assert load_meta(cube_dir) == before
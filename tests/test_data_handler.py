@@ -0,0 +1,209 @@
+import os
+
+import pytest
+
+from src.data_handler import DataHandler
+
+
+def test_load_data_csv(data_paths):
+    handler = DataHandler(*data_paths)
+    df, ref_df = handler.load_data()
+    assert len(df) == 9
+    assert handler.storage == 'csv'
+    assert not ref_df.empty
+
+
+def test_parquet_backend_pushes_filters_down(data_paths, tmp_path):
+    pytest.importorskip('pyarrow')
+    from src.parquet_store import convert_csv_to_parquet
+    import pyarrow.parquet as pq
+
+    raw_path, ref_path = data_paths
+    parquet_path = convert_csv_to_parquet(raw_path, str(tmp_path / 'unified.parquet'))
+
+    # One row group per (record_type, pillar) combination
+    assert pq.ParquetFile(parquet_path).num_row_groups == 6
+
+    handler = DataHandler(parquet_path, ref_path)
+    assert handler.storage == 'parquet'
+
+    access = handler.filter_by_pillar('ACCESS', columns=['record_id', 'value_numeric'])
+    assert handler.df is None
+    assert list(access.columns) == ['record_id', 'value_numeric']
+    assert sorted(access['record_id']) == ['REC_0001', 'REC_0002', 'REC_0003']
+
+    merged = handler.get_events_with_impacts()
+    assert len(merged) == 2
+    assert set(merged['record_id_event']) == {'EVT_0001', 'EVT_0002'}
+
+    df, _ = handler.load_data(filters=[('record_type', '==', 'event')])
+    assert set(df['record_type']) == {'event'}
+
+
+def test_parquet_writer_handles_mixed_object_columns(sample_df, tmp_path):
+    pytest.importorskip('pyarrow')
+    from src.parquet_store import read_records, write_partitioned
+
+    mixed = sample_df.astype({'lag_months': object})
+    mixed.loc[mixed['record_id'] == 'IMP_0001', 'lag_months'] = 12
+    mixed.loc[mixed['record_id'] == 'IMP_0002', 'lag_months'] = 'approx 6'
+    path = str(tmp_path / 'unified.parquet')
+    write_partitioned(mixed, path)
+
+    lags = read_records(path, filters=[('record_type', '==', 'impact_link')]).set_index('record_id')['lag_months']
+    assert lags.to_dict() == {'IMP_0001': '12', 'IMP_0002': 'approx 6'}
+    assert read_records(path)['lag_months'].isna().sum() == 7
+    assert not os.path.exists(path + '.tmp')
+
+
+def test_filter_by_pillar_matches_between_backends(data_paths, tmp_path):
+    pytest.importorskip('pyarrow')
+    from src.parquet_store import convert_csv_to_parquet
+
+    raw_path, ref_path = data_paths
+    parquet_path = convert_csv_to_parquet(raw_path, str(tmp_path / 'unified.parquet'))
+
+    csv_usage = DataHandler(raw_path, ref_path).filter_by_pillar('USAGE')
+    pq_usage = DataHandler(parquet_path, ref_path).filter_by_pillar('USAGE')
+    assert csv_usage['record_id'].tolist() == pq_usage['record_id'].tolist()
+
+
+def test_record_type_summary(data_paths):
+    handler = DataHandler(*data_paths)
+    summary = handler.get_record_type_summary().set_index('record_type')
+
+    assert summary.loc['observation', 'count'] == 4
+    assert summary.loc['observation', 'pillars'] == 'ACCESS, USAGE'
+    assert summary.loc['observation', 'indicators'] == 2
+    assert summary.loc['observation', 'date_range'] == '2014-12-31 to 2024-06-30'
+    assert summary.loc['event', 'pillars'] == ''
+    assert list(summary.index) == ['observation', 'target', 'event', 'impact_link']
+
+
+def test_indexes_follow_add_records(data_paths):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    assert len(handler.lookup(record_type='observation', pillar='ACCESS')) == 3
+    assert len(handler.lookup(parent_id='EVT_0001')) == 1
+
+    handler.add_records([
+        {'pillar': 'ACCESS', 'indicator': 'Account Ownership Rate',
+         'indicator_code': 'ACC_OWNERSHIP', 'value_numeric': 49.0,
+         'observation_date': '2024-12-31'},
+    ], 'observation')
+
+    access = handler.lookup(record_type='observation', pillar='ACCESS')
+    assert len(access) == 4
+    assert access['value_numeric'].iloc[-1] == 49.0
+    assert len(handler.lookup(indicator_code='ACC_OWNERSHIP', record_type='observation')) == 4
+
+
+def test_add_records_allocates_ids_without_rescanning(data_paths):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+
+    first = handler.add_records([{'category': 'policy', 'indicator': 'A'}], 'event')
+    second = handler.add_records([{'category': 'policy', 'indicator': 'B'},
+                                  {'category': 'policy', 'indicator': 'C'}], 'event')
+
+    assert first['record_id'].tolist() == ['EVT_0003']
+    assert second['record_id'].tolist() == ['EVT_0004', 'EVT_0005']
+    assert len(handler.df) == 12
+    assert handler.df['record_id'].is_unique
+
+
+def test_journal_replay_and_flush(data_paths, tmp_path):
+    raw_path, ref_path = data_paths
+    journal_path = str(tmp_path / 'added.jsonl')
+
+    handler = DataHandler(raw_path, ref_path, journal_path=journal_path)
+    handler.load_data()
+    handler.add_records([{'pillar': 'USAGE', 'indicator': 'X', 'value_numeric': 1.0,
+                          'observation_date': '2025-01-31'}], 'observation')
+    assert len(handler.journal) == 1
+
+    # A fresh process replays the journal on top of the raw data
+    restored = DataHandler(raw_path, ref_path, journal_path=journal_path)
+    assert restored.replay_journal() == 1
+    assert 'OBS_0001' in set(restored.df['record_id'])
+    assert restored.add_records([{'indicator': 'Y'}], 'observation')['record_id'].iloc[0] == 'OBS_0002'
+
+    output_path = str(tmp_path / 'enriched.csv')
+    restored.flush_journal(output_path)
+    assert len(restored.journal) == 0
+
+
+def test_journal_tolerates_only_a_torn_last_line(tmp_path):
+    from src.journal import RecordJournal
+
+    path = tmp_path / 'added.jsonl'
+    path.write_bytes(b'{"record_id": "OBS_0001"}\n{"record_id": "OBS_00')
+    assert RecordJournal(str(path)).read()['record_id'].tolist() == ['OBS_0001']
+
+    path.write_bytes(b'{"record_id": "OBS_0001"}\n{"record_id": "OB\xe2\n{"record_id": "OBS_0003"}\n')
+    with pytest.raises(ValueError, match='line 2'):
+        RecordJournal(str(path)).read()
+
+
+def test_validate_frame_matches_validate_record(sample_df):
+    from src.data_handler import validate_frame, validate_record
+
+    df = sample_df.copy()
+    df.loc[1, 'value_numeric'] = None
+    df.loc[5, 'pillar'] = 'ACCESS'
+
+    errors = validate_frame(df)
+    expected = {
+        idx for idx, row in df.iterrows()
+        if validate_record(row.to_dict(), row['record_type'])
+    }
+    assert set(errors['row']) == expected == {1, 5}
+    assert set(zip(errors['field'], errors['rule'])) == {
+        ('value_numeric', 'missing_required'), ('pillar', 'event_has_pillar')
+    }
+    assert validate_frame(sample_df).empty
+
+
+def test_add_records_rejects_invalid_batch(data_paths):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    with pytest.raises(ValueError, match='missing_required'):
+        handler.add_records([{'indicator': 'No date'}], 'event', validate=True)
+    assert len(handler.df) == 9
+
+
+def test_reference_codes_checked_in_bulk(data_paths, sample_df):
+    from src.data_handler import compile_reference_codes, validate_frame, validate_record
+    import pandas as pd
+
+    codes = compile_reference_codes(pd.read_csv(data_paths[1]))
+    assert {'record_type', 'pillar', 'confidence'} <= set(codes)
+    assert validate_frame(sample_df, codes=codes).empty
+
+    df = sample_df.copy()
+    df.loc[0, 'pillar'] = 'ACESS'
+    df.loc[[2, 3], 'confidence'] = 'certain'
+    df.loc[7, 'impact_direction'] = 'up'
+    errors = validate_frame(df, codes=codes)
+    assert set(zip(errors['row'], errors['field'])) == {
+        (0, 'pillar'), (2, 'confidence'), (3, 'confidence'), (7, 'impact_direction')
+    }
+    assert (errors['rule'] == 'invalid_code').all()
+    assert {
+        idx for idx, row in df.iterrows() if validate_record(row.to_dict(), row['record_type'], codes)
+    } == {0, 2, 3, 7}
+
+
+def test_load_and_add_records_check_codes(data_paths):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    assert handler.code_errors.empty
+
+    record = {'pillar': 'ACCESS', 'indicator': 'Account Ownership Rate', 'value_numeric': 49.0,
+              'observation_date': '2024-12-31', 'confidence': 'certain'}
+    with pytest.raises(ValueError, match='invalid_code:confidence'):
+        handler.add_records([record], 'observation', validate=True)
+    with pytest.raises(ValueError, match='invalid_code:record_type'):
+        handler.add_records([dict(record, confidence='high')], 'survey', validate=True)
+    handler.add_records([dict(record, confidence='high')], 'observation', validate=True)
+    assert len(handler.df) == 10
@@ -0,0 +1,92 @@
+"""Tests for the shared, ETag-revalidated dashboard data service."""
+import gzip
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from src.cubes import build_cubes
+from src.data_service import DataService, DataServiceClient, make_handler
+
+
+@pytest.fixture
+def service(tmp_path, data_paths):
+    raw_path, _ = data_paths
+    forecast_path = str(tmp_path / 'forecast.csv')
+    pd.DataFrame({'year': [2025, 2026, 2027], 'forecast': [36.0, 36.3, 36.7],
+                  'optimistic': [43.2, 43.6, 44.1], 'pessimistic': [28.8, 29.1, 29.4]}
+                 ).to_csv(forecast_path, index=False)
+    cube_dir = str(tmp_path / 'cubes')
+    build_cubes(raw_path, forecast_path, cube_dir)
+    return DataService(cube_dir=cube_dir, hist_path=raw_path, forecast_path=forecast_path)
+
+
+def test_etag_revalidation_and_gzip(service):
+    status, headers, body = service.respond('/pages/forecasts')
+    assert status == 200 and 'Content-Encoding' not in headers
+    payload = json.loads(body)
+    assert payload['metrics']['final_forecast'] == 36.7
+    assert payload['tables']['forecast']['columns'][:2] == ['year', 'forecast']
+
+    status, _, empty = service.respond('/pages/forecasts', if_none_match=headers['ETag'])
+    assert status == 304 and empty == b''
+
+    status, gz_headers, gz_body = service.respond('/pages/overview', accept_encoding='gzip, deflate')
+    assert status == 200 and gz_headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(gz_body))['page'] == 'overview'
+    assert service.respond('/pages/nope')[0] == 404
+
+
+def test_invalidated_only_when_artifacts_change(service):
+    version = service.refresh()
+    _, headers, _ = service.respond('/pages/projections')
+
+    # Rebuilding identical cubes keeps the version and the ETags
+    build_cubes(service.hist_path, service.forecast_path, service.cube_dir)
+    assert service.refresh() == version and service.builds == 1
+    assert service.respond('/pages/projections', if_none_match=headers['ETag'])[0] == 304
+
+    forecast = pd.read_csv(service.forecast_path)
+    forecast.loc[2, 'forecast'] = 40.0
+    forecast.to_csv(service.forecast_path, index=False)
+    os.utime(service.forecast_path, (os.path.getmtime(service.cube_dir) + 10,) * 2)
+    assert service.refresh() != version and service.builds == 2
+    status, _, body = service.respond('/pages/projections', if_none_match=headers['ETag'])
+    assert status == 200 and json.loads(body)['metrics']['final_forecast'] == 40.0
+
+
+def test_client_over_http(service):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(service))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = DataServiceClient(f"http://127.0.0.1:{server.server_port}")
+        page = client.page('projections')
+        assert page['tables']['progress']['Year'].tolist() == [2014, 2017, 2021, 2025, 2026, 2027]
+        observations = client.table('observations')
+        assert pd.api.types.is_datetime64_any_dtype(observations['observation_date'])
+        assert len(observations) == 4
+        # Second fetch revalidates (304) and is served from the client's copy
+        assert client.page('projections')['version'] == client.version() == service.version
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_requests_rebuild_in_background(service):
+    version = service.refresh()
+    forecast = pd.read_csv(service.forecast_path)
+    forecast.loc[2, 'forecast'] = 41.0
+    forecast.to_csv(service.forecast_path, index=False)
+    os.utime(service.forecast_path, (os.path.getmtime(service.cube_dir) + 10,) * 2)
+
+    # The request is answered from the current version while the rebuild runs
+    with service._build_lock:
+        status, headers, _ = service.respond('/pages/forecasts')
+        assert status == 200 and headers['X-Data-Version'] == version
+    service._worker.join(timeout=30)
+    assert service.version != version and service.builds == 2
+    assert json.loads(service.respond('/pages/forecasts')[2])['metrics']['final_forecast'] == 41.0
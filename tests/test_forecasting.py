@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.artifact_cache import ArtifactCache
+from src.forecasting import (batch_trend_forecast, create_time_series, event_augmented_forecast,
+                             future_event_impacts, simple_trend_forecast)
+from src.monte_carlo import MonteCarloForecaster, QuantileSketch, write_quantile_columns
+
+
+@pytest.fixture
+def account_series():
+    return pd.DataFrame({'year': [2011, 2014, 2017, 2021, 2024],
+                         'value_numeric': [14.0, 22.0, 35.0, 46.0, 49.0]})
+
+
+@pytest.fixture
+def future_events():
+    events = pd.DataFrame({'record_id': ['EVT_0008', 'EVT_0010'],
+                           'event_date': pd.to_datetime(['2025-10-27', '2025-12-18'])})
+    impacts = pd.DataFrame({'parent_id': ['EVT_0008', 'EVT_0010'],
+                            'related_indicator': ['ACC_OWNERSHIP', 'ACC_OWNERSHIP'],
+                            'impact_estimate': [5.0, 4.0], 'lag_months': [24, 12],
+                            'impact_direction': ['increase', 'decrease']})
+    return events, impacts
+
+
+def test_create_time_series_interpolates_missing_years():
+    obs = pd.DataFrame({'date': pd.to_datetime(['2014-12-31', '2017-12-31']),
+                        'value_numeric': [22.0, 35.0]})
+    series = create_time_series(obs, 'Account')
+    assert series['year'].tolist() == [2014, 2015, 2016, 2017]
+    assert series['value_numeric'].iloc[1] == pytest.approx(22 + 13 / 3)
+
+
+def test_event_augmented_forecast(account_series, future_events):
+    events, impacts = future_events
+    base = simple_trend_forecast(account_series, [2025, 2026, 2027])
+    augmented = event_augmented_forecast(base, events, impacts, 'ACC_OWNERSHIP', base_year=2024)
+    # 2026: +5 * 12/24 - 4 * 12/12; 2027: +5 - 4
+    np.testing.assert_allclose(augmented['forecast'] - base['forecast'], [0.0, -1.5, 1.0])
+
+
+def test_quantile_sketch_matches_exact_quantiles():
+    rng = np.random.default_rng(0)
+    draws = rng.normal(40, 5, size=(200_000, 2))
+    sketch = QuantileSketch(low=[0, 0], high=[80, 80], n_bins=8_000)
+    for block in np.array_split(draws, 7):
+        sketch.update(block)
+    qs = [0.025, 0.5, 0.975]
+    np.testing.assert_allclose(sketch.quantiles(qs), np.quantile(draws, qs, axis=0), atol=0.02)
+
+
+def test_monte_carlo_is_reproducible(account_series, future_events, tmp_path):
+    events, impacts = future_events
+    mc = MonteCarloForecaster(account_series, [2025, 2026, 2027],
+                              future_event_impacts(events, impacts, 'ACC_OWNERSHIP', 2024))
+
+    first = mc.run(n_draws=50_000, n_workers=2, batch_size=10_000)
+    second = mc.run(n_draws=50_000, n_workers=2, batch_size=10_000)
+    pd.testing.assert_frame_equal(first, second)
+    # The worker count does not change the draws
+    pd.testing.assert_frame_equal(mc.run(n_draws=50_000, n_workers=1, batch_size=10_000), first)
+    with pytest.raises(ValueError, match='n_draws'):
+        mc.run(n_draws=0)
+
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    for n_workers in (2, 1):
+        cached = mc.run(n_draws=50_000, n_workers=n_workers, batch_size=10_000, cache=cache)
+        pd.testing.assert_frame_equal(cached, first)
+    assert cache.report()[['hits', 'misses']].values.tolist() == [[1, 1]]
+    assert (first['p2.5'] < first['p50']).all() and (first['p50'] < first['p97.5']).all()
+
+    path = tmp_path / 'forecasts.csv'
+    simple_trend_forecast(account_series, [2025, 2026, 2027]).to_csv(path, index=False)
+    written = write_quantile_columns(str(path), first)
+    np.testing.assert_allclose(written['upper_95'], first['p97.5'])
+    assert 'p50' in pd.read_csv(path).columns
+    assert not os.path.exists(str(path) + '.tmp')
+
+
+def test_batch_trend_forecast_matches_per_series_fit(account_series):
+    rng = np.random.default_rng(1)
+    frames = []
+    for region in ['Addis Ababa', 'Amhara', 'Oromia']:
+        for gender in ['male', 'female']:
+            years = np.sort(rng.choice(np.arange(2011, 2025), size=5, replace=False))
+            frames.append(pd.DataFrame({'region': region, 'gender': gender, 'year': years,
+                                        'value_numeric': rng.uniform(10, 60, size=5)}))
+    frames.append(pd.DataFrame({'region': 'Afar', 'gender': 'male', 'year': [2021],
+                                'value_numeric': [5.0]}))
+    panel = pd.concat(frames, ignore_index=True)
+
+    batch = batch_trend_forecast(panel, [2025, 2026, 2027], keys=['region', 'gender'])
+
+    for (region, gender), group in panel.groupby(['region', 'gender']):
+        got = batch[(batch['region'] == region) & (batch['gender'] == gender)]
+        group = group.assign(date=pd.to_datetime(group['year'].astype(str) + '-12-31'))
+        expected = simple_trend_forecast(create_time_series(group, None), [2025, 2026, 2027])
+        if expected is None:
+            assert got['forecast'].isna().all()
+            continue
+        for col in ['forecast', 'lower_95', 'upper_95']:
+            np.testing.assert_allclose(got[col].to_numpy(), expected[col].to_numpy())
+
+
+def test_batch_trend_forecast_empty_panel():
+    columns = ['region', 'year', 'forecast', 'lower_95', 'upper_95', 'n_obs']
+    empty = pd.DataFrame({'region': [], 'year': [], 'value_numeric': []})
+    assert batch_trend_forecast(empty, [2025], keys=['region']).columns.tolist() == columns
+    undated = pd.DataFrame({'region': ['A'], 'year': [np.nan], 'value_numeric': [1.0]})
+    assert batch_trend_forecast(undated, [2025], keys=['region']).empty
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.forecasting import event_augmented_forecast, simple_trend_forecast
+from src.goal_seek import GoalSeeker
+
+
+@pytest.fixture
+def account_series():
+    return pd.DataFrame({'year': [2014, 2017, 2021, 2024],
+                         'value_numeric': [22.0, 35.0, 46.0, 49.0]})
+
+
+@pytest.fixture
+def events_and_impacts():
+    events = pd.DataFrame({'record_id': ['EVT_0007', 'EVT_0008', 'EVT_0010'],
+                           'event_date': pd.to_datetime(['2025-10-27', '2025-12-18', '2026-03-01'])})
+    impacts = pd.DataFrame({'parent_id': ['EVT_0007', 'EVT_0008', 'EVT_0010'],
+                            'related_indicator': ['ACC_OWNERSHIP'] * 3,
+                            'impact_estimate': [5.0, 2.0, 3.0], 'lag_months': [12, 6, 24],
+                            'impact_direction': ['increase', 'increase', 'decrease']})
+    return events, impacts
+
+
+@pytest.fixture
+def seeker(account_series, events_and_impacts):
+    events, impacts = events_and_impacts
+    return GoalSeeker.from_records(account_series, events, impacts, 'ACC_OWNERSHIP', 2024,
+                                   years=range(2025, 2041))
+
+
+def test_unit_scale_path_matches_event_augmented_forecast(seeker, account_series, events_and_impacts):
+    events, impacts = events_and_impacts
+    base = simple_trend_forecast(account_series, list(range(2025, 2041)))
+    augmented = event_augmented_forecast(base, events, impacts, 'ACC_OWNERSHIP', 2024)
+    np.testing.assert_allclose(seeker.paths(1.0)[0], augmented['forecast'])
+
+
+def test_earliest_year_over_a_grid(seeker):
+    scales, growth = np.meshgrid(np.linspace(0, 3, 31), [0.9, 1.0, 1.1])
+    result = seeker.earliest_year(60, scales.ravel(), growth.ravel())
+    assert len(result) == 93
+
+    paths = seeker.paths(result['scale'], result['growth'])
+    for (_, row), path in zip(result.iterrows(), paths):
+        reached = seeker.years[path >= 60]
+        expected = reached[0] if len(reached) else np.nan
+        assert row['earliest_year'] == expected or (np.isnan(expected) and np.isnan(row['earliest_year']))
+
+    # More impact never delays the target
+    base = result[result['growth'] == 1.0].sort_values('scale')['earliest_year'].ffill()
+    assert base.is_monotonic_decreasing
+
+
+def test_minimum_scale_hits_target_exactly(seeker):
+    result = seeker.minimum_scale(60, [2026, 2027, 2040])
+    for _, row in result.iterrows():
+        if row['min_scale'] > 0:
+            position = list(seeker.years).index(row['year'])
+            assert seeker.paths(row['min_scale'])[0, position] == pytest.approx(60)
+    assert result.loc[result['year'] == 2040, 'min_scale'].item() == 0.0
+
+    with pytest.raises(ValueError):
+        seeker.minimum_scale(60, [2060])
+
+
+def test_minimum_interventions_picks_largest_first(seeker):
+    trend_2027 = seeker.trend[list(seeker.years).index(2027)]
+    result = seeker.minimum_interventions(trend_2027 + 4.5, [2027])
+    assert result.loc[0, 'n_interventions'] == 1
+    assert result.loc[0, 'events'] == ['EVT_0007']
+
+    result = seeker.minimum_interventions(trend_2027 + 6.5, [2027])
+    assert result.loc[0, 'n_interventions'] == 2
+
+    result = seeker.minimum_interventions(trend_2027 + 100, [2027])
+    assert np.isnan(result.loc[0, 'n_interventions'])
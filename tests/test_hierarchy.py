@@ -0,0 +1,139 @@
+"""Tests for hierarchical forecast reconciliation."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.hierarchy import HierarchicalForecaster, Hierarchy, reconcile, shrinkage_covariance
+
+
+BOTTOM = pd.DataFrame({'location': ['urban'] * 4 + ['rural'] * 4,
+                       'region': list('AABBCCDD'),
+                       'gender': ['male', 'female'] * 4})
+
+
+def _panel(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _, node in BOTTOM.iterrows():
+        for year in range(2011, 2025, 3):
+            rows.append({**node.to_dict(), 'indicator_code': 'ACC_OWNERSHIP',
+                         'observation_date': f'{year}-12-31',
+                         'value_numeric': 20 + (year - 2011) + rng.normal() * 3})
+    bottom = pd.DataFrame(rows)
+    national = bottom.groupby(['indicator_code', 'observation_date'], as_index=False)['value_numeric'].mean()
+    national = national.assign(location='national', gender='all', value_numeric=national['value_numeric'] + 2)
+    by_gender = bottom.groupby(['indicator_code', 'observation_date', 'gender'], as_index=False)['value_numeric'].mean()
+    return pd.concat([bottom, national, by_gender.assign(location='national')], ignore_index=True)
+
+
+def test_summing_matrix_structure():
+    hierarchy = Hierarchy(BOTTOM)
+    assert hierarchy.S.shape == (21, 8)
+    counts = hierarchy.nodes['level'].value_counts()
+    assert counts['total'] == 1 and counts['location x gender'] == 4
+    total = hierarchy.nodes.index[hierarchy.nodes['level'] == 'total'][0]
+    assert hierarchy.S[total].sum() == 8
+    np.testing.assert_array_equal(hierarchy.S[-8:].toarray(), np.eye(8))
+
+
+def test_reconciled_forecasts_are_coherent():
+    hierarchy = Hierarchy(BOTTOM, aggregation='mean', weights=[1, 2, 1, 1, 3, 1, 1, 1])
+    rng = np.random.default_rng(1)
+    base = rng.normal(size=(len(hierarchy), 3))
+    residuals = rng.normal(size=(6, len(hierarchy)))
+    for method in ('ols', 'wls_struct', 'wls_var', 'mint_shrink'):
+        reconciled = reconcile(hierarchy.S, base, method, residuals)
+        np.testing.assert_allclose(hierarchy.S @ reconciled[-8:], reconciled, atol=1e-10)
+
+    coherent = hierarchy.S @ rng.normal(size=(8, 3))
+    np.testing.assert_allclose(reconcile(hierarchy.S, coherent, 'ols'), coherent, atol=1e-10)
+
+
+def test_weighted_sum_keeps_bottom_identity():
+    weights = [1, 2, 1, 1, 3, 1, 1, 1]
+    hierarchy = Hierarchy(BOTTOM, aggregation='sum', weights=weights)
+    np.testing.assert_array_equal(hierarchy.S[-8:].toarray(), np.eye(8))
+    total = hierarchy.nodes.index[hierarchy.nodes['level'] == 'total'][0]
+    assert hierarchy.S[total].sum() == sum(weights)
+
+    base = np.random.default_rng(3).normal(size=(len(hierarchy), 2))
+    reconciled = reconcile(hierarchy.S, base, 'wls_struct')
+    np.testing.assert_allclose(hierarchy.S @ reconciled[-8:], reconciled, atol=1e-10)
+
+    for bad in ([1, 2, 1, 1, 3, 1, 1, 0], [1, 2, 1, 1, 3, 1, 1, np.nan], [1, 2]):
+        with pytest.raises(ValueError, match='weight'):
+            Hierarchy(BOTTOM, aggregation='sum', weights=bad)
+
+
+def test_partial_weights_rejected():
+    weights = BOTTOM.assign(weight=[1.0, 2.0, 1.0, 1.0, 3.0, 1.0, 1.0, 1.0])
+    forecaster = HierarchicalForecaster(range(2025, 2028), aggregation='sum', method='ols')
+    result = forecaster.run(_panel(), weights=weights)
+    nodes = result[result['year'] == 2027].set_index(['location', 'region', 'gender'])
+    bottom = nodes[nodes['level'] == 'location x region x gender']
+    weighted = (bottom['reconciled'] * weights.set_index(['location', 'region', 'gender'])['weight']).sum()
+    assert nodes.loc[('national', 'all', 'all'), 'reconciled'] == pytest.approx(weighted)
+
+    with pytest.raises(ValueError, match='No weight for 1 bottom series'):
+        forecaster.run(_panel(), weights=weights.iloc[:-1])
+
+
+def test_mint_matches_dense_formula():
+    hierarchy = Hierarchy(BOTTOM)
+    S, n = hierarchy.S, len(hierarchy)
+    rng = np.random.default_rng(2)
+    residuals = rng.normal(size=(8, 1)) @ rng.normal(size=(1, n)) + 0.3 * rng.normal(size=(8, n))
+    base = rng.normal(size=(n, 2))
+    base[3] = np.nan
+
+    observed = ~np.isnan(base).any(axis=1)
+    diagonal, factor, lam = shrinkage_covariance(residuals[:, observed])
+    cov = residuals[:, observed].T @ residuals[:, observed] / 8
+    W = np.diag(diagonal) + factor @ factor.T
+    np.testing.assert_allclose(W, lam * np.diag(np.diag(cov)) + (1 - lam) * cov, atol=1e-6)
+
+    S_obs, W_inv = S.toarray()[observed], np.linalg.inv(W)
+    expected = S.toarray() @ np.linalg.solve(S_obs.T @ W_inv @ S_obs, S_obs.T @ W_inv @ base[observed])
+    np.testing.assert_allclose(reconcile(S, base, 'mint_shrink', residuals), expected, atol=1e-8)
+
+
+def test_missing_bottom_forecast_rejected():
+    hierarchy = Hierarchy(BOTTOM)
+    base = np.ones((len(hierarchy), 1))
+    base[-1] = np.nan
+    with pytest.raises(ValueError):
+        reconcile(hierarchy.S, base)
+
+
+def test_forecaster_fits_every_node():
+    result = HierarchicalForecaster(range(2025, 2028), aggregation='mean').run(_panel())
+    assert set(result['year']) == {2025, 2026, 2027}
+    nodes = result[result['year'] == 2027].set_index(['location', 'region', 'gender'])
+    assert nodes['base'].notna().sum() == 8 + 1 + 2
+    bottom_mean = nodes.loc[nodes['level'] == 'location x region x gender', 'reconciled'].mean()
+    assert nodes.loc[('national', 'all', 'all'), 'reconciled'] == pytest.approx(bottom_mean)
+    assert nodes.loc[('national', 'all', 'all'), 'reconciled'] != pytest.approx(
+        nodes.loc[('national', 'all', 'all'), 'base'])
+
+
+def _national(values=(22.0, 35.0, 46.0)):
+    return pd.DataFrame({'indicator_code': 'ACC_OWNERSHIP', 'location': 'national', 'gender': 'all',
+                         'observation_date': ['2014-12-31', '2017-12-31', '2021-12-31'],
+                         'value_numeric': list(values)})
+
+
+def test_national_only_keeps_base_forecast():
+    result = HierarchicalForecaster([2025, 2027]).fit(_national())
+    assert result['level'].tolist() == ['total', 'total']
+    np.testing.assert_allclose(result['reconciled'], result['base'])
+    assert result['base'].iloc[0] == pytest.approx(60.619, abs=1e-3)
+
+
+def test_national_gender_split_is_bottom_level():
+    panel = pd.concat([_national(), _national((27.0, 40.0, 51.0)).assign(gender='male'),
+                       _national((15.0, 28.0, 39.0)).assign(gender='female')], ignore_index=True)
+    result = HierarchicalForecaster([2027], method='ols').fit(panel).set_index('gender')
+    assert set(result['level']) == {'total', 'gender'}
+    assert result.loc['all', 'reconciled'] == pytest.approx(
+        result.loc[['male', 'female'], 'reconciled'].mean())
+    assert result.loc['all', 'reconciled'] != pytest.approx(result.loc['all', 'base'])
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.impact_graph import ImpactGraph
+
+
+@pytest.fixture
+def chain_impacts(sample_df):
+    impacts = sample_df[sample_df['record_type'] == 'impact_link']
+    # USG_P2P_COUNT feeds ACC_OWNERSHIP: +0.1pp per unit after 6 months
+    link = pd.DataFrame([{'record_id': 'IMP_0003', 'parent_id': 'USG_P2P_COUNT',
+                          'record_type': 'impact_link', 'related_indicator': 'ACC_OWNERSHIP',
+                          'relationship_type': 'indirect', 'impact_direction': 'increase',
+                          'impact_estimate': 0.1, 'lag_months': 6}])
+    return pd.concat([impacts, link], ignore_index=True)
+
+
+def test_direct_matrix_matches_impact_links(sample_df):
+    graph = ImpactGraph(sample_df)
+    dense = graph.to_dense()
+    assert dense.loc['EVT_0001', 'ACC_OWNERSHIP'] == 15.0
+    assert dense.loc['EVT_0002', 'USG_P2P_COUNT'] == 8.0  # medium magnitude default
+    assert dense.loc['EVT_0001', 'USG_P2P_COUNT'] == 0.0
+
+
+def test_multi_hop_propagation_adds_lags(chain_impacts):
+    graph = ImpactGraph(chain_impacts)
+    assert list(graph.events) == ['EVT_0001', 'EVT_0002']
+
+    paths = graph.paths_frame(max_hops=3)
+    indirect = paths[(paths['event_id'] == 'EVT_0002') & (paths['indicator'] == 'ACC_OWNERSHIP')]
+    assert indirect[['hops', 'lag_months']].values.tolist() == [[2, 30]]
+    assert indirect['effect'].item() == pytest.approx(0.8)
+
+    direct_only = graph.to_dense(max_hops=1)
+    assert direct_only.loc['EVT_0002', 'ACC_OWNERSHIP'] == 0.0
+    assert graph.to_dense(max_hops=2).loc['EVT_0002', 'ACC_OWNERSHIP'] == pytest.approx(0.8)
+
+    # Half way through the cumulative 30-month lag, half the effect is realised
+    assert graph.to_dense(max_hops=2, months=15).loc['EVT_0002', 'ACC_OWNERSHIP'] == pytest.approx(0.4)
+    assert graph.paths_frame(max_hops=3, horizon_months=24)['hops'].max() == 1
+
+
+def test_indicator_links_need_an_estimate(chain_impacts, capsys):
+    unestimated = chain_impacts.assign(impact_magnitude='high')
+    unestimated.loc[unestimated['parent_id'] == 'USG_P2P_COUNT', 'impact_estimate'] = None
+    graph = ImpactGraph(unestimated)
+    assert 'Dropping 1 indicator -> indicator link' in capsys.readouterr().out
+    assert graph.to_dense(max_hops=3).loc['EVT_0002', 'ACC_OWNERSHIP'] == 0.0
+    # Event links still fall back to their magnitude label
+    assert graph.to_dense().loc['EVT_0002', 'USG_P2P_COUNT'] == 15.0
+
+
+def test_add_indicator_links_and_export(tmp_path, sample_df):
+    graph = ImpactGraph(sample_df)
+    graph.add_indicator_links(pd.DataFrame({'source': ['ACC_OWNERSHIP'], 'target': ['GEN_GAP_ACC'],
+                                            'elasticity': [-0.5], 'lag_months': [12]}))
+    assert 'GEN_GAP_ACC' in graph.indicators
+    assert graph.to_dense(max_hops=2).loc['EVT_0001', 'GEN_GAP_ACC'] == pytest.approx(-7.5)
+
+    path = tmp_path / 'association_matrix.csv'
+    events = sample_df[sample_df['record_type'] == 'event']
+    written = graph.export_csv(str(path), max_hops=2, events=events)
+    assert path.exists()
+    assert written.loc[written['record_id'] == 'EVT_0001', 'event_name'].item() == 'Telebirr Launch'
+
+
+def test_total_effects_stay_sparse():
+    n_events, n_indicators = 300, 200
+    rng = np.random.default_rng(0)
+    impacts = pd.DataFrame({
+        'parent_id': [f"EVT_{i % n_events:04d}" for i in range(900)],
+        'related_indicator': [f"IND_{i:03d}" for i in rng.integers(0, n_indicators, 900)],
+        'impact_direction': 'increase', 'impact_estimate': 1.0,
+        'lag_months': rng.integers(0, 24, 900), 'relationship_type': 'direct'
+    })
+    links = pd.DataFrame({'parent_id': [f"IND_{i:03d}" for i in rng.integers(0, n_indicators, 300)],
+                          'related_indicator': [f"IND_{i:03d}" for i in rng.integers(0, n_indicators, 300)],
+                          'impact_direction': 'increase', 'impact_estimate': 0.1,
+                          'lag_months': 6, 'relationship_type': 'indirect'})
+    graph = ImpactGraph(pd.concat([impacts, links], ignore_index=True))
+    total = graph.total_effects(max_hops=4)
+    assert total.shape == (n_events, len(graph.indicators))
+    assert total.nnz < total.shape[0] * total.shape[1]
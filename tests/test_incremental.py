@@ -0,0 +1,87 @@
+"""Tests for dependency-tracked incremental re-forecasting."""
+import os
+
+import pandas as pd
+
+from src.data_handler import ChangeSet, DataHandler
+from src.incremental import DependencyIndex, IncrementalForecaster, refresh_association_matrix
+
+
+def _observation(code, value, date):
+    return {'pillar': 'USAGE', 'indicator': code, 'indicator_code': code,
+            'value_numeric': value, 'observation_date': date}
+
+
+def test_change_set_from_add_records(data_paths):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    handler.add_records([_observation('USG_P2P_COUNT', 60.0, '2025-06-30')], 'observation')
+    handler.add_records([{'parent_id': 'EVT_0001', 'pillar': 'USAGE', 'related_indicator': 'USG_P2P_COUNT',
+                          'impact_direction': 'increase', 'impact_estimate': 5.0, 'lag_months': 6}],
+                        'impact_link')
+    changes = handler.take_changes()
+    assert changes.indicators == {'USG_P2P_COUNT'}
+    assert changes.events == {'EVT_0001'}
+    assert changes.impact_links == {'IMP_0003'}
+    assert not handler.changes
+
+
+def test_dependency_index_lookup():
+    index = DependencyIndex({'A': {'indicators': ['A'], 'events': ['EVT_1'], 'impact_links': ['IMP_1']},
+                             'B': {'indicators': ['B']}})
+    changes = ChangeSet()
+    changes.events.add('EVT_1')
+    assert index.affected(changes) == {'A'}
+    index.set('A', indicators=['A'])
+    assert index.affected(changes) == set()
+
+
+def test_refresh_refits_only_affected_series(data_paths, tmp_path):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    handler.add_records([_observation('USG_P2P_COUNT', 40.0, '2021-06-30'),
+                         _observation('USG_P2P_COUNT', 45.0, '2022-06-30')], 'observation')
+    handler.take_changes()
+
+    store = str(tmp_path / 'forecasts.csv')
+    forecaster = IncrementalForecaster(range(2025, 2028), output_path=store,
+                                       cache_dir=str(tmp_path / 'cache'))
+    full = forecaster.refresh(handler.df)
+    assert full['refit'] == ['ACC_OWNERSHIP', 'USG_P2P_COUNT']
+    before = pd.read_csv(store)
+
+    # A new P2P observation leaves account ownership untouched
+    handler.add_records([_observation('USG_P2P_COUNT', 70.0, '2025-01-31')], 'observation')
+    result = forecaster.refresh(handler.df, handler.take_changes())
+    assert result == {'refit': ['USG_P2P_COUNT'], 'kept': 3}
+    after = pd.read_csv(store)
+    account = after['indicator_code'] == 'ACC_OWNERSHIP'
+    pd.testing.assert_frame_equal(after[account].reset_index(drop=True),
+                                  before[before['indicator_code'] == 'ACC_OWNERSHIP'].reset_index(drop=True))
+    assert not after[~account]['forecast'].equals(before[~account]['forecast'])
+
+    # Incremental and full builds agree
+    rebuilt = str(tmp_path / 'rebuilt.csv')
+    IncrementalForecaster(range(2025, 2028), output_path=rebuilt, cache_dir=None).refresh(handler.df)
+    pd.testing.assert_frame_equal(pd.read_csv(rebuilt), after)
+
+    assert forecaster.refresh(handler.df, handler.take_changes()) == {'refit': [], 'kept': 6}
+
+
+def test_association_matrix_rebuilds_changed_events(data_paths, tmp_path):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    path = str(tmp_path / 'matrix.csv')
+    refresh_association_matrix(handler.df, output_path=path)
+    before = pd.read_csv(path)
+    assert set(before['record_id']) == {'EVT_0001', 'EVT_0002'}
+
+    handler.add_records([{'parent_id': 'EVT_0002', 'pillar': 'ACCESS', 'related_indicator': 'ACC_OWNERSHIP',
+                          'impact_direction': 'increase', 'impact_estimate': 4.0, 'lag_months': 12}],
+                        'impact_link')
+    result = refresh_association_matrix(handler.df, handler.take_changes(), output_path=path)
+    assert result == {'rebuilt': ['EVT_0002'], 'kept': 1}
+    after = pd.read_csv(path).set_index('record_id')
+    assert after.loc['EVT_0002', 'ACC_OWNERSHIP'] == 4.0
+    assert after.loc['EVT_0001', 'ACC_OWNERSHIP'] == before.set_index('record_id').loc['EVT_0001', 'ACC_OWNERSHIP']
+    assert os.path.exists(str(tmp_path / 'matrix.deps.json'))
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from src import instrumentation
+from src.data_handler import DataHandler, validate_frame
+from src.forecasting import batch_trend_forecast
+
+
+@pytest.fixture
+def metrics_path(tmp_path):
+    path = tmp_path / 'metrics.jsonl'
+    instrumentation.clear()
+    instrumentation.enable(str(path), trace_memory=True)
+    yield path
+    instrumentation.disable()
+    instrumentation.clear()
+
+
+def test_disabled_by_default_records_nothing(data_paths):
+    instrumentation.clear()
+    DataHandler(*data_paths).load_data()
+    assert instrumentation.records() == []
+
+
+def test_pipeline_stages_are_recorded(metrics_path, data_paths, sample_df):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    handler.get_record_type_summary()
+    handler.add_records([{'pillar': 'ACCESS', 'indicator': 'Account Ownership Rate',
+                          'value_numeric': 49.0, 'observation_date': '2024-12-31'}], 'observation')
+    validate_frame(sample_df)
+
+    obs = sample_df[sample_df['record_type'] == 'observation'].assign(year=[2014, 2017, 2021, 2024])
+    batch_trend_forecast(obs, [2025])
+
+    lines = [json.loads(line) for line in metrics_path.read_text().splitlines()]
+    by_stage = {r['stage']: r for r in lines}
+    assert set(by_stage) == {'load', 'summarize', 'add', 'validate', 'forecast'}
+    assert by_stage['load']['rows'] == 9
+    assert by_stage['add']['rows'] == 1
+    assert by_stage['validate']['rows'] == 9
+    assert by_stage['forecast']['rows'] == 4
+    for record in lines:
+        assert record['wall_s'] >= 0 and record['cpu_s'] >= 0
+        assert record['status'] == 'ok'
+        assert record['traced_peak_mb'] is not None
+
+    summary = instrumentation.summary(str(metrics_path))
+    assert set(summary['stage']) == set(by_stage)
+
+
+def test_nested_stages_and_errors(metrics_path):
+    with pytest.raises(RuntimeError):
+        with instrumentation.stage('forecast', indicator='ACC_OWNERSHIP'):
+            with instrumentation.stage('load') as record:
+                record['rows'] = 10
+            raise RuntimeError("boom")
+
+    inner, outer = instrumentation.records()
+    assert inner['parent'] == 'forecast' and inner['rows'] == 10
+    assert inner['traced_peak_mb'] is None  # only the outermost stage traces memory
+    assert outer['status'] == 'error: RuntimeError'
+    assert outer['indicator'] == 'ACC_OWNERSHIP'
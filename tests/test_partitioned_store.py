@@ -0,0 +1,85 @@
+"""Tests for the partitioned, atomically committed enriched-data writer."""
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.data_handler import DataHandler
+from src.partitioned_store import load_manifest, read_partitions, write_partitions
+
+
+def _sorted(df):
+    return df.sort_values('record_id', ignore_index=True)
+
+
+def test_round_trip_by_record_type_and_year(sample_df, tmp_path):
+    out = str(tmp_path / 'enriched')
+    result = write_partitions(sample_df, out, max_workers=2)
+    assert result['written'] == len(result['partitions']) and result['skipped'] == 0
+    keys = {(p['record_type'], p['year']) for p in result['partitions']}
+    assert ('observation', 2014) in keys and ('event', 2022) in keys
+    assert all(p['path'].endswith('.parquet') for p in result['partitions'])
+
+    restored = read_partitions(out)
+    pd.testing.assert_frame_equal(_sorted(restored), _sorted(sample_df), check_dtype=False)
+    events = read_partitions(out, record_types=['event'], columns=['record_id'])
+    assert sorted(events['record_id']) == ['EVT_0001', 'EVT_0002']
+
+
+def test_unchanged_partitions_are_skipped(sample_df, tmp_path):
+    out = str(tmp_path / 'enriched')
+    first = write_partitions(sample_df, out)
+    assert write_partitions(sample_df, out)['written'] == 0
+
+    changed = sample_df.copy()
+    changed.loc[changed['record_id'] == 'REC_0004', 'value_numeric'] = 55.0
+    result = write_partitions(changed, out)
+    assert result['written'] == 1 and result['skipped'] == len(first['partitions']) - 1
+
+    # The replaced partition file is gone; every manifest entry exists
+    files = {os.path.relpath(os.path.join(root, name), out)
+             for root, _, names in os.walk(out) for name in names if name.endswith('.parquet')}
+    assert files == {p['path'] for p in load_manifest(out)['partitions']}
+    assert read_partitions(out, record_types=['observation'], years=[2024])['value_numeric'].tolist() == [55.0]
+
+
+def test_failed_save_keeps_previous_commit(sample_df, tmp_path, monkeypatch):
+    out = str(tmp_path / 'enriched')
+    write_partitions(sample_df, out)
+    before = load_manifest(out)
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pq, 'write_table', crash)
+    changed = sample_df.assign(confidence='low')
+    with pytest.raises(OSError):
+        write_partitions(changed, out)
+    monkeypatch.undo()
+    assert load_manifest(out) == before
+    pd.testing.assert_frame_equal(_sorted(read_partitions(out)), _sorted(sample_df), check_dtype=False)
+
+
+def test_save_enriched_data_partitioned(data_paths, tmp_path):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    output_path = str(tmp_path / 'ethiopia_fi_enriched.csv')
+    handler.save_enriched_data(output_path, partitioned=True)
+    assert len(read_partitions(str(tmp_path / 'ethiopia_fi_enriched'))) == len(handler.df)
+
+    handler.save_enriched_data(output_path)
+    assert len(pd.read_csv(output_path)) == len(handler.df)
+    assert not os.path.exists(output_path + '.tmp')
+
+
+def test_mixed_type_object_columns(sample_df, tmp_path):
+    out = str(tmp_path / 'enriched')
+    mixed = sample_df.astype({'value_numeric': object})
+    mixed['observation_date'] = '2021-12-31'
+    mixed.loc[mixed['record_id'] == 'REC_0002', 'value_numeric'] = 'n/a'
+    write_partitions(mixed, out)
+
+    restored = read_partitions(out, record_types=['observation']).set_index('record_id')['value_numeric']
+    assert restored.to_dict() == {'REC_0001': '22.0', 'REC_0002': 'n/a', 'REC_0003': '46.0', 'REC_0004': '49.7'}
+    assert read_partitions(out, record_types=['event'])['value_numeric'].isna().all()
@@ -0,0 +1,40 @@
+"""Tests for canonical integer periods."""
+import numpy as np
+import pandas as pd
+
+from src.data_handler import DataHandler
+from src.impact_model import calculate_impact_over_time
+from src.periods import month_index, period_start, period_year, scalar_month
+
+
+def test_month_index_round_trips():
+    periods = month_index(['2024-01-15', '2021-12-31', 'not a date', None])
+    assert periods.tolist() == [2024 * 12, 2021 * 12 + 11, -1, -1]
+    assert period_year(periods).tolist() == [2024, 2021, -1, -1]
+    assert list(period_start(periods[:2]).strftime('%Y-%m')) == ['2024-01', '2021-12']
+
+    # Integer input is already periods; datetimes are not re-parsed
+    assert (month_index(pd.Series(periods)) == periods).all()
+    assert (month_index(pd.date_range('2024-01-01', periods=3, freq='MS')) == 2024 * 12 + np.arange(3)).all()
+    assert scalar_month(pd.Timestamp('2024-06-30')) == scalar_month('2024-06-30') == 2024 * 12 + 5
+
+
+def test_impact_accepts_periods():
+    by_date = calculate_impact_over_time(40.0, 'increase', 12.0, 12, '2021-05-17', '2021-11-01')
+    by_period = calculate_impact_over_time(40.0, 'increase', 12.0, 12,
+                                           scalar_month('2021-05-17'), scalar_month('2021-11-01'))
+    assert by_date == by_period == 46.0
+
+
+def test_handler_parses_dates_once(data_paths):
+    handler = DataHandler(*data_paths)
+    handler.load_data()
+    dates = handler.observation_dates
+    assert handler.observation_dates is dates
+
+    handler.add_records([{'pillar': 'ACCESS', 'indicator': 'Account Ownership Rate',
+                          'value_numeric': 49.0, 'observation_date': '2024-12-31'}], 'observation')
+    periods = handler.periods
+    assert len(periods) == 10
+    assert periods[-1] == 2024 * 12 + 11
+    assert (periods[:9] == month_index(dates)).all()
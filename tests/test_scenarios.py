@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.impact_model import ImpactModel
+from src.scenarios import ScenarioEngine
+
+
+@pytest.fixture
+def engine(sample_df):
+    impacts = sample_df[sample_df['record_type'] == 'impact_link']
+    return ScenarioEngine(impacts, years=range(2021, 2027))
+
+
+def test_all_events_on_matches_impact_model(sample_df, engine):
+    model = ImpactModel(sample_df[sample_df['record_type'] == 'event'],
+                        sample_df[sample_df['record_type'] == 'impact_link'],
+                        sample_df[sample_df['record_type'] == 'observation'])
+    months = np.arange(2021, 2027) * 12 + 11
+    expected = model.ramp_matrix(model.matrix, months)
+
+    values = engine.evaluate(np.ones(len(engine.event_ids)))[0]
+    for i, indicator in enumerate(model.matrix['related_indicator']):
+        np.testing.assert_allclose(values[engine.indicators.get_loc(indicator)], expected[i])
+
+
+def test_event_toggles_and_scaling_are_linear(engine):
+    base = engine.run([{}])
+    off = engine.run([{'EVT_0001': 0.0}])
+    doubled = engine.run([{'EVT_0001': 2.0}])
+
+    acc = lambda frame: frame.loc[frame['indicator'] == 'ACC_OWNERSHIP', 'value'].to_numpy()
+    assert np.all(acc(off) == 0.0)
+    np.testing.assert_allclose(acc(doubled), 2 * acc(base))
+
+    with pytest.raises(ValueError):
+        engine.weights([{'EVT_9999': 1.0}])
+
+
+def test_batched_lag_scaling(engine):
+    weights = np.ones((3, len(engine.event_ids)))
+    lags = np.array([[1.0] * len(engine.event_ids), [2.0] * len(engine.event_ids),
+                     [0.5] * len(engine.event_ids)])
+    values = engine.evaluate(weights, lags)
+    row = engine.indicators.get_loc('ACC_OWNERSHIP')
+
+    np.testing.assert_allclose(values[0], engine.evaluate(weights[:1])[0])
+    # Longer lags realise less of the impact early on, never more
+    assert np.all(values[1, row] <= values[0, row]) and np.all(values[2, row] >= values[0, row])
+    assert values[1, row, 0] < values[0, row, 0]
+
+
+def test_baseline_is_added(engine):
+    engine.set_baseline('ACC_OWNERSHIP', np.full(len(engine.years), 40.0))
+    values = engine.evaluate(np.zeros(len(engine.event_ids)))[0]
+    assert np.all(values[engine.indicators.get_loc('ACC_OWNERSHIP')] == 40.0)
+    with pytest.raises(ValueError):
+        engine.set_baseline('UNKNOWN', [0.0])
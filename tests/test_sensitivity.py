@@ -0,0 +1,50 @@
+"""Tests for the impact sensitivity analysis."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.sensitivity import ImpactSensitivity, sensitivity_report
+
+
+@pytest.fixture
+def study():
+    series = pd.DataFrame({'year': [2014, 2017, 2021], 'value_numeric': [22.0, 35.0, 46.0]})
+    impacts = pd.DataFrame({'event_id': ['EVT_0001', 'EVT_0002', 'EVT_0003'],
+                            'event_year': [2022, 2023, 2024],
+                            'impact_estimate': [10.0, 4.0, 6.0],
+                            'lag_months': [12.0, 12.0, 12.0],
+                            'sign': [1.0, 1.0, -1.0]})
+    # Lags are long finished by 2030, so the 2030 forecast is linear in the estimates
+    return ImpactSensitivity(series, impacts, target_years=[2030], estimate_bounds=(0.0, 2.0))
+
+
+def test_sobol_matches_analytic_indices(study):
+    result = study.sobol(n_samples=20_000, seed=1).set_index('parameter')
+    widths = np.array([20.0, 8.0, 12.0])
+    expected = widths ** 2 / (widths ** 2).sum()
+    estimates = result.loc[['EVT_0001:impact_estimate', 'EVT_0002:impact_estimate', 'EVT_0003:impact_estimate']]
+    np.testing.assert_allclose(estimates['S1'], expected, atol=0.03)
+    np.testing.assert_allclose(estimates['ST'], expected, atol=0.03)
+    assert result.loc['EVT_0001:lag_months', 'ST'] == pytest.approx(0.0, abs=1e-12)
+    assert result['rank'].min() == 1 and result.index[0] == 'EVT_0001:impact_estimate'
+    assert (result['n_evaluations'] == 20_000 * 8).all()
+
+
+def test_morris_ranks_like_sobol(study):
+    morris = study.morris(n_trajectories=200, seed=2).set_index('parameter')
+    assert list(morris.index[:3]) == ['EVT_0001:impact_estimate', 'EVT_0003:impact_estimate',
+                                      'EVT_0002:impact_estimate']
+    # Linear effects: every elementary effect equals the parameter's range (times its sign)
+    assert morris.loc['EVT_0003:impact_estimate', 'mu'] == pytest.approx(-12.0)
+    assert morris.loc['EVT_0003:impact_estimate', 'sigma'] == pytest.approx(0.0, abs=1e-9)
+
+    report = sensitivity_report(study, n_samples=2_000, n_trajectories=50)
+    assert list(report['parameter'][:1]) == ['EVT_0001:impact_estimate']
+
+
+def test_nominal_matches_event_augmented_forecast(study):
+    from src.forecasting import event_impact_by_year, fit_linear_trend
+
+    slope, intercept, _ = fit_linear_trend([2014, 2017, 2021], [22.0, 35.0, 46.0])
+    expected = slope * 2030 + intercept + event_impact_by_year(study.impacts, [2030])[0]
+    assert study.nominal()[0] == pytest.approx(expected)
@@ -0,0 +1,70 @@
+import os
+
+import pandas as pd
+
+from src.data_handler import DataHandler
+from src.streaming import iter_chunks, stream_ingest
+
+
+def test_chunks_are_typed_consistently(data_paths):
+    raw_path, _ = data_paths
+    chunks = list(iter_chunks(raw_path, chunksize=4))
+    assert [len(c) for c in chunks] == [4, 4, 1]
+    for chunk in chunks:
+        assert chunk['value_numeric'].dtype == 'float64'
+        assert pd.api.types.is_datetime64_any_dtype(chunk['observation_date'])
+    assert chunks[-1].index[0] == 8
+
+
+def test_streamed_summary_matches_in_memory_summary(data_paths, tmp_path):
+    handler = DataHandler(*data_paths)
+    expected = handler.get_record_type_summary()
+
+    result = DataHandler(*data_paths).stream_ingest(
+        output_path=str(tmp_path / 'enriched.csv'),
+        route_dir=str(tmp_path / 'by_type'),
+        chunksize=2
+    )
+
+    pd.testing.assert_frame_equal(result['summary'], expected, check_dtype=False)
+    assert result['rows_written'] == 9
+    assert len(pd.read_csv(tmp_path / 'enriched.csv')) == 9
+    assert len(pd.read_csv(tmp_path / 'by_type' / 'event.csv')) == 2
+
+
+def test_invalid_rows_are_dropped_and_reported(sample_df, tmp_path):
+    sample_df.loc[5, 'pillar'] = 'ACCESS'
+    source = tmp_path / 'dump.csv'
+    sample_df.to_csv(source, index=False)
+
+    result = stream_ingest(str(source), output_path=str(tmp_path / 'out.csv'),
+                           error_path=str(tmp_path / 'errors.csv'), chunksize=3)
+
+    assert result['errors'] == {'event_has_pillar': 1}
+    assert result['rows_written'] == 8
+    assert pd.read_csv(tmp_path / 'errors.csv')['row'].tolist() == [5]
+    assert not os.path.exists(tmp_path / 'out.csv.tmp')
+
+
+def test_dates_parse_the_same_for_any_chunksize(tmp_path):
+    source = tmp_path / 'dates.csv'
+    pd.DataFrame({'record_id': ['A', 'B', 'C', 'D'],
+                  'observation_date': ['2021-12-31', '12/31/2022', '2023-06-30', '06/30/2024']}
+                 ).to_csv(source, index=False)
+    expected = pd.to_datetime(['2021-12-31', '2022-12-31', '2023-06-30', '2024-06-30'])
+    for chunksize in (1, 2, 4):
+        parsed = pd.concat(iter_chunks(str(source), chunksize=chunksize))['observation_date']
+        assert parsed.tolist() == expected.tolist()
+
+
+def test_codes_checked_at_load(sample_df, data_paths, tmp_path):
+    sample_df.loc[0, 'pillar'] = 'BOGUS'
+    source = tmp_path / 'dump.csv'
+    sample_df.to_csv(source, index=False)
+
+    result = stream_ingest(str(source), output_path=str(tmp_path / 'out.csv'), chunksize=4,
+                           ref_df=pd.read_csv(data_paths[1]))
+    assert result['errors'] == {'invalid_code': 1} and result['rows_written'] == 8
+
+    handler = DataHandler(str(source), data_paths[1])
+    assert handler.stream_ingest(output_path=str(tmp_path / 'out.csv'), chunksize=4)['errors'] == {'invalid_code': 1}
@@ -0,0 +1,51 @@
+import json
+
+import pandas as pd
+
+from benchmarks.run_benchmarks import compare, run
+from src.data_handler import DataHandler, validate_frame
+from src.synthetic import UNIFIED_COLUMNS, generate_unified_data, write_synthetic
+
+
+def test_generated_data_is_schema_valid():
+    df = generate_unified_data(5_000, seed=1)
+    assert len(df) == 5_000
+    assert list(df.columns) == UNIFIED_COLUMNS
+    assert set(df['record_type']) == {'observation', 'event', 'impact_link', 'target'}
+    assert df['record_id'].is_unique
+    assert validate_frame(df).empty
+
+    events = set(df.loc[df['record_type'] == 'event', 'record_id'])
+    links = df[df['record_type'] == 'impact_link']
+    assert set(links['parent_id']) <= events
+    assert set(links['related_indicator']) <= set(df['indicator_code'].dropna())
+
+
+def test_generation_is_reproducible():
+    pd.testing.assert_frame_equal(generate_unified_data(1_000, seed=3), generate_unified_data(1_000, seed=3))
+
+
+def test_written_data_loads(tmp_path):
+    data_path, ref_path = write_synthetic(str(tmp_path), 2_000)
+    df, ref = DataHandler(data_path, ref_path).load_data()
+    assert len(df) == 2_000
+    assert {'field', 'code', 'description'} <= set(ref.columns)
+
+
+def test_benchmark_run_and_compare(tmp_path):
+    report = run(sizes=[500], benchmarks=['load_data', 'validate_frame'], repeat=1,
+                 label='test', output_dir=str(tmp_path))
+    assert {r['benchmark'] for r in report['results']} == {'load_data', 'validate_frame'}
+
+    slower = dict(report)
+    slower['results'] = [dict(r, wall_median_s=r['wall_median_s'] * 2 + 1.0) for r in report['results']]
+    (tmp_path / 'slower.json').write_text(json.dumps(slower))
+
+    table = compare(str(tmp_path / 'test.json'), str(tmp_path / 'slower.json'))
+    assert table['regression'].all()
+    # Small sizes and sub-threshold absolute slowdowns are not gated
+    assert not compare(str(tmp_path / 'test.json'), str(tmp_path / 'slower.json'),
+                       min_rows=1000)['regression'].any()
+    assert not compare(str(tmp_path / 'test.json'), str(tmp_path / 'slower.json'),
+                       min_delta_s=10.0)['regression'].any()
+    assert not compare(str(tmp_path / 'test.json'), str(tmp_path / 'test.json'))['regression'].any()